@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Plugin import-time benchmark
+
+Imports each collection plugin in a fresh interpreter with python -X importtime
+after the ansible plugin base classes and reports the median time spent in the
+plugin's own import, the slowest modules it pulls in and whether heavy dependencies
+(netmiko, paramiko, textfsm) were loaded. Ansible loads these plugins in every
+worker, so this tracks per-fork startup cost.
+
+Usage:
+    python3 bench_import.py --runs 5 --top 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_transport import collection_path  # noqa: E402
+
+PACKAGE = 'ansible_collections.ready_1.unofficial_netgear_m4300.plugins'
+PLUGINS = [
+    'connection.netgear_telnet',
+    'action.netgear',
+    'callback.netgear_timing',
+    'module_utils.netgear',
+    'module_utils.prompt_recognizer',
+    'modules.netgear_system',
+    'modules.netgear_drift',
+    'modules.netgear_backup',
+]
+# Imports every plugin needs anyway, subtracted to show the plugin's own cost
+BASELINE = 'ansible.plugins.connection, ansible.plugins.action, ansible.plugins.callback, ansible.module_utils.basic'
+HEAVY = ('netmiko', 'paramiko', 'textfsm', 'ntc_templates', 'serial')
+
+
+def import_times(statement, root):
+    """Run statement under -X importtime and return {module: (self_us, cumulative_us)}"""
+    env = dict(os.environ, PYTHONPATH=root)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                          env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per plugin')
+    parser.add_argument('--top', type=int, default=5, help='slowest imports to list per plugin')
+    parser.add_argument('--plugins', default=','.join(PLUGINS), help='comma separated plugin paths')
+    args = parser.parse_args()
+
+    root = collection_path()
+    baseline = import_times(f"import {BASELINE}", root)
+    print(f"{'plugin':<34}{'import':>10}  heavy dependencies")
+    for plugin in [p.strip() for p in args.plugins.split(',') if p.strip()]:
+        name = f"{PACKAGE}.{plugin}"
+        totals = []
+        for _ in range(args.runs):
+            times = import_times(f"import {BASELINE}; import {name}", root)
+            totals.append(times[name][1])
+
+        loaded = sorted({module.split('.')[0] for module in times if module.split('.')[0] in HEAVY})
+        print(f"{plugin:<34}{statistics.median(totals) / 1000:>8.1f}ms  {', '.join(loaded) or 'none'}")
+
+        extra = [(own, module) for module, (own, cumulative) in times.items() if module not in baseline]
+        for own, module in sorted(extra, reverse=True)[:args.top]:
+            print(f"    {own / 1000:8.2f}ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Transport layer benchmark against the local M4300 simulator
+
+Starts m4300_sim.SimulatorServer in a background thread and measures, for each
+transport mode, logins/sec, commands/sec and p50/p99 command latency:
+
+  raw             plain socket client reading up to the prompt (protocol baseline)
+  netgear_telnet  the collection's connection plugin, one session per run
+  run_commands    module_utils.netgear.run_commands, one login per batch
+  prompt          recognize_prompt() on every mode's prompt (no network)
+
+Requires ansible-core and netmiko for the netgear_telnet and run_commands modes.
+
+Usage:
+    python3 bench_transport.py --sessions 5 --commands 20 --latency 0.01 --jitter 0.002
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+COLLECTION = 'ready_1.unofficial_netgear_m4300'
+
+sys.path.insert(0, BENCH_DIR)
+from m4300_sim import SimulatorServer, MODES  # noqa: E402
+
+PROMPT_PATTERN = re.compile(rb'\([^)]+\) (?:\([^)]+\))?[#>]\s*$')
+
+
+def collection_path():
+    """Return a directory exposing this checkout as ansible_collections/ready_1/..."""
+    root = tempfile.mkdtemp(prefix='netgear-bench-')
+    os.symlink(REPO_ROOT, os.path.join(root, 'ansible_collections'))
+    os.environ['ANSIBLE_COLLECTIONS_PATH'] = root
+    try:
+        from ansible.plugins.loader import init_plugin_loader
+    except ImportError:
+        sys.path.insert(0, root)
+    else:
+        init_plugin_loader([root])
+    return root
+
+
+def percentile(values, pct):
+    """Return the pct percentile of values using linear interpolation"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class BackgroundSimulator:
+    """Run a SimulatorServer on its own event loop thread"""
+
+    def __init__(self, **kwargs):
+        self.server = SimulatorServer(**kwargs)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+        return self.server
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+class RawClient:
+    """Minimal telnet client reading up to the M4300 prompt"""
+
+    def __init__(self, host, port, username, password, timeout=30):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.read_until(rb'User:')
+        self.sock.sendall(username.encode() + b'\r\n')
+        self.read_until(rb'Password:')
+        self.sock.sendall(password.encode() + b'\r\n')
+        self.read_until(PROMPT_PATTERN)
+        self.sock.sendall(b'enable\r\n')
+        self.read_until(rb'Password:')
+        self.sock.sendall(b'\r\n')
+        self.read_until(PROMPT_PATTERN)
+
+    def read_until(self, pattern):
+        if isinstance(pattern, bytes):
+            pattern = re.compile(re.escape(pattern))
+        data = b''
+        while not pattern.search(data):
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise EOFError('connection closed')
+            data += chunk
+        return data
+
+    def send_command(self, command):
+        self.sock.sendall(command.encode() + b'\r\n')
+        return self.read_until(PROMPT_PATTERN)
+
+    def disconnect(self):
+        self.sock.sendall(b'quit\r\n')
+        self.sock.close()
+
+
+class BenchModule:
+    """Just enough of AnsibleModule for run_commands outside a task"""
+
+    def __init__(self, params):
+        self.params = params
+
+    def debug(self, msg):
+        pass
+
+    def fail_json(self, **kwargs):
+        raise RuntimeError(kwargs.get('msg'))
+
+
+def bench_raw(server, args):
+    logins, latencies = [], []
+    for _ in range(args.sessions):
+        start = time.monotonic()
+        client = RawClient(server.host, server.port, server.username, server.password)
+        logins.append(time.monotonic() - start)
+        for _ in range(args.commands):
+            start = time.monotonic()
+            client.send_command(args.command)
+            latencies.append(time.monotonic() - start)
+        client.disconnect()
+    return logins, latencies
+
+
+def bench_netgear_telnet(server, args):
+    from ansible.playbook.play_context import PlayContext
+    from ansible.plugins.loader import connection_loader
+
+    lock_dir = tempfile.mkdtemp(prefix='netgear-bench-locks-')
+    logins, latencies = [], []
+    for _ in range(args.sessions):
+        conn = connection_loader.get(f'{COLLECTION}.netgear_telnet', PlayContext(), None)
+        conn.set_options(direct=dict(host=server.host, port=server.port, username=server.username,
+                                     password=server.password, session_lock_dir=lock_dir))
+        start = time.monotonic()
+        conn._connect()
+        logins.append(time.monotonic() - start)
+        for _ in range(args.commands):
+            start = time.monotonic()
+            conn.exec_command(args.command)
+            latencies.append(time.monotonic() - start)
+        conn.close()
+    return logins, latencies
+
+
+def bench_run_commands(server, args):
+    from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.netgear import run_commands
+    from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import SessionTimer
+
+    module = BenchModule(dict(host=server.host, port=server.port, username=server.username,
+                              password=server.password, timeout=30, max_sessions=2,
+                              session_lock_dir=tempfile.mkdtemp(prefix='netgear-bench-locks-'),
+                              session_wait_timeout=300, connect_retries=0, connect_retry_delay=1.0))
+    logins, latencies = [], []
+    for _ in range(args.sessions):
+        timer = SessionTimer()
+        run_commands(module, [args.command] * args.commands, timer=timer)
+        logins.append(timer.connect_time)
+        latencies.extend(record['elapsed'] for record in timer.commands)
+    return logins, latencies
+
+
+def bench_prompt(args):
+    from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.prompt_recognizer import (
+        recognize_prompt
+    )
+    prompts = {}
+    for mode, (suffix, parent) in MODES.items():
+        if mode == 'user_exec':
+            prompts[mode] = '(M4300-52G-PoE+) >'
+        elif suffix is None:
+            prompts[mode] = '(M4300-52G-PoE+) #'
+        else:
+            prompts[mode] = f"(M4300-52G-PoE+) ({suffix.format(arg='1/0/1' if 'Interface' in suffix else 1)})#"
+    mismatches = sorted(mode for mode, prompt in prompts.items() if recognize_prompt(prompt) != mode)
+    outputs = ['show running-config output\n' * 20 + p for p in prompts.values()]
+
+    iterations = max(1, args.prompt_iterations // len(outputs))
+    start = time.monotonic()
+    for _ in range(iterations):
+        for output in outputs:
+            recognize_prompt(output)
+    elapsed = time.monotonic() - start
+    return iterations * len(outputs) / elapsed, mismatches
+
+
+MODES_TO_RUN = {
+    'raw': bench_raw,
+    'netgear_telnet': bench_netgear_telnet,
+    'run_commands': bench_run_commands,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modes', default='raw,netgear_telnet,run_commands,prompt',
+                        help='comma separated transport modes')
+    parser.add_argument('--sessions', type=int, default=3, help='logins per mode')
+    parser.add_argument('--commands', type=int, default=20, help='commands per session')
+    parser.add_argument('--command', default='show version')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--login-latency', type=float, default=0.0)
+    parser.add_argument('--config-lines', type=int, default=200)
+    parser.add_argument('--prompt-iterations', type=int, default=200000)
+    args = parser.parse_args()
+
+    collection_path()
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+
+    print(f"{'mode':<16}{'logins/s':>10}{'login p50':>11}{'cmds/s':>10}{'cmd p50':>10}{'cmd p99':>10}")
+    with BackgroundSimulator(latency=args.latency, jitter=args.jitter,
+                             login_latency=args.login_latency,
+                             config_lines=args.config_lines, max_sessions=4) as server:
+        for mode in modes:
+            if mode == 'prompt':
+                continue
+            try:
+                logins, latencies = MODES_TO_RUN[mode](server, args)
+            except ImportError as e:
+                print(f"{mode:<16}skipped: {e}")
+                continue
+            print(f"{mode:<16}{len(logins) / sum(logins):>10.2f}{percentile(logins, 50) * 1000:>9.1f}ms"
+                  f"{len(latencies) / sum(latencies):>10.1f}"
+                  f"{percentile(latencies, 50) * 1000:>8.2f}ms{percentile(latencies, 99) * 1000:>8.2f}ms")
+
+    if 'prompt' in modes:
+        rate, mismatches = bench_prompt(args)
+        print(f"{'prompt':<16}recognize_prompt: {rate:,.0f} calls/s, "
+              f"misrecognized modes: {', '.join(mismatches) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Local telnet server emulating the Netgear M4300 CLI
+
+Emulates the login sequence, the prompts of every mode in
+plugins/module_utils/prompt_recognizer.py and the behaviours recorded in
+docs/M4300_Switch_CLI_Exercise.md: privileged commands fail in User EXEC with
+"% Invalid input detected at '^' marker.", 'exit' returns to the previous mode,
+'hostname' changes the prompt, '| include' filters output. Config commands are
+added to the running-config so backup and drift tooling can be exercised.
+Every command, show commands included, is written to a wrapping buffered log
+as a CLI command entry, as the switch does with logging cli-command enabled.
+Local users are stored and shown as SHA-crypt hashes, like firmware 12.0.11.8
+and later: username "bob" password $6$... encryption-type sha512 level 1 encrypted.
+
+Latency, jitter, output size and the session limit are configurable, so the
+transport layer can be benchmarked and regression-tested without a switch.
+--drop-after closes sessions abruptly after they run a number of commands,
+after applying the last one but before its prompt, to exercise resuming.
+
+Usage:
+    python3 m4300_sim.py --port 2323 --latency 0.02 --jitter 0.005
+"""
+
+import argparse
+import asyncio
+import collections
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ready_1',
+                                'unofficial_netgear_m4300', 'plugins', 'module_utils'))
+from sha_crypt import SCHEMES, parse_crypt, sha_crypt  # noqa: E402
+
+MODEL = 'M4300-52G-PoE+'
+
+INVALID_INPUT = "% Invalid input detected at '^' marker."
+
+# Config mode suffix (as shown in the prompt) and parent mode for each mode
+MODES = {
+    'user_exec': (None, None),
+    'priv_exec': (None, 'user_exec'),
+    'global_config': ('Config', 'priv_exec'),
+    'vlan_database': ('Vlan', 'priv_exec'),
+    'interface_config': ('Interface {arg}', 'global_config'),
+    'line_console': ('Config-line', 'global_config'),
+    'line_telnet': ('Config-telnet', 'global_config'),
+    'line_ssh': ('Config-ssh', 'global_config'),
+    'aaa_ias_user': ('Config-IAS-User', 'global_config'),
+    'dhcp_pool': ('Config-dhcp-pool', 'global_config'),
+    'dhcpv6_pool': ('Config-dhcp6s-pool', 'global_config'),
+    'captive_portal': ('Config-CP', 'global_config'),
+    'captive_portal_instance': ('Config-CP {arg}', 'captive_portal'),
+    'ospf_config': ('config-router', 'global_config'),
+    'ospfv3_config': ('Config-rtr', 'global_config'),
+    'rip_config': ('Config-router', 'global_config'),
+}
+
+# Commands that enter a mode: (current mode, pattern) -> new mode
+MODE_TRANSITIONS = [
+    ('priv_exec', re.compile(r'^configure$'), 'global_config'),
+    ('priv_exec', re.compile(r'^vlan database$'), 'vlan_database'),
+    ('global_config', re.compile(r'^interface (\S+(?: \S+)?)$'), 'interface_config'),
+    ('global_config', re.compile(r'^line console$'), 'line_console'),
+    ('global_config', re.compile(r'^line telnet$'), 'line_telnet'),
+    ('global_config', re.compile(r'^line ssh$'), 'line_ssh'),
+    ('global_config', re.compile(r'^aaa ias-user username \S+$'), 'aaa_ias_user'),
+    ('global_config', re.compile(r'^ip dhcp pool \S+$'), 'dhcp_pool'),
+    ('global_config', re.compile(r'^ipv6 dhcp pool \S+$'), 'dhcpv6_pool'),
+    ('global_config', re.compile(r'^captive-portal$'), 'captive_portal'),
+    ('captive_portal', re.compile(r'^configuration (\d+)$'), 'captive_portal_instance'),
+    ('global_config', re.compile(r'^router ospf$'), 'ospf_config'),
+    ('global_config', re.compile(r'^ipv6 router ospf$'), 'ospfv3_config'),
+    ('global_config', re.compile(r'^router rip$'), 'rip_config'),
+]
+
+USERNAME_COMMAND = re.compile(
+    r'^username\s+"?([^"\s]+)"?\s+(?:password\s+(\S+)(?:\s+encryption-type\s+(\S+))?'
+    r'(?:\s+level\s+(\d+))?(\s+encrypted)?(?:\s+override-complexity-check)?'
+    r'|nopassword(?:\s+level\s+(\d+))?)$'
+)
+NO_USERNAME_COMMAND = re.compile(r'^no username\s+"?([^"\s]+)"?$')
+
+IAC, SB, SE = 255, 250, 240
+
+# Entries the buffered log holds before it wraps
+LOG_CAPACITY = 400
+
+
+class SwitchState:
+    """Configuration shared by all sessions of one simulated switch"""
+
+    def __init__(self, config_lines=200, log_count=42, users=None):
+        self.hostname = MODEL
+        self.blocks = {}
+        self.users = dict(users or {})
+        self.global_lines = ['hostname "{hostname}"'.format(hostname=self.hostname)]
+        self.log = collections.deque(maxlen=LOG_CAPACITY)
+        self.log_sequence = log_count
+        for i in range(log_count):
+            self.log.append(f"<190> JAN 01 00:00:{i % 60:02d} {MODEL}-1 TRAPMGR[1]: traputil.c(721) {i} "
+                            f"%% Link Up: 1/0/{i % 48 + 1}")
+        for port in range(1, config_lines // 4 + 1):
+            unit_port = f"1/0/{port}"
+            self.blocks[f"interface {unit_port}"] = [
+                f'description "port-{port}"',
+                'switchport mode access',
+                f"vlan participation include {1 + port % 8}",
+            ]
+
+    def add_line(self, mode, block, line):
+        """Record a config command in the running-config"""
+        if mode == 'global_config':
+            if line.startswith('hostname '):
+                self.hostname = line.split(' ', 1)[1].strip('"')
+                self.global_lines = [l for l in self.global_lines if not l.startswith('hostname ')]
+                line = f'hostname "{self.hostname}"'
+            if line not in self.global_lines:
+                self.global_lines.append(line)
+        elif block:
+            lines = self.blocks.setdefault(block, [])
+            if line not in lines:
+                lines.append(line)
+
+    @property
+    def log_count(self):
+        """Number of valid buffered log entries; stops growing once the log wraps"""
+        return len(self.log)
+
+    def log_command(self, peer, user, command):
+        """Write the CLI command entry logging cli-command writes for every command"""
+        self.log_sequence += 1
+        self.log.append(f"<189> JAN 01 00:00:00 {MODEL}-1 UNKNOWN[1]: cmd_logger_api.c(83) "
+                        f"{self.log_sequence} %% CLI:{peer}:{user}:{command}")
+
+    def set_user(self, command):
+        """Apply a username / no username command; False if it is invalid"""
+        match = NO_USERNAME_COMMAND.match(command)
+        if match:
+            self.users.pop(match.group(1), None)
+            return True
+        match = USERNAME_COMMAND.match(command)
+        if not match:
+            return False
+        name, password, encryption, level, encrypted, nopassword_level = match.groups()
+        if password is None:
+            self.users[name] = dict(password=None, encryption=None, level=int(nopassword_level or 1))
+        else:
+            encryption = encryption or 'sha512'
+            if encryption not in SCHEMES:
+                return False
+            if encrypted:
+                parsed = parse_crypt(password)
+                if parsed is None or parsed[0] != encryption:
+                    return False
+                password_hash = password
+            else:
+                password_hash = sha_crypt(password, scheme=encryption)
+            self.users[name] = dict(password=password_hash, encryption=encryption, level=int(level or 1))
+        return True
+
+    def running_config(self):
+        """Render show running-config output"""
+        out = [
+            '!Current Configuration:',
+            '!',
+            f'!System Description "{MODEL} ProSAFE 48-port 1G PoE+ and 2-port 10GBASE-T '
+            'and 2-port 10G SFP+, 12.0.19.6, B1.0.0.17"',
+            '!System Software Version "12.0.19.6"',
+            '!System Up Time          "0 days 0 hrs 58 mins 12 secs"',
+            '!',
+            'vlan database',
+            'vlan routing 1 1',
+            'exit',
+            'configure',
+            'stack',
+            'member 1 4',
+            'exit',
+        ]
+        out.extend(self.global_lines)
+        for name, user in self.users.items():
+            if user['password'] is None:
+                out.append(f'username "{name}" nopassword level {user["level"]}')
+            else:
+                out.append(f'username "{name}" password {user["password"]} '
+                           f'encryption-type {user["encryption"]} level {user["level"]} encrypted')
+        for block, lines in self.blocks.items():
+            out.append(block)
+            out.extend(lines)
+            out.append('exit')
+        out.append('exit')
+        return '\n'.join(out)
+
+
+class Session:
+    """One telnet session"""
+
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.mode = 'user_exec'
+        self.mode_arg = None
+        self.block = None
+        self.last_cr = False
+        self.commands = 0
+        self.peer = (writer.get_extra_info('peername') or ('127.0.0.1',))[0]
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def prompt(self):
+        suffix, parent = MODES[self.mode]
+        if self.mode == 'user_exec':
+            return f"({self.state.hostname}) >"
+        if suffix is None:
+            return f"({self.state.hostname}) #"
+        return f"({self.state.hostname}) ({suffix.format(arg=self.mode_arg)})#"
+
+    async def delay(self, base=None):
+        base = self.server.latency if base is None else base
+        wait = base + random.uniform(-self.server.jitter, self.server.jitter)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def send(self, text):
+        data = text.replace('\n', '\r\n').encode('utf-8')
+        chunk = self.server.chunk_size
+        for i in range(0, len(data), chunk):
+            self.writer.write(data[i:i + chunk])
+            await self.writer.drain()
+
+    async def readline(self, echo=True):
+        """Read one line, stripping telnet negotiation and echoing input"""
+        line = bytearray()
+        while True:
+            byte = await self.reader.read(1)
+            if not byte:
+                raise EOFError
+            value = byte[0]
+            if value == IAC:
+                command = (await self.reader.read(1))[0]
+                if command == SB:
+                    while True:
+                        b = await self.reader.read(1)
+                        if not b:
+                            raise EOFError
+                        if b[0] == IAC and (await self.reader.read(1))[0] == SE:
+                            break
+                elif command in (251, 252, 253, 254):
+                    await self.reader.read(1)
+                continue
+            if value == 10 and self.last_cr:
+                self.last_cr = False
+                continue
+            self.last_cr = value == 13
+            if value in (10, 13):
+                self.writer.write(b'\r\n')
+                await self.writer.drain()
+                return line.decode('utf-8', 'replace')
+            if value == 0:
+                continue
+            if value in (8, 127):
+                if line:
+                    line.pop()
+                continue
+            line.append(value)
+            if echo:
+                self.writer.write(byte)
+
+    async def login(self):
+        await self.delay(self.server.login_latency)
+        await self.send('\nUser:')
+        user = (await self.readline()).strip()
+        await self.send('Password:')
+        password = (await self.readline(echo=False)).strip()
+        await self.delay(self.server.login_latency)
+        if user != self.server.username or password != self.server.password:
+            await self.send('\nAccess denied\n')
+            return False
+        self.server.stats['logins'] += 1
+        await self.send('\n' + self.prompt())
+        return True
+
+    def filter_output(self, output, pipe):
+        match = re.match(r'^include\s+"?([^"]*)"?$', pipe.strip())
+        if not match:
+            return None
+        return '\n'.join(l for l in output.split('\n') if match.group(1) in l)
+
+    def show(self, command):
+        if self.mode == 'user_exec' and command not in ('show version', 'show users'):
+            return INVALID_INPUT
+        if command == 'show running-config':
+            return self.state.running_config()
+        if command in ('show version', 'show sysinfo'):
+            return '\n'.join([
+                f"Switch: 1",
+                "",
+                f"System Description............................. {MODEL} ProSAFE 48-port 1G PoE+",
+                f"Machine Model.................................. {MODEL}",
+                "Serial Number.................................. 53L69C5FF001D",
+                "Software Version............................... 12.0.19.6",
+                "Bootcode Version............................... B1.0.0.17",
+                "Burned In MAC Address.......................... BC:A5:11:A0:7E:1D",
+            ])
+        if command == 'show logging buffered':
+            lines = [
+                "Buffered (In-Memory) Logging            : enabled",
+                "Buffered Logging Wrapping Behavior      : On",
+                f"Buffered Log Count                      : {self.state.log_count}",
+                "",
+            ]
+            lines.extend(self.state.log)
+            return '\n'.join(lines)
+        if command == 'show users':
+            return '\n'.join([
+                "                    User Access Mode  SNMPv3        SNMPv3       SNMPv3",
+                "User Name           Level             Access Mode   Auth Prot    Encryption",
+                "------------------  ----------------  ------------  -----------  ----------",
+                "admin               15                ReadWrite     None         None",
+                "guest               1                 ReadOnly      None         None",
+            ])
+        if command == 'show vlan':
+            return "VLAN ID VLAN Name                         VLAN Type\n------- -------------------------------- ---------\n1       default                          Default"
+        if command.startswith('show bulk'):
+            return '\n'.join('x' * 79 for _ in range(self.server.bulk_lines))
+        return INVALID_INPUT
+
+    async def handle_enable(self):
+        await self.send('Password:')
+        await self.readline(echo=False)
+        self.mode = 'priv_exec'
+
+    def execute(self, command):
+        """Execute a command and return its output, or None to close the session"""
+        if command in ('quit', 'logout') or (command == 'exit' and self.mode == 'user_exec'):
+            return None
+
+        if command == 'exit':
+            if self.block and self.mode not in ('global_config', 'priv_exec'):
+                self.block = None
+            self.mode = MODES[self.mode][1]
+            return ''
+
+        if command == 'end':
+            if self.mode not in ('user_exec', 'priv_exec'):
+                self.mode, self.block = 'priv_exec', None
+            return ''
+
+        if command.startswith('terminal '):
+            return '' if self.mode != 'user_exec' or command.startswith('terminal length') else INVALID_INPUT
+
+        for mode, pattern, new_mode in MODE_TRANSITIONS:
+            match = pattern.match(command)
+            if self.mode == mode and match:
+                self.mode = new_mode
+                self.mode_arg = match.group(1) if match.groups() else None
+                self.block = command
+                return ''
+
+        if command.startswith('show '):
+            command, _, pipe = command.partition('|')
+            output = self.show(command.strip())
+            if pipe and output != INVALID_INPUT:
+                output = self.filter_output(output, pipe)
+                if output is None:
+                    return INVALID_INPUT
+            return output
+
+        if command in ('save config', 'write memory confirm', 'copy system:running-config nvram:startup-config'):
+            if self.mode != 'priv_exec':
+                return INVALID_INPUT
+            self.server.stats['saves'] += 1
+            return "Config file 'startup-config' created successfully .\n\nConfiguration Saved!"
+
+        if self.mode in ('user_exec', 'priv_exec', 'vlan_database') and command != 'vlan routing 1 1':
+            return INVALID_INPUT
+
+        if self.mode == 'global_config' and re.match(r'^(no )?username (?!snmpv3 )', command):
+            return '' if self.state.set_user(command) else INVALID_INPUT
+
+        self.state.add_line(self.mode, self.block, command)
+        return ''
+
+    async def run(self):
+        if not await self.login():
+            return
+        while True:
+            command = ' '.join((await self.readline()).split())
+            if not command:
+                await self.send(self.prompt())
+                continue
+            self.server.stats['commands'] += 1
+            self.state.log_command(self.peer, self.server.username, command)
+            if command == 'enable' and self.mode == 'user_exec':
+                await self.handle_enable()
+                await self.delay()
+                await self.send('\n' + self.prompt())
+                continue
+            output = self.execute(command)
+            if output is None:
+                return
+            self.commands += 1
+            if self.server.should_drop(self.commands):
+                return
+            delay = self.server.save_latency if command == 'save config' else None
+            await self.delay(delay)
+            await self.send((output + '\n\n' if output else '\n') + self.prompt())
+
+
+class SimulatorServer:
+    """Asyncio telnet server emulating one M4300 switch"""
+
+    def __init__(self, host='127.0.0.1', port=0, username='admin', password='password',
+                 latency=0.0, jitter=0.0, login_latency=0.0, save_latency=0.0,
+                 config_lines=200, bulk_lines=1000, chunk_size=4096, max_sessions=4,
+                 drop_after=0, drops=1):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.login_latency = login_latency
+        self.save_latency = save_latency
+        self.bulk_lines = bulk_lines
+        self.chunk_size = chunk_size
+        self.max_sessions = max_sessions
+        self.drop_after = drop_after
+        self.drops = drops
+        self.state = SwitchState(config_lines, users={
+            username: dict(password=sha_crypt(password, 'p6eTphdakQA88tjm'), encryption='sha512', level=15),
+        })
+        self.active = 0
+        self.stats = dict(logins=0, commands=0, saves=0, rejected=0, dropped=0)
+        self._server = None
+
+    def should_drop(self, session_commands):
+        """Return True if a session that has run session_commands commands should be dropped"""
+        if not self.drop_after or session_commands != self.drop_after or self.stats['dropped'] >= self.drops:
+            return False
+        self.stats['dropped'] += 1
+        return True
+
+    async def _handle(self, reader, writer):
+        if self.max_sessions and self.active >= self.max_sessions:
+            self.stats['rejected'] += 1
+            writer.write(b'\r\nMaximum number of sessions reached.\r\n')
+            await writer.drain()
+            writer.close()
+            return
+        self.active += 1
+        try:
+            await Session(self, reader, writer).run()
+        except (EOFError, ConnectionError):
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2323)
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='password')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per command')
+    parser.add_argument('--jitter', type=float, default=0.0, help='+/- seconds added to each delay')
+    parser.add_argument('--login-latency', type=float, default=0.0, help='seconds per login step')
+    parser.add_argument('--save-latency', type=float, default=0.0, help='seconds for save config')
+    parser.add_argument('--config-lines', type=int, default=200, help='approximate running-config size')
+    parser.add_argument('--bulk-lines', type=int, default=1000, help='lines returned by "show bulk"')
+    parser.add_argument('--max-sessions', type=int, default=4, help='concurrent session limit, 0 for none')
+    parser.add_argument('--drop-after', type=int, default=0,
+                        help='close a session without a prompt after this many commands, 0 never')
+    parser.add_argument('--drops', type=int, default=1, help='number of sessions --drop-after closes')
+    args = parser.parse_args()
+
+    server = SimulatorServer(
+        host=args.host, port=args.port, username=args.username, password=args.password,
+        latency=args.latency, jitter=args.jitter, login_latency=args.login_latency,
+        save_latency=args.save_latency, config_lines=args.config_lines,
+        bulk_lines=args.bulk_lines, max_sessions=args.max_sessions,
+        drop_after=args.drop_after, drops=args.drops,
+    )
+
+    async def serve():
+        port = await server.start()
+        print(f"M4300 simulator listening on {args.host}:{port} (user {args.username})")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"Stopped: {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
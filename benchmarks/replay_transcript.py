@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Inspect and replay netgear session transcripts
+
+Transcripts are recorded with the record_transcript option of the
+netgear_telnet connection plugin or of any module. This tool prints the
+recorded per-command latency, then replays every session through
+run_commands (at --speed, 0 for no delays) and times recognize_prompt over
+the recorded output, so parsing and prompt handling can be profiled on real
+captured traffic without hardware.
+
+Usage:
+    python3 replay_transcript.py session.ngtr --speed 0
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_transport import BenchModule, collection_path, percentile  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('transcript')
+    parser.add_argument('--speed', type=float, default=0.0, help='replay speed, 0 for no delays')
+    parser.add_argument('--no-replay', action='store_true', help='only print the recorded latency')
+    args = parser.parse_args()
+
+    collection_path()
+    from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils import transcript
+    from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.prompt_recognizer import (
+        recognize_prompt
+    )
+
+    sessions = transcript.load_sessions(args.transcript)
+    for index, session in enumerate(sessions):
+        latencies = transcript.command_latencies(session)
+        meta = session['meta']
+        print(f"session {index}: {meta.get('transport')} {meta.get('host')} "
+              f"{len(session['records'])} records, {len(latencies)} commands")
+        for command, seconds, size in latencies:
+            print(f"  {seconds * 1000:9.2f}ms {size:8d}B  {command}")
+        if latencies:
+            values = [seconds for command, seconds, size in latencies]
+            print(f"  p50 {percentile(values, 50) * 1000:.2f}ms  p99 {percentile(values, 99) * 1000:.2f}ms")
+
+        received = b''.join(payload for ts, kind, payload in session['records']
+                            if kind == transcript.RECEIVED).decode('utf-8', 'replace')
+        lines = [line for line in received.splitlines() if line.strip()]
+        start = time.monotonic()
+        modes = [recognize_prompt(line) for line in lines]
+        elapsed = time.monotonic() - start
+        prompts = sum(1 for mode in modes if mode != 'unknown')
+        print(f"  recognize_prompt: {len(lines)} lines in {elapsed * 1000:.2f}ms, {prompts} prompts")
+
+        if args.no_replay or not latencies:
+            continue
+
+        module = BenchModule(dict(host=meta.get('host', 'replay'), port=23, username='replay',
+                                  password='replay', timeout=30, max_sessions=1,
+                                  session_lock_dir=tempfile.mkdtemp(prefix='netgear-replay-locks-'),
+                                  session_wait_timeout=30, connect_retries=0, connect_retry_delay=1.0,
+                                  replay_transcript=None, replay_speed=args.speed))
+        server = transcript.ReplayServer(args.transcript, speed=args.speed)
+        server.sessions = [session]
+        module.params.update(host=server.host, port=server.start())
+
+        from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.netgear import run_commands
+        from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import SessionTimer
+
+        timer = SessionTimer()
+        start = time.monotonic()
+        try:
+            run_commands(module, [command for command, seconds, size in latencies], timer=timer)
+        finally:
+            server.stop()
+        replayed = [record['elapsed'] for record in timer.commands]
+        print(f"  replay: {time.monotonic() - start:.3f}s total, login {timer.connect_time:.3f}s, "
+              f"command p50 {percentile(replayed, 50) * 1000:.2f}ms p99 {percentile(replayed, 99) * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Concurrent LLM extraction of CLI command references.
+
+Does the same job as make_sl_ref.py, but sends the chunk batches through a
+bounded pool of asyncio workers instead of one blocking request at a time.
+Requests are paced by a token bucket, retried with exponential backoff on
+429/5xx responses and connection errors, and merged in chunk order through
+merge_extracted, so the output does not depend on completion order. Results
+are cached by llm_cache.py, so re-runs only query the batches that changed.
+
+make_sl_ref.py chained each prompt on the last command of the previous batch,
+which forced serial execution. Here every batch sends the neighbouring chunks
+as context only and asks for the commands documented in the current chunk, so
+batches are independent.
+
+Usage:
+    python3 async_extract.py --workers 8 --rate 4
+    python3 stub_llm_server.py --port 8765 --latency 0.5 --fail-rate 0.1 &
+    python3 async_extract.py --api-url http://127.0.0.1:8765/api/v1/chat/completions --api-key stub
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+import requests
+from dotenv import load_dotenv
+
+from llm_cache import CACHE_FILE, ResponseCache, cache_key
+from make_sl_ref import (
+    CHUNKS_FILE,
+    COMMAND_LIST_FILE,
+    MODEL,
+    OPENROUTER_API_URL,
+    OUTPUT_FILE,
+    load_chunks,
+    load_commands,
+    merge_extracted,
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryableError(Exception):
+    """A failed request worth retrying, with the server's Retry-After if given"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Async token bucket: rate tokens per second, bursts up to capacity"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def build_batches(chunks):
+    """Return (current text, context texts) for each chunk, context being its neighbours"""
+    texts = [c.get('text', '') + ' ' + c.get('summary', '') for c in chunks]
+    batches = []
+    for i, text in enumerate(texts):
+        context = texts[max(0, i - 1):i] + texts[i + 1:i + 2]
+        batches.append((text, context))
+    return batches
+
+
+PROMPT_TEMPLATE = (
+    "Extract the CLI commands documented in the current chunk. Intended for quick refs in networking scripts. "
+    "Output raw JSON dict {{command: {{'syntax': 'full cmd + args/options', 'summary': '1-sentence purpose', "
+    "'synopsis': 'detailed desc up to 300 chars'}}}} ONLY. "
+    "The context chunks are the neighbouring manual pages, given only to complete commands that cross a "
+    "chunk boundary; do not extract commands documented entirely within them. "
+    "Context: {context} "
+    "Current chunk: {current}"
+)
+
+
+def build_prompt(current, context):
+    return PROMPT_TEMPLATE.format(context=' '.join(context), current=current)
+
+
+def batch_cache_key(model, current, context):
+    return cache_key(model, PROMPT_TEMPLATE, json.dumps([context, current], ensure_ascii=False))
+
+
+def parse_content(content):
+    """Parse the model reply, stripping Markdown fences if present; None if unparseable"""
+    content = content.strip().removeprefix('```json\n').removesuffix('\n```').strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        print(f"LLM parse error: {e}")
+        return None
+
+
+def post_completion(session, url, api_key, model, prompt, timeout):
+    """Blocking chat completion request, run in a worker thread; None if the reply is malformed"""
+    try:
+        response = session.post(
+            url,
+            headers={
+                'Authorization': f'Bearer {api_key}',
+                'Content-Type': 'application/json'
+            },
+            json={
+                'model': model,
+                'messages': [{'role': 'user', 'content': prompt}]
+            },
+            timeout=timeout
+        )
+    except (requests.ConnectionError, requests.Timeout) as e:
+        raise RetryableError(str(e))
+
+    if response.status_code in RETRY_STATUSES:
+        retry_after = response.headers.get('Retry-After')
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        raise RetryableError(f"HTTP {response.status_code}", retry_after)
+    response.raise_for_status()
+    try:
+        return response.json()['choices'][0]['message']['content']
+    except (KeyError, IndexError, ValueError) as e:
+        print(f"LLM response error: {e}")
+        return None
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def extract_batch(session, bucket, args, prompt):
+    for attempt in range(args.retries + 1):
+        await bucket.acquire()
+        try:
+            content = await asyncio.to_thread(
+                post_completion, session, args.api_url, args.api_key, args.model, prompt, args.timeout)
+            return parse_content(content) if content is not None else None
+        except RetryableError as e:
+            if attempt == args.retries:
+                raise
+            delay = e.retry_after if e.retry_after is not None else backoff_delay(
+                attempt, args.retry_delay, args.max_retry_delay)
+            print(f"Request failed ({e}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+async def run_pipeline(batches, args, cache=None):
+    """Extract all batches concurrently and merge them in chunk order
+
+    Batches found in cache are not sent; new results are added to it as they
+    complete.
+    """
+    queue = asyncio.Queue()
+    completed = {}
+    for index, (current, context) in enumerate(batches):
+        key = batch_cache_key(args.model, current, context)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            completed[index] = cached
+        else:
+            queue.put_nowait((index, key, build_prompt(current, context)))
+
+    bucket = TokenBucket(args.rate, args.burst)
+    failed = []
+    extracted = {}
+    merged = 0
+    start = time.monotonic()
+
+    async def worker():
+        nonlocal merged
+        session = requests.Session()
+        try:
+            while True:
+                try:
+                    index, key, prompt = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    result = await extract_batch(session, bucket, args, prompt)
+                except (RetryableError, requests.HTTPError) as e:
+                    print(f"Chunk {index + 1} failed: {e}")
+                    result = None
+                if result is None:
+                    # Unusable replies are failures too: they are not cached and need a rerun
+                    failed.append(index)
+                elif cache is not None:
+                    cache.put(key, result, chunk=index + 1)
+                completed[index] = result or {}
+
+                # Merge the completed prefix so results are applied in chunk order
+                while merged in completed:
+                    merge_extracted(extracted, completed.pop(merged))
+                    merged += 1
+                elapsed = time.monotonic() - start
+                print(f"Progress: {merged}/{len(batches)} merged, {elapsed:.2f}s elapsed, "
+                      f"commands extracted: {len(extracted)}")
+        finally:
+            session.close()
+
+    while merged in completed:
+        merge_extracted(extracted, completed.pop(merged))
+        merged += 1
+    await asyncio.gather(*(worker() for _ in range(min(args.workers, queue.qsize()))))
+    return extracted, sorted(failed)
+
+
+def main():
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chunks', default=CHUNKS_FILE)
+    parser.add_argument('--command-list', default=COMMAND_LIST_FILE,
+                        help="master command list to filter against, '' to keep everything")
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--api-url', default=OPENROUTER_API_URL)
+    parser.add_argument('--api-key', default=os.getenv('OPENROUTER_API_KEY'))
+    parser.add_argument('--model', default=MODEL)
+    parser.add_argument('--workers', type=int, default=8, help='concurrent requests')
+    parser.add_argument('--rate', type=float, default=4.0, help='requests per second')
+    parser.add_argument('--burst', type=float, default=None, help='token bucket capacity')
+    parser.add_argument('--retries', type=int, default=5)
+    parser.add_argument('--retry-delay', type=float, default=1.0, help='base backoff delay in seconds')
+    parser.add_argument('--max-retry-delay', type=float, default=60.0)
+    parser.add_argument('--timeout', type=float, default=120.0, help='per request timeout in seconds')
+    parser.add_argument('--limit', type=int, default=None, help='only process the first N chunks')
+    parser.add_argument('--cache', default=CACHE_FILE, help="response cache file, '' to disable")
+    args = parser.parse_args()
+
+    if not args.api_key:
+        raise ValueError("OPENROUTER_API_KEY not found in .env")
+
+    chunks = load_chunks(args.chunks)[:args.limit]
+    start = time.monotonic()
+    cache = ResponseCache(args.cache, source='async_extract') if args.cache else None
+    dropped = 0
+    try:
+        extracted, failed = asyncio.run(run_pipeline(build_batches(chunks), args, cache))
+        # Only a complete run knows which entries are stale
+        if cache is not None and not failed and args.limit is None:
+            dropped = cache.compact()
+    finally:
+        if cache is not None:
+            cache.close()
+    elapsed = time.monotonic() - start
+    if cache is not None:
+        print(f"Cache: {cache.hits} hits, {cache.misses} LLM calls, {dropped} stale entries dropped")
+
+    final_refs = extracted
+    misses = set()
+    if args.command_list:
+        master_cmds = load_commands(args.command_list)
+        final_refs = {cmd: extracted[cmd] for cmd in extracted if cmd in master_cmds}
+        misses = master_cmds - set(final_refs.keys())
+        for miss in misses:
+            final_refs[miss] = {
+                'syntax': miss,
+                'summary': 'No extraction found.',
+                'synopsis': 'Manual review needed.'
+            }
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(final_refs, f, indent=4)
+    print(f"Generated {len(final_refs)} references from {len(chunks)} chunks in {elapsed:.2f}s. "
+          f"Misses (stubbed): {len(misses)}")
+    if failed:
+        print(f"Failed chunks (rerun needed): {', '.join(str(i + 1) for i in failed)}")
+
+
+if __name__ == "__main__":
+    main()
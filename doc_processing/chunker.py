@@ -12,9 +12,6 @@ OPENROUTER_API_URL = 'https://openrouter.ai/api/v1/chat/completions'
 MODEL = 'openai/gpt-4o-mini'
 API_KEY = os.getenv('OPENROUTER_API_KEY')  # Assumes key is OPENROUTER_API_KEY in .env
 
-if not API_KEY:
-    raise ValueError("OPENROUTER_API_KEY not found in .env")
-
 def load_commands(file_path):
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"{file_path} not found.")
@@ -73,6 +70,8 @@ def merge_extracted(extracted, new_data):
             extracted[cmd] = info
 
 def main():
+    if not API_KEY:
+        raise ValueError("OPENROUTER_API_KEY not found in .env")
     master_cmds = load_commands(COMMAND_LIST_FILE)
     chunks = load_chunks(CHUNKS_FILE)
     extracted = {}
@@ -1,7 +1,9 @@
+import heapq
 import json
 import re
-from collections import defaultdict
-from difflib import SequenceMatcher
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
 
 def get_category(command_name):
     """Determine category based on command prefix."""
@@ -52,72 +54,166 @@ def get_category(command_name):
             return category
     return 'Other'
 
+def command_trigrams(name):
+    """Return the set of character trigrams of a padded command name."""
+    padded = f" {name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def command_stem(name):
+    """Drop a leading "no " so a command and its negation index together."""
+    return name[3:] if name.startswith('no ') else name
+
+
+class RelatedCommandIndex:
+    """Top-k related command lookup over a fixed command set.
+
+    Candidates come from two precomputed indexes instead of a scan of every
+    command: a sorted list of command stems, searched with bisect for commands
+    sharing the same parent words, and an inverted index of character
+    trigrams restricted to selective trigrams (those in at most max_df
+    commands). Candidates are ranked by the mean of the shared word-prefix
+    ratio and the trigram Dice coefficient.
+    """
+
+    def __init__(self, names, max_df=None, min_score=0.3):
+        self.names = list(dict.fromkeys(names))
+        self.min_score = min_score
+        self.stems = [command_stem(name) for name in self.names]
+        self.words = [stem.split() for stem in self.stems]
+        self.trigrams = [command_trigrams(stem) for stem in self.stems]
+        self.positions = {name: i for i, name in enumerate(self.names)}
+
+        # Sorted (stem, id) pairs: commands with a common prefix are contiguous
+        self.sorted_stems = sorted((stem, i) for i, stem in enumerate(self.stems))
+        self.sorted_keys = [stem for stem, i in self.sorted_stems]
+
+        postings = defaultdict(list)
+        for i, grams in enumerate(self.trigrams):
+            for gram in grams:
+                postings[gram].append(i)
+        max_df = max_df or max(20, len(self.names) // 50)
+        self.postings = {gram: ids for gram, ids in postings.items() if len(ids) <= max_df}
+
+    def prefix_candidates(self, i):
+        words = self.words[i]
+        prefix = ' '.join(words[:-1]) + ' ' if len(words) > 1 else self.stems[i][:3]
+        low = bisect_left(self.sorted_keys, prefix)
+        high = bisect_right(self.sorted_keys, prefix + '\uffff')
+        return (self.sorted_stems[j][1] for j in range(low, high))
+
+    def ngram_candidates(self, i, limit):
+        counts = Counter()
+        for gram in self.trigrams[i]:
+            counts.update(self.postings.get(gram, ()))
+        return (j for j, count in counts.most_common(limit))
+
+    def score(self, i, j):
+        a, b = self.words[i], self.words[j]
+        shared = 0
+        for x, y in zip(a, b):
+            if x != y:
+                break
+            shared += 1
+        prefix = shared / max(len(a), len(b))
+        ga, gb = self.trigrams[i], self.trigrams[j]
+        dice = 2 * len(ga & gb) / (len(ga) + len(gb))
+        return (prefix + dice) / 2
+
+    def related(self, name, k=5):
+        """Return up to k related command names, best first."""
+        i = self.positions.get(name)
+        if i is None:
+            return []
+        candidates = set(self.prefix_candidates(i))
+        candidates.update(self.ngram_candidates(i, k * 4))
+        candidates.discard(i)
+        scored = []
+        for j in candidates:
+            if self.names[j] == name:
+                continue
+            score = self.score(i, j)
+            if score >= self.min_score:
+                scored.append((-score, self.names[j]))
+        return [cmd for score, cmd in heapq.nsmallest(k, scored)]
+
+
 def find_related_commands(command_name, all_commands, max_related=5):
-    """Find related commands based on prefix similarity."""
-    related = []
-    for cmd in all_commands:
-        if cmd != command_name:
-            # Check for common prefix
-            common_prefix = ""
-            for i in range(min(len(command_name), len(cmd))):
-                if command_name[i] == cmd[i]:
-                    common_prefix += command_name[i]
-                else:
-                    break
-            if len(common_prefix) >= 3:  # At least 3 characters in common
-                related.append(cmd)
-                if len(related) >= max_related:
-                    break
-
-            # If not enough prefix matches, use string similarity
-            if len(related) < max_related:
-                similarity = SequenceMatcher(None, command_name, cmd).ratio()
-                if similarity > 0.6:  # 60% similarity threshold
-                    if cmd not in related:
-                        related.append(cmd)
-                        if len(related) >= max_related:
-                            break
-
-    return related[:max_related]
+    """Find related commands based on prefix and n-gram similarity.
 
-def clean_commands():
-    # Load the JSON file
-    with open('command_references.json', 'r') as f:
-        data = json.load(f)
+    Builds a RelatedCommandIndex for a single lookup; build the index once
+    and call its related() method when looking up many commands.
+    """
+    index = RelatedCommandIndex(list(all_commands) + [command_name])
+    return index.related(command_name, max_related)
+
+def clean_entry(key, val, related_index):
+    """Return the cleaned record for one command, or None if it should be dropped."""
+    if not (isinstance(val, dict) and 'syntax' in val and 'summary' in val and 'synopsis' in val):
+        return None
+
+    # Normalize smart quotes
+    val['syntax'] = re.sub(r'[“”]', '"', val['syntax'])
+    val['summary'] = re.sub(r'[“”]', '"', val['summary'])
+    val['synopsis'] = re.sub(r'[“”]', '"', val['synopsis'])
+
+    # Filter out invalid entries
+    if val['summary'] == "No extraction found." or val['synopsis'] == "Manual review needed.":
+        return None
 
-    # Get list of all command names for related commands
-    all_command_names = list(data.keys())
+    # Flag truncations
+    if '(truncated' in val['synopsis']:
+        val['synopsis'] += ' [TRUNCATED]'
 
-    # Normalize smart quotes and clean data
-    cleaned = {}
-    for key, val in data.items():
-        if isinstance(val, dict) and 'syntax' in val and 'summary' in val and 'synopsis' in val:
-            val['syntax'] = re.sub(r'[“”]', '"', val['syntax'])
-            val['summary'] = re.sub(r'[“”]', '"', val['summary'])
-            val['synopsis'] = re.sub(r'[“”]', '"', val['synopsis'])
+    # Add category
+    val['category'] = get_category(key)
 
-            # Filter out invalid entries
-            if val['summary'] != "No extraction found." and val['synopsis'] != "Manual review needed.":
-                # Flag truncations
-                if '(truncated' in val['synopsis']:
-                    val['synopsis'] += ' [TRUNCATED]'
+    # Add related commands
+    val['related_commands'] = related_index.related(key)
+    return val
 
-                # Add category
-                val['category'] = get_category(key)
 
-                # Add related commands
-                val['related_commands'] = find_related_commands(key, all_command_names)
+def clean_records(items):
+    """Yield cleaned records sorted by command from (command, info) pairs.
 
-                cleaned[key] = val
+    A command can have several records, e.g. one per command mode it is
+    documented in; all of them are kept, in input order. A record that only
+    repeats an earlier one of the same command (ignoring its page) is merged
+    into it.
+    """
+    data = {}
+    for key, val in items:
+        variants = data.setdefault(key, [])
+        if not any(same_record(val, other) for other in variants):
+            variants.append(val)
+
+    # Index all command names once for related command lookups
+    related_index = RelatedCommandIndex(data.keys())
+    for key in sorted(data.keys()):
+        for variant in data[key]:
+            val = clean_entry(key, variant, related_index)
+            if val is not None:
+                yield val
+
+
+def same_record(a, b):
+    """Return True if two records of a command differ at most in their page."""
+    return {k: v for k, v in a.items() if k != 'page'} == {k: v for k, v in b.items() if k != 'page'}
+
+
+def clean_commands():
+    # Load the JSON file
+    with open('command_references.json', 'r') as f:
+        data = json.load(f)
 
-    # Convert to list and sort by key
-    command_list = [cleaned[key] for key in sorted(cleaned.keys())]
+    start = time.monotonic()
+    command_list = list(clean_records(data.items()))
 
     # Save cleaned data
     with open('cleaned_commands.json', 'w') as f:
         json.dump(command_list, f, indent=2)
 
-    print(f"Processed {len(command_list)} commands")
+    print(f"Processed {len(command_list)} commands in {time.monotonic() - start:.2f}s")
 
     # Print sample output
     if command_list:
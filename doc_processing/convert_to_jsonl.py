@@ -6,6 +6,16 @@ Outputs each JSON object on a separate line to command_ref.jsonl
 
 import json
 
+def write_jsonl(records, output_file):
+    """Write records (any iterable, e.g. a generator) as JSONL and return the count."""
+    count = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for item in records:
+            json.dump(item, f, ensure_ascii=False)
+            f.write('\n')
+            count += 1
+    return count
+
 def convert_json_to_jsonl(input_file, output_file):
     """Convert JSON array to JSONL format."""
     try:
@@ -14,10 +24,7 @@ def convert_json_to_jsonl(input_file, output_file):
             data = json.load(f)
 
         # Write each object as a separate line in JSONL format
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for item in data:
-                json.dump(item, f, ensure_ascii=False)
-                f.write('\n')
+        write_jsonl(data, output_file)
 
         print(f"Successfully converted {len(data)} records from {input_file} to {output_file}")
 
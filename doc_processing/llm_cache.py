@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Persistent cache for LLM extraction results.
+
+Entries are keyed by a SHA-256 of (model, prompt template, batch text) and
+appended to a JSONL file as soon as each batch completes, so the cache doubles
+as an append-only checkpoint of the extracted commands: an interrupted run
+loses at most the batches in flight, and a re-run or a prompt tweak only
+re-queries the batches whose key changed.
+
+Entries are tagged with the source (extractor) that wrote them. After a
+complete run the extractor calls compact(), which drops its own entries that
+the run did not look up, so stale keys from earlier prompts or chunkings do not
+pile up; entries of other sources are kept.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+CACHE_FILE = 'llm_cache.jsonl'
+
+
+def cache_key(model, template, text):
+    """Return the cache key of one LLM request"""
+    payload = json.dumps([model, template, text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Append-only JSONL store of {key: extracted commands}"""
+
+    def __init__(self, path=CACHE_FILE, source=None):
+        self.path = path
+        self.source = source
+        self.entries = {}
+        self.records = {}
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(path):
+            with open(path, 'rb+') as f:
+                data = f.read()
+                complete = data.rfind(b'\n') + 1
+                if complete < len(data):
+                    # Drop the torn last line of an interrupted run, so the next
+                    # entry is not appended to it
+                    f.truncate(complete)
+            for line in data[:complete].decode('utf-8').split('\n'):
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.entries[entry['key']] = entry['commands']
+                self.records[entry['key']] = entry
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        """Return the cached commands for key, or None"""
+        self.used.add(key)
+        if key in self.entries:
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, commands, **meta):
+        """Record the commands extracted for key and flush them to disk"""
+        self.entries[key] = commands
+        self.used.add(key)
+        entry = dict(key=key, created=int(time.time()), commands=commands, **meta)
+        if self.source:
+            entry['source'] = self.source
+        self.records[key] = entry
+        self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def compact(self):
+        """Atomically rewrite the cache without this source's entries that were not used
+
+        Call it only after a complete run; entries of other sources and untagged
+        entries are kept. Returns the number of entries dropped.
+        """
+        keep = [key for key, entry in self.records.items()
+                if key in self.used or entry.get('source') != self.source]
+        dropped = len(self.records) - len(keep)
+        self.file.close()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.llm_cache-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for key in keep:
+                    f.write(json.dumps(self.records[key], ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        finally:
+            self.file = open(self.path, 'a', encoding='utf-8')
+        self.records = {key: self.records[key] for key in keep}
+        self.entries = {key: self.entries[key] for key in keep}
+        return dropped
+
+    def close(self):
+        self.file.close()
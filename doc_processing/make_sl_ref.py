@@ -5,6 +5,8 @@ import time
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from llm_cache import CACHE_FILE, ResponseCache, cache_key
+
 # Load .env file from project root
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 load_dotenv(dotenv_path)
@@ -16,9 +18,6 @@ OPENROUTER_API_URL = 'https://openrouter.ai/api/v1/chat/completions'
 MODEL = 'openai/gpt-4o-mini'
 API_KEY = os.getenv('OPENROUTER_API_KEY')  # Assumes key is OPENROUTER_API_KEY in .env
 
-if not API_KEY:
-    raise ValueError("OPENROUTER_API_KEY not found in .env")
-
 def load_commands(file_path):
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"{file_path} not found.")
@@ -35,15 +34,22 @@ def load_chunks(file_path):
             chunks.append(json.loads(line))
     return chunks
 
-def llm_extract(batch_texts, last_cmd=None):
-
-    prompt = (
+PROMPT_TEMPLATE = (
     "Extract CLI commands from batch. Intended for quick refs in networking scripts. "
-    "Output raw JSON dict {command: {'syntax': 'full cmd + args/options', 'summary': '1-sentence purpose', 'synopsis': 'detailed desc up to 300 chars'}} ONLY. "
-    f"Batch: {' '.join(batch_texts)}"
-    )
+    "Output raw JSON dict {{command: {{'syntax': 'full cmd + args/options', 'summary': '1-sentence purpose', 'synopsis': 'detailed desc up to 300 chars'}}}} ONLY. "
+    "Batch: {batch}"
+)
+LAST_CMD_TEMPLATE = " Start after '{last_cmd}'."
+
+def batch_cache_key(batch_texts, last_cmd=None):
+    text = ' '.join(batch_texts) + (LAST_CMD_TEMPLATE.format(last_cmd=last_cmd) if last_cmd else '')
+    return cache_key(MODEL, PROMPT_TEMPLATE, text)
+
+def llm_extract(batch_texts, last_cmd=None):
+    """Return the extracted {command: info} dict, or None if the reply could not be parsed"""
+    prompt = PROMPT_TEMPLATE.format(batch=' '.join(batch_texts))
     if last_cmd:
-        prompt += f" Start after '{last_cmd}'."
+        prompt += LAST_CMD_TEMPLATE.format(last_cmd=last_cmd)
 
     response = requests.post(
         OPENROUTER_API_URL,
@@ -64,7 +70,7 @@ def llm_extract(batch_texts, last_cmd=None):
         return json.loads(content)
     except (KeyError, json.JSONDecodeError) as e:
         print(f"LLM parse error: {e}")
-        return {}
+        return None
 
 def merge_extracted(extracted, new_data):
     for cmd, info in new_data.items():
@@ -76,10 +82,13 @@ def merge_extracted(extracted, new_data):
             extracted[cmd] = info
 
 def main():
+    if not API_KEY:
+        raise ValueError("OPENROUTER_API_KEY not found in .env")
     start_time = time.time()
     start_datetime = datetime.now()
     master_cmds = load_commands(COMMAND_LIST_FILE)
     chunks = load_chunks(CHUNKS_FILE)
+    cache = ResponseCache(CACHE_FILE, source='make_sl_ref')
     extracted = {}
     last_cmd = None
     total_chunks = len(chunks)
@@ -87,6 +96,7 @@ def main():
     last_batch_time = 0.0
     all_extracted_commands = set()
     projected_finish = None
+    failed = 0
 
     for i in range(total_chunks):
         batch = []
@@ -100,7 +110,15 @@ def main():
         print(f"Processing chunk {i+1}/{total_chunks} (batch size: {len(batch)})...")
 
         batch_start = time.time()
-        new_extracted = llm_extract(batch_texts, last_cmd)
+        key = batch_cache_key(batch_texts, last_cmd)
+        new_extracted = cache.get(key)
+        if new_extracted is None:
+            new_extracted = llm_extract(batch_texts, last_cmd)
+            if new_extracted is None:
+                failed += 1
+                new_extracted = {}
+            else:
+                cache.put(key, new_extracted, chunk_id=chunks[i].get('chunk_id'))
         merge_extracted(extracted, new_extracted)
         batch_time = time.time() - batch_start
         cumulative_time += batch_time
@@ -117,6 +135,12 @@ def main():
         if new_extracted:
             last_cmd = sorted(new_extracted.keys())[-1]
 
+    # A failed batch changes the keys of the batches after it, so only a
+    # complete run knows which entries are stale
+    dropped = cache.compact() if not failed else 0
+    cache.close()
+    print(f"Cache: {cache.hits} hits, {cache.misses} LLM calls, {dropped} stale entries dropped")
+
     # Post-process: Filter to master, add stubs for misses
     final_refs = {cmd: extracted[cmd] for cmd in extracted if cmd in master_cmds}
     misses = master_cmds - set(final_refs.keys())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Page-aware streaming chunker for the CLI manual text.
+
+Rebuilds M4300_CLI_EN_chunks.jsonl style chunks (chunk_id, start_page,
+end_page, summary, text) from a manual text export in one pass:
+
+  1. The manual is memory-mapped. One scan for form feeds gives the page
+     boundaries, then the lines are read into paragraphs, which never cross
+     a page break.
+  2. Paragraphs are grouped into units. A unit that contains a Format, Mode or
+     Default label is a command entry and runs from its heading up to the next
+     heading (or the token budget), so a command and its parameter tables are
+     not split. Text between commands is its own unit.
+  3. Units are packed greedily into chunks up to the token budget. A chunk
+     starts with the trailing units of the previous one, up to the overlap
+     budget. Oversized text units are split at line boundaries; oversized
+     commands are kept whole.
+
+Chunks are yielded by a generator and written as they are produced, so memory
+stays bounded by one chunk plus one unit. The summary lists the commands a
+chunk documents, since summarising prose needs an LLM. Token counts use
+tiktoken when it is installed, otherwise a word and punctuation estimate.
+
+Usage:
+    python3 page_chunker.py --manual ../ready_1/unofficial_netgear_m4300/docs/M4300_CLI_EN.txt \
+        --output M4300_CLI_EN_chunks.jsonl --max-tokens 2000 --overlap 200
+"""
+
+import argparse
+import json
+import mmap
+import re
+import time
+
+from structural_extract import FOOTER_PATTERN, HEADER_PATTERN, HEADING_PATTERN, LABEL_PATTERN
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    tiktoken = None
+    HAS_TIKTOKEN = False
+
+MANUAL_FILE = 'M4300_CLI_EN.txt'
+OUTPUT_FILE = 'M4300_CLI_EN_chunks.jsonl'
+TOKEN_ESTIMATE = re.compile(r'\w+|[^\w\s]')
+# Text units that grow past this many budgets without a label are flushed
+# early, bounding memory on long stretches of prose
+MAX_PENDING_BUDGETS = 4
+
+
+def token_counter(encoding=None):
+    """Return a function counting the tokens of a string"""
+    if encoding and HAS_TIKTOKEN:
+        encoder = tiktoken.get_encoding(encoding)
+        return lambda text: len(encoder.encode_ordinary(text))
+    return lambda text: len(TOKEN_ESTIMATE.findall(text))
+
+
+class Paragraph:
+    """A run of non-blank lines, located by byte offsets in the manual"""
+
+    __slots__ = ('start', 'end', 'tokens', 'heading', 'label')
+
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self.tokens = 0
+        self.heading = None
+        self.label = False
+
+
+class Unit:
+    """Paragraphs that must stay in one chunk"""
+
+    __slots__ = ('paragraphs', 'tokens', 'heading', 'command')
+
+    def __init__(self):
+        self.paragraphs = []
+        self.tokens = 0
+        self.heading = None
+        self.command = False
+
+    def add(self, paragraph):
+        if not self.paragraphs and paragraph.heading:
+            self.heading = paragraph.heading
+        self.paragraphs.append(paragraph)
+        self.tokens += paragraph.tokens
+        self.command = self.command or paragraph.label
+
+    @property
+    def start(self):
+        return self.paragraphs[0].start
+
+    @property
+    def end(self):
+        return self.paragraphs[-1].end
+
+
+def iter_paragraphs(mm, count_tokens):
+    """Yield the paragraphs of a mapped manual; form feeds end a paragraph"""
+    offset = 0
+    paragraph = None
+    for raw in iter(mm.readline, b''):
+        line_start = offset
+        offset += len(raw)
+        pieces = raw.split(b'\f')
+        for index, piece in enumerate(pieces):
+            if index:
+                line_start += 1
+                if paragraph:
+                    yield paragraph
+                    paragraph = None
+            text = piece.decode('utf-8', 'replace').rstrip('\r\n')
+            piece_start, line_start = line_start, line_start + len(piece)
+            if not text.strip():
+                if paragraph:
+                    yield paragraph
+                    paragraph = None
+                continue
+            if FOOTER_PATTERN.match(text) or HEADER_PATTERN.match(text):
+                if paragraph:
+                    yield paragraph
+                    paragraph = None
+                furniture = Paragraph(piece_start)
+                furniture.end = piece_start + len(piece)
+                furniture.tokens = count_tokens(text)
+                yield furniture
+                continue
+            if paragraph is None:
+                paragraph = Paragraph(piece_start)
+                match = HEADING_PATTERN.match(text)
+                if match and len(text) < 80:
+                    paragraph.heading = match.group(1)
+            paragraph.end = piece_start + len(piece)
+            paragraph.tokens += count_tokens(text)
+            paragraph.label = paragraph.label or bool(LABEL_PATTERN.match(text))
+    if paragraph:
+        yield paragraph
+
+
+def iter_units(paragraphs, max_tokens):
+    """Group paragraphs into units, keeping each command entry whole
+
+    A unit opened by a heading collects everything up to the next heading once
+    it has seen a label, while it fits the token budget. Until then later
+    headings are folded in as well, since an indented lowercase line inside a
+    description can look like a heading.
+    """
+    unit = Unit()
+    for paragraph in paragraphs:
+        if paragraph.heading and unit.paragraphs and (unit.command or unit.heading is None):
+            yield unit
+            unit = Unit()
+        elif unit.command and not paragraph.label and unit.tokens + paragraph.tokens > max_tokens:
+            # Long tables after the labels continue as text
+            yield unit
+            unit = Unit()
+        elif unit.heading is None and unit.paragraphs and not paragraph.label:
+            # Text between commands is split at every paragraph
+            yield unit
+            unit = Unit()
+        unit.add(paragraph)
+        if not unit.command and unit.tokens > MAX_PENDING_BUDGETS * max_tokens:
+            yield unit
+            unit = Unit()
+    if unit.paragraphs:
+        yield unit
+
+
+def split_unit(mm, unit, max_tokens, count_tokens):
+    """Split an oversized text unit at line boundaries into (start, end, tokens) pieces"""
+    start = unit.start
+    tokens = 0
+    position = start
+    while position < unit.end:
+        newline = mm.find(b'\n', position, unit.end)
+        line_end = unit.end if newline < 0 else newline + 1
+        line_tokens = count_tokens(mm[position:line_end].decode('utf-8', 'replace'))
+        if tokens and tokens + line_tokens > max_tokens:
+            yield start, position, tokens
+            start, tokens = position, 0
+        tokens += line_tokens
+        position = line_end
+    if tokens:
+        yield start, unit.end, tokens
+
+
+def page_at(page_starts, offset):
+    """Return the page holding byte offset, from the sorted page start offsets"""
+    low, high = 0, len(page_starts)
+    while low < high:
+        middle = (low + high) // 2
+        if page_starts[middle] <= offset:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def iter_chunks(path, max_tokens=2000, overlap=200, encoding=None):
+    """Yield chunk dicts for the manual at path"""
+    count_tokens = token_counter(encoding)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        page_starts = [0]
+        position = mm.find(b'\f')
+        while position >= 0:
+            page_starts.append(position + 1)
+            position = mm.find(b'\f', position + 1)
+
+        def make_chunk(chunk_id, spans):
+            start, end = spans[0][0], spans[-1][1]
+            commands = [heading for _, _, _, heading in spans if heading]
+            return dict(
+                chunk_id=chunk_id,
+                start_page=page_at(page_starts, start),
+                end_page=page_at(page_starts, max(start, end - 1)),
+                summary=f"Commands: {', '.join(dict.fromkeys(commands))}." if commands else '',
+                text=mm[start:end].decode('utf-8', 'replace'),
+                tokens=sum(tokens for _, _, tokens, _ in spans),
+            )
+
+        chunk_id = 0
+        spans = []
+        tokens = 0
+        for unit in iter_units(iter_paragraphs(mm, count_tokens), max_tokens):
+            if unit.tokens > max_tokens and not unit.command:
+                pieces = [(start, end, piece_tokens, None)
+                          for start, end, piece_tokens in split_unit(mm, unit, max_tokens, count_tokens)]
+            else:
+                pieces = [(unit.start, unit.end, unit.tokens, unit.heading if unit.command else None)]
+
+            for piece in pieces:
+                if spans and tokens + piece[2] > max_tokens:
+                    chunk_id += 1
+                    yield make_chunk(chunk_id, spans)
+                    # Carry whole trailing spans forward as the overlap
+                    carried = []
+                    carried_tokens = 0
+                    for span in reversed(spans):
+                        if carried_tokens + span[2] > overlap or carried_tokens + span[2] + piece[2] > max_tokens:
+                            break
+                        carried.insert(0, span)
+                        carried_tokens += span[2]
+                    spans, tokens = carried, carried_tokens
+                spans.append(piece)
+                tokens += piece[2]
+        if spans:
+            chunk_id += 1
+            yield make_chunk(chunk_id, spans)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--manual', default=MANUAL_FILE)
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--max-tokens', type=int, default=2000, help='token budget per chunk')
+    parser.add_argument('--overlap', type=int, default=200, help='tokens carried over from the previous chunk')
+    parser.add_argument('--encoding', default=None,
+                        help='tiktoken encoding for exact counts, e.g. cl100k_base (requires tiktoken)')
+    args = parser.parse_args()
+
+    if args.encoding and not HAS_TIKTOKEN:
+        raise ValueError("--encoding requires the tiktoken package")
+
+    start = time.monotonic()
+    count = 0
+    oversized = 0
+    with open(args.output, 'w', encoding='utf-8') as f:
+        for chunk in iter_chunks(args.manual, args.max_tokens, args.overlap, args.encoding):
+            count += 1
+            oversized += chunk['tokens'] > args.max_tokens
+            json.dump(chunk, f, ensure_ascii=False)
+            f.write('\n')
+    print(f"Wrote {count} chunks in {time.monotonic() - start:.2f}s to {args.output}"
+          + (f" ({oversized} single commands over the token budget)" if oversized else ''))
+
+
+if __name__ == "__main__":
+    main()
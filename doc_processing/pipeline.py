@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the documentation pipeline.
+
+The scripts in this directory are modelled as a DAG of stages. Each stage
+reads its inputs as JSONL record generators and writes one JSONL output.
+Before running a stage, the pipeline hashes the stage's code (the source
+files of the modules it declares), its parameters and the content of every
+input. The stage is skipped when that fingerprint
+and the hash of its existing output match the last run recorded in the
+state file. Editing the manual, a chunk, an intermediate file or a stage
+therefore re-runs only that stage and the stages downstream of it.
+
+Stages:
+  structural  manual text -> command records, no LLM (structural_extract.py)
+  llm         chunks + command list -> command records (async_extract.py + llm_cache.py)
+  clean       command records -> cleaned, categorised records (clean_commands.py)
+  publish     cleaned records -> command_ref.jsonl (convert_to_jsonl.py)
+  compile     command_ref.jsonl -> command_ref.bin, the memory-mapped runtime
+              reference (plugins/module_utils/command_ref.py)
+
+The published and compiled references are written to the build directory
+unless --install (or --publish/--compiled) points them at the collection's
+docs directory, replacing the shipped reference.
+
+Usage:
+    python3 pipeline.py                      # structural extraction into build/
+    python3 pipeline.py --install            # ... and replace docs/command_ref.jsonl and .bin
+    python3 pipeline.py --extractor llm      # LLM extraction with the response cache
+    python3 pipeline.py --dry-run            # show which stages would run
+    python3 pipeline.py --force clean        # re-run a stage and everything after it
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import time
+from graphlib import TopologicalSorter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+COLLECTION_DIR = os.path.join(HERE, '..', 'ready_1', 'unofficial_netgear_m4300')
+DOCS_DIR = os.path.join(COLLECTION_DIR, 'docs')
+MODULE_UTILS_DIR = os.path.join(COLLECTION_DIR, 'plugins', 'module_utils')
+BUILD_DIR = os.path.join(HERE, 'build')
+STATE_FILE = '.pipeline_state.json'
+
+
+def file_hash(path):
+    """SHA-256 of a file's content, streamed"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_jsonl(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_jsonl(records, path):
+    """Write records atomically and return the record count"""
+    from convert_to_jsonl import write_jsonl as write
+    tmp_path = f"{path}.tmp"
+    count = write(records, tmp_path)
+    os.replace(tmp_path, path)
+    return count
+
+
+def module_hash(name):
+    """SHA-256 of an importable module's source file"""
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin:
+        raise ImportError(f"No source for module {name}")
+    return file_hash(spec.origin)
+
+
+class Stage:
+    """One pipeline step: run(inputs, params) yields the output records
+
+    write(records, path) stores them and returns the count; JSONL by default.
+    code names the modules that implement run and write; their source files
+    are part of the fingerprint, so editing them re-runs the stage.
+    """
+
+    def __init__(self, name, run, inputs, output, params=(), write=write_jsonl, code=()):
+        self.name = name
+        self.run = run
+        self.inputs = inputs
+        self.output = output
+        self.params = params
+        self.write = write
+        self.code = tuple(code) + (('convert_to_jsonl',) if write is write_jsonl else ())
+
+    def fingerprint(self, input_paths, options):
+        source = inspect.getsource(self.run) + inspect.getsource(self.write)
+        parts = dict(
+            code=hashlib.sha256(source.encode('utf-8')).hexdigest(),
+            modules={name: module_hash(name) for name in sorted(self.code)},
+            params={name: options.get(name) for name in self.params},
+            inputs={name: file_hash(path) for name, path in sorted(input_paths.items())},
+        )
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def structural_stage(inputs, options):
+    from structural_extract import iter_records
+    for record in iter_records(inputs['manual']):
+        yield {
+            'command': record['command'],
+            'syntax': record['syntax'],
+            'summary': record['summary'],
+            'synopsis': record['synopsis'],
+            'mode': record['mode'],
+            'page': record['page'],
+        }
+
+
+def llm_stage(inputs, options):
+    import asyncio
+    from async_extract import build_batches, run_pipeline
+    from llm_cache import ResponseCache
+    from make_sl_ref import MODEL, OPENROUTER_API_URL, load_chunks, load_commands
+
+    args = argparse.Namespace(
+        api_url=options.get('api_url') or OPENROUTER_API_URL,
+        api_key=options.get('api_key') or os.getenv('OPENROUTER_API_KEY'),
+        model=options.get('model') or MODEL,
+        workers=8, rate=4.0, burst=None, retries=5, retry_delay=1.0, max_retry_delay=60.0, timeout=120.0,
+    )
+    if not args.api_key:
+        raise ValueError("OPENROUTER_API_KEY not found in .env")
+
+    # Same batches and keys as async_extract.py, so the entries are shared with it
+    cache = ResponseCache(options['cache'], source='async_extract')
+    try:
+        extracted, failed = asyncio.run(run_pipeline(build_batches(load_chunks(inputs['chunks'])), args, cache))
+        if not failed:
+            cache.compact()
+    finally:
+        cache.close()
+    if failed:
+        raise RuntimeError(f"{len(failed)} chunks failed, re-run to retry them")
+
+    master_cmds = load_commands(inputs['command_list'])
+    for cmd in sorted(master_cmds):
+        info = extracted.get(cmd, {
+            'syntax': cmd,
+            'summary': 'No extraction found.',
+            'synopsis': 'Manual review needed.'
+        })
+        yield dict(info, command=cmd)
+
+
+def clean_stage(inputs, options):
+    from clean_commands import clean_records
+    for record in clean_records((r['command'], r) for r in read_jsonl(inputs['commands'])):
+        cleaned = {key: record[key] for key in ('syntax', 'summary', 'synopsis', 'category', 'related_commands')}
+        # The structural extractor also knows each command's modes and manual page
+        cleaned.update((key, record[key]) for key in ('mode', 'page') if record.get(key) is not None)
+        yield cleaned
+
+
+def publish_stage(inputs, options):
+    yield from read_jsonl(inputs['cleaned'])
+
+
+def compile_stage(inputs, options):
+    yield from read_jsonl(inputs['reference'])
+
+
+def write_compiled(records, path):
+    from command_ref import compile_command_ref
+    return compile_command_ref(records, path)
+
+
+def build_stages(options):
+    """Return the stage list wired for the chosen extractor"""
+    extract = options['extractor']
+    return [
+        Stage('structural', structural_stage, {'manual': 'manual'}, 'structural.jsonl',
+              code=('structural_extract', 'clean_commands')),
+        Stage('llm', llm_stage, {'chunks': 'chunks', 'command_list': 'command_list'}, 'llm.jsonl',
+              params=('model',), code=('async_extract', 'make_sl_ref')),
+        Stage('clean', clean_stage, {'commands': extract}, 'cleaned.jsonl', code=('clean_commands',)),
+        Stage('publish', publish_stage, {'cleaned': 'clean'}, options['publish'] or 'command_ref.jsonl'),
+        Stage('compile', compile_stage, {'reference': 'publish'}, options['compiled'] or 'command_ref.bin',
+              write=write_compiled, code=('command_ref',)),
+    ]
+
+
+def plan(stages, sources, targets):
+    """Return the stages needed for targets, in dependency order"""
+    by_name = {stage.name: stage for stage in stages}
+    needed, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name in needed or name in sources:
+            continue
+        needed.add(name)
+        pending.extend(by_name[name].inputs.values())
+    graph = {name: {dep for dep in by_name[name].inputs.values() if dep in by_name} for name in needed}
+    return [by_name[name] for name in TopologicalSorter(graph).static_order()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--extractor', choices=['structural', 'llm'], default='structural')
+    parser.add_argument('--manual', default=os.path.join(DOCS_DIR, 'M4300_CLI_EN.txt'))
+    parser.add_argument('--chunks', default=os.path.join(DOCS_DIR, 'M4300_CLI_EN_chunks.jsonl'))
+    parser.add_argument('--command-list', default=os.path.join(HERE, 'command_list.txt'))
+    parser.add_argument('--build-dir', default=BUILD_DIR, help='intermediate outputs and state')
+    parser.add_argument('--publish', default=None,
+                        help='published reference, defaults to the build directory')
+    parser.add_argument('--compiled', default=None,
+                        help='compiled reference, defaults to the build directory')
+    parser.add_argument('--install', action='store_true',
+                        help="publish to the collection's docs/command_ref.jsonl and .bin, "
+                             "replacing the shipped reference")
+    parser.add_argument('--cache', default=os.path.join(HERE, 'llm_cache.jsonl'))
+    parser.add_argument('--model', default=None)
+    parser.add_argument('--api-url', default=None)
+    parser.add_argument('--api-key', default=None)
+    parser.add_argument('--target', default='compile', help='last stage to build')
+    parser.add_argument('--force', action='append', default=[], help='re-run this stage (repeatable)')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    args.publish = args.publish and os.path.abspath(args.publish)
+    args.compiled = args.compiled and os.path.abspath(args.compiled)
+    if args.install:
+        args.publish = args.publish or os.path.join(DOCS_DIR, 'command_ref.jsonl')
+        args.compiled = args.compiled or os.path.join(DOCS_DIR, 'command_ref.bin')
+
+    sys.path[:0] = [HERE, MODULE_UTILS_DIR]
+    os.makedirs(args.build_dir, exist_ok=True)
+    options = vars(args)
+    sources = {'manual': args.manual, 'chunks': args.chunks, 'command_list': args.command_list}
+    stages = build_stages(options)
+
+    state_path = os.path.join(args.build_dir, STATE_FILE)
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+    paths = dict(sources)
+    forced = set(args.force)
+    start = time.monotonic()
+    for stage in plan(stages, sources, [args.target]):
+        output = stage.output if os.path.isabs(stage.output) else os.path.join(args.build_dir, stage.output)
+        paths[stage.name] = output
+        input_paths = {name: paths[dep] for name, dep in stage.inputs.items()}
+        fingerprint = stage.fingerprint(input_paths, options)
+        recorded = state.get(stage.name, {})
+        fresh = (
+            stage.name not in forced
+            and recorded.get('fingerprint') == fingerprint
+            and os.path.exists(output)
+            and recorded.get('output') == file_hash(output)
+        )
+        if fresh:
+            print(f"{stage.name:<11} up to date")
+            continue
+        if args.dry_run:
+            print(f"{stage.name:<11} would run")
+            forced.update(s.name for s in stages if stage.name in s.inputs.values())
+            continue
+
+        stage_start = time.monotonic()
+        count = stage.write(stage.run(input_paths, options), output)
+        state[stage.name] = dict(fingerprint=fingerprint, output=file_hash(output), records=count)
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        print(f"{stage.name:<11} {count} records in {time.monotonic() - stage_start:.2f}s -> {output}")
+
+    print(f"Pipeline finished in {time.monotonic() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Build and query the BM25 search index of the CLI manual and command reference.
+
+The index format, builder and memory-mapped reader live in the collection
+(plugins/module_utils/search_index.py) so the netgear_docs lookup plugin can
+use the same file. This script builds it ahead of time and answers queries
+from the command line.
+
+Usage:
+    python3 search_docs.py --build
+    python3 search_docs.py 'sntp server' --kinds command --limit 5
+    python3 search_docs.py 'spanning-tree port*'
+"""
+
+import argparse
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+COLLECTION_DIR = os.path.join(HERE, '..', 'ready_1', 'unofficial_netgear_m4300')
+sys.path.insert(0, os.path.join(COLLECTION_DIR, 'plugins', 'module_utils'))
+
+from search_index import INDEX_FILE, KINDS, SearchIndex, build_index, iter_documents  # noqa: E402
+
+DOCS_DIR = os.path.join(COLLECTION_DIR, 'docs')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('queries', nargs='*')
+    parser.add_argument('--docs-dir', default=DOCS_DIR)
+    parser.add_argument('--index', default=None, help=f'index file, default <docs-dir>/{INDEX_FILE}')
+    parser.add_argument('--build', action='store_true', help='(re)build the index first')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--kinds', nargs='+', choices=KINDS)
+    args = parser.parse_args()
+
+    path = args.index or os.path.join(args.docs_dir, INDEX_FILE)
+    if args.build or not os.path.exists(path):
+        start = time.monotonic()
+        documents, terms = build_index(iter_documents(args.docs_dir), path)
+        print(f"Indexed {documents} documents, {terms} terms in {time.monotonic() - start:.2f}s "
+              f"({os.path.getsize(path) / 1024:.0f} KiB) to {path}")
+
+    start = time.monotonic()
+    with SearchIndex(path) as index:
+        opened = time.monotonic() - start
+        for query in args.queries:
+            start = time.monotonic()
+            results = index.search(query, args.limit, args.kinds)
+            elapsed = (time.monotonic() - start) * 1000
+            print(f"\n{query!r}: {len(results)} results in {elapsed:.1f} ms (index opened in {opened * 1000:.1f} ms)")
+            for result in results:
+                pages = result['start_page'] if result['start_page'] == result['end_page'] else \
+                    f"{result['start_page']}-{result['end_page']}"
+                print(f"  {result['score']:7.3f}  [{result['kind']}, p. {pages}] {result['title']}")
+                if result['snippet'] and result['kind'] != 'page':
+                    print(f"           {result['snippet'][:110]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Deterministic extraction of command references from the CLI manual text.
+
+The manual (docs/M4300_CLI_EN.txt) documents every command the same way: a
+heading line with the command name, a description, then "Default", "Format"
+and "Mode" blocks. This script streams the text through a small state machine
+and yields one record per entry with the command_ref.jsonl schema (syntax,
+summary, synopsis, category, related_commands) plus the command name, its
+modes, default and the manual page it starts on. No LLM calls are made.
+
+With --compare it also reports how the result lines up with the LLM-built
+command_ref.jsonl.
+
+Usage:
+    python3 structural_extract.py --manual ../ready_1/unofficial_netgear_m4300/docs/M4300_CLI_EN.txt \
+        --compare ../ready_1/unofficial_netgear_m4300/docs/command_ref.jsonl
+"""
+
+import argparse
+import json
+import re
+import time
+
+from clean_commands import RelatedCommandIndex, get_category
+
+MANUAL_FILE = 'M4300_CLI_EN.txt'
+OUTPUT_FILE = 'command_ref_structural.jsonl'
+
+# Page furniture repeated on every page of the text export
+FOOTER_PATTERN = re.compile(r'^\S.*\s{3,}\d+\s{3,}CLI Command Reference Manual\s*$')
+HEADER_PATTERN = re.compile(r'^\s+M4300 Intelligent Edge Series Fully Managed Stackable Switches\s*$')
+# Command headings sit at a two to four space indent (it varies by chapter), start
+# lowercase or with a digit and may carry a mode qualifier, e.g. "port (TACACS Config)"
+HEADING_PATTERN = re.compile(r'^ {2,4}([a-z0-9][^\s.,:;]*(?: [^\s,:;]+)*?)(?: \(([^)]+)\))?\s*$')
+LABEL_PATTERN = re.compile(r'^( {3,6})(Format|Modes?|Default)( {2,})(\S.*?)\s*$')
+LABEL_KEYS = {'Format': 'formats', 'Mode': 'modes', 'Modes': 'modes', 'Default': 'defaults'}
+ARGUMENT_START = re.compile(r'[<\[{|]')
+SMART_QUOTES = re.compile(r'[“”]')
+
+
+def collapse(text):
+    return ' '.join(SMART_QUOTES.sub('"', text).split())
+
+
+def command_name(syntax):
+    """Return the keyword part of a syntax line, up to the first argument"""
+    words = []
+    for word in syntax.split():
+        if ARGUMENT_START.match(word):
+            break
+        words.append(word)
+    return ' '.join(words)
+
+
+def first_sentence(text):
+    match = re.match(r'(.+?\.)(?:\s|$)', text)
+    return match.group(1) if match else text
+
+
+def iter_lines(path):
+    """Yield (page, line) for the manual, pages counted by form feeds"""
+    page = 1
+    with open(path, 'r', encoding='utf-8') as f:
+        for raw in f:
+            parts = raw.rstrip('\n').split('\f')
+            for index, line in enumerate(parts):
+                if index:
+                    page += 1
+                yield page, line
+
+
+def iter_entries(path):
+    """Yield one raw entry dict per documented command, in manual order"""
+    heading = None
+    description = []
+    entry = None
+    label = None
+    value_column = 0
+    previous_blank = True
+
+    def finish():
+        if entry and entry['formats']:
+            return entry
+        return None
+
+    for page, line in iter_lines(path):
+        if FOOTER_PATTERN.match(line) or HEADER_PATTERN.match(line):
+            previous_blank = True
+            continue
+
+        if not line.strip():
+            label = None
+            previous_blank = True
+            continue
+
+        match = LABEL_PATTERN.match(line)
+        if match and (entry or heading):
+            if entry is None:
+                entry = dict(heading=heading, description=description, formats=[], modes=[],
+                             defaults=[], page=heading_page)
+                heading = None
+            label = match.group(2)
+            value_column = len(match.group(1)) + len(label) + len(match.group(3))
+            entry[LABEL_KEYS[label]].append(match.group(4))
+            previous_blank = False
+            continue
+
+        indent = len(line) - len(line.lstrip())
+        if label and indent >= value_column - 2:
+            # Continuation of a wrapped Format, Mode or Default value
+            key = LABEL_KEYS[label]
+            if key == 'modes' or line.strip().startswith('•'):
+                entry[key].append(line.strip())
+            else:
+                entry[key][-1] += ' ' + line.strip()
+            previous_blank = False
+            continue
+
+        label = None
+        done = finish()
+        if done:
+            yield done
+        entry = None
+
+        match = HEADING_PATTERN.match(line) if previous_blank else None
+        if match and len(line) < 80:
+            heading = match.groups()
+            heading_page = page
+            description = []
+        elif heading:
+            description.append(line.strip())
+        previous_blank = False
+
+    done = finish()
+    if done:
+        yield done
+
+
+def iter_records(path):
+    """Yield command_ref.jsonl style records, without related_commands"""
+    for entry in iter_entries(path):
+        name, qualifier = entry['heading']
+        description = collapse(' '.join(entry['description']))
+        modes = [collapse(m.lstrip('•')) for m in entry['modes'] if m.lstrip('•').strip()]
+        yield {
+            'syntax': collapse(entry['formats'][0]),
+            'summary': first_sentence(description),
+            'synopsis': description,
+            'category': get_category(name),
+            'related_commands': [],
+            'command': name,
+            'qualifier': qualifier,
+            'formats': [collapse(f) for f in entry['formats']],
+            'mode': modes,
+            'default': collapse(' '.join(entry['defaults'])) or None,
+            'page': entry['page'],
+        }
+
+
+def load_jsonl(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(structural, llm):
+    """Return a report dict comparing structural and LLM records"""
+    def by_syntax(records):
+        return {collapse(r['syntax']).lower(): r for r in records}
+
+    def by_name(records):
+        return {command_name(collapse(r['syntax'])).lower(): r for r in records}
+
+    s_syntax, l_syntax = by_syntax(structural), by_syntax(llm)
+    s_names, l_names = by_name(structural), by_name(llm)
+    exact = set(s_syntax) & set(l_syntax)
+    same_name = set(s_names) & set(l_names)
+    syntax_differs = sorted(name for name in same_name
+                            if collapse(s_names[name]['syntax']).lower() != collapse(l_names[name]['syntax']).lower())
+    only_llm = sorted(set(l_names) - set(s_names))
+    only_structural = sorted(set(s_names) - set(l_names))
+    return {
+        'structural_records': len(structural),
+        'llm_records': len(llm),
+        'exact_syntax_matches': len(exact),
+        'command_matches': len(same_name),
+        'syntax_differs': len(syntax_differs),
+        'only_llm': len(only_llm),
+        'only_structural': len(only_structural),
+        'llm_coverage': round(len(same_name) / len(l_names), 4) if l_names else 0.0,
+        'examples': {
+            'syntax_differs': [(name, s_names[name]['syntax'], l_names[name]['syntax'])
+                               for name in syntax_differs[:10]],
+            'only_llm': only_llm[:20],
+            'only_structural': only_structural[:20],
+        },
+    }
+
+
+def print_report(report):
+    print(f"Structural records: {report['structural_records']}, LLM records: {report['llm_records']}")
+    print(f"Exact syntax matches: {report['exact_syntax_matches']}")
+    print(f"Same command: {report['command_matches']} "
+          f"({report['llm_coverage']:.1%} of LLM commands), syntax differs for {report['syntax_differs']}")
+    print(f"Only in LLM output: {report['only_llm']}, only in structural output: {report['only_structural']}")
+    examples = report['examples']
+    for name, structural, llm in examples['syntax_differs']:
+        print(f"  {name}:\n    manual: {structural}\n    llm:    {llm}")
+    if examples['only_llm']:
+        print(f"  only LLM: {', '.join(examples['only_llm'])}")
+    if examples['only_structural']:
+        print(f"  only structural: {', '.join(examples['only_structural'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--manual', default=MANUAL_FILE)
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--compare', help='LLM built command_ref.jsonl to compare against')
+    parser.add_argument('--report', help='write the comparison report as JSON to this file')
+    parser.add_argument('--no-related', action='store_true', help='leave related_commands empty')
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    records = list(iter_records(args.manual))
+    parsed = time.monotonic() - start
+
+    if not args.no_related:
+        index = RelatedCommandIndex(record['command'] for record in records)
+        for record in records:
+            record['related_commands'] = index.related(record['command'])
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        for record in records:
+            json.dump(record, f, ensure_ascii=False)
+            f.write('\n')
+    print(f"Extracted {len(records)} commands in {parsed:.2f}s "
+          f"({time.monotonic() - start:.2f}s total) to {args.output}")
+
+    if args.compare:
+        report = compare(records, load_jsonl(args.compare))
+        print_report(report)
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenRouter chat completions endpoint.
+
+Answers POST /api/v1/chat/completions in the OpenRouter response format, so
+async_extract.py (and make_sl_ref.py with OPENROUTER_API_URL pointed here) can
+be exercised without an API key or network access. The reply is built from the
+"Format" lines of the prompt's current chunk, after an optional delay, and a
+configurable fraction of requests fail with 429 or 5xx to exercise retries.
+
+Usage:
+    python3 stub_llm_server.py --port 8765 --latency 0.5 --fail-rate 0.1
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETIONS_PATH = '/api/v1/chat/completions'
+FORMAT_PATTERN = re.compile(r'^\s*Format\s{2,}(\S.*?)\s*$', re.MULTILINE)
+
+
+def stub_extract(prompt):
+    """Return {command: info} for the Format lines of the current chunk"""
+    current = prompt.rsplit('Current chunk: ', 1)[-1]
+    commands = {}
+    for syntax in FORMAT_PATTERN.findall(current):
+        words = []
+        for word in syntax.split():
+            if word[0] in '<[{' or '|' in word:
+                break
+            words.append(word)
+        if words:
+            commands[' '.join(words)] = {
+                'syntax': syntax,
+                'summary': f"Stub summary for {' '.join(words)}.",
+                'synopsis': f"Stub synopsis extracted from the format line: {syntax}"
+            }
+    return commands
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        if self.path != COMPLETIONS_PATH:
+            self.send_json(404, {'error': {'message': 'not found'}})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        server.record_request()
+
+        with server.lock:
+            roll = server.random.random()
+            delay = server.latency + server.random.uniform(0, server.jitter)
+        time.sleep(delay)
+
+        if roll < server.fail_rate / 2:
+            server.record_failure()
+            self.send_json(429, {'error': {'message': 'rate limited'}}, {'Retry-After': str(server.retry_after)})
+            return
+        if roll < server.fail_rate:
+            server.record_failure()
+            self.send_json(503, {'error': {'message': 'upstream unavailable'}})
+            return
+
+        prompt = request.get('messages', [{}])[-1].get('content', '')
+        content = json.dumps(stub_extract(prompt))
+        self.send_json(200, {
+            'id': f"stub-{server.requests}",
+            'model': request.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}}]
+        })
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server with request counters and peak concurrency"""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, fail_rate=0.0,
+                 retry_after=0.1, seed=None):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.active = 0
+        self.peak_active = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{COMPLETIONS_PATH}"
+
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+
+    def process_request_thread(self, request, client_address):
+        with self.lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def start(self):
+        """Serve in a background thread and return the endpoint URL"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help='seconds per reply')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random seconds per reply')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='fraction of requests answered 429/503')
+    parser.add_argument('--retry-after', type=float, default=0.1, help='Retry-After seconds sent with 429')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency, args.jitter, args.fail_rate,
+                        args.retry_after, args.seed)
+    print(f"Stub LLM endpoint at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served {server.requests} requests, {server.failures} failed, "
+              f"peak concurrency {server.peak_active}")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Action plugin shared by the collection's device modules
+
+When the task uses the netgear_telnet connection, the module logic runs on the
+controller and its commands go through the task's connection: no AnsiballZ
+payload, no remote interpreter and no second login. Any other connection
+(e.g. local) executes the module as before. Modules are routed here in
+meta/runtime.yml and expose argument_spec() and run_module(module).
+"""
+
+import copy
+import importlib
+
+from ansible.errors import AnsibleActionFail
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.parameters import remove_values
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+
+display = Display()
+
+MODULES_PACKAGE = 'ansible_collections.ready_1.unofficial_netgear_m4300.plugins.modules'
+CONNECTION_OPTIONS = ('host', 'port', 'username', 'password', 'timeout')
+
+
+class ModuleExit(SystemExit):
+    """Raised by ControllerModule.exit_json / fail_json with the module result"""
+
+    def __init__(self, result):
+        super(ModuleExit, self).__init__(0)
+        self.result = result
+
+
+class ControllerModule:
+    """Just enough of AnsibleModule to run module logic in the action plugin
+
+    exit_json and fail_json raise ModuleExit, a SystemExit like
+    AnsibleModule's sys.exit, so module code keeps its control flow.
+    """
+
+    def __init__(self, params, connection, check_mode=False):
+        self.params = params
+        self.connection = connection
+        self.check_mode = check_mode
+
+    def debug(self, msg):
+        display.vvvv(msg)
+
+    def warn(self, warning):
+        display.warning(warning)
+
+    def exit_json(self, **kwargs):
+        kwargs.setdefault('changed', False)
+        raise ModuleExit(kwargs)
+
+    def fail_json(self, msg, **kwargs):
+        kwargs.update(failed=True, msg=msg)
+        raise ModuleExit(kwargs)
+
+
+class ActionModule(ActionBase):
+    """Run Netgear modules over the task's netgear_telnet connection"""
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        if getattr(self._connection, 'transport', None) != 'netgear_telnet':
+            result.update(self._execute_module(task_vars=task_vars))
+            return result
+
+        name = self._task.resolved_action.split('.')[-1]
+        try:
+            module_code = importlib.import_module(f"{MODULES_PACKAGE}.{name}")
+        except ImportError as e:
+            raise AnsibleActionFail(f"Unable to load module {name}: {e}")
+
+        argument_spec = copy.deepcopy(module_code.argument_spec())
+        for option in CONNECTION_OPTIONS:
+            argument_spec[option].pop('required', None)
+
+        validated = ArgumentSpecValidator(argument_spec).validate(self._task.args)
+        if validated.error_messages:
+            raise AnsibleActionFail(f"{name}: {', '.join(validated.error_messages)}")
+
+        params = validated.validated_parameters
+        for option in CONNECTION_OPTIONS:
+            if params.get(option) is None:
+                params[option] = self._connection.get_option(option)
+
+        if params.get('timing'):
+            self._connection.set_option('timing', True)
+
+        no_log_values = {v for v in validated._no_log_values | {params.get('password')} if v}
+        self._connection.redact(no_log_values)
+
+        module = ControllerModule(params, self._connection, check_mode=self._task.check_mode)
+        try:
+            module_code.run_module(module)
+        except ModuleExit as e:
+            module_result = e.result
+        else:
+            raise AnsibleActionFail(f"{name} returned without a result")
+
+        timing = module_result.get('timing')
+        connection_timing = self._connection.get_timing()
+        if timing and connection_timing:
+            # The connection's session times the prompt waits inside its read loop
+            timing.update(queue_wait=connection_timing['queue_wait'], queue=connection_timing['queue'],
+                          connect=connection_timing['connect'], bytes_read=connection_timing['bytes_read'],
+                          commands=connection_timing['commands'])
+
+        result.update(remove_values(module_result, no_log_values))
+        return result
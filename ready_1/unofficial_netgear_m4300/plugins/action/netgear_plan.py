@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Action plugin for netgear_plan
+
+Reads each host's netgear_system settings from hostvars and renders them into
+plans on the controller. Settings are deduplicated by the hash of their
+canonical JSON before anything else is done, so argument validation, command
+rendering, the command checks and password hashing run once per distinct
+settings; the rendered plans are deduplicated again by their own hash. Every
+host's settings are validated and rendered before the first plan is stored,
+so a bad host fails the task without leaving some plans written.
+"""
+
+import os
+
+from ansible.errors import AnsibleActionFail
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.parameters import remove_values
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.command_plan import (
+    PlanStore,
+    check_commands,
+    digest,
+    plan_dir_spec,
+    unknown_commands
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.command_ref import (
+    COMMAND_REF_FILE,
+    COMPILED_FILE,
+    load_command_ref
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.modules import netgear_system
+
+display = Display()
+
+DOCS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'docs')
+
+ARGUMENT_SPEC = dict(
+    hosts=dict(type='list', elements='str'),
+    var=dict(type='str', default='netgear_system'),
+    plan_dir=plan_dir_spec(),
+    reference=dict(type='path'),
+)
+
+
+class ActionModule(ActionBase):
+    """Render netgear_system settings into shared plans"""
+
+    TRANSFERS_FILES = False
+    _requires_connection = False
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        validated = ArgumentSpecValidator(ARGUMENT_SPEC).validate(self._task.args)
+        if validated.error_messages:
+            raise AnsibleActionFail(f"netgear_plan: {', '.join(validated.error_messages)}")
+        args = validated.validated_parameters
+
+        hosts = args['hosts'] or task_vars.get('ansible_play_hosts') or []
+        hostvars = task_vars['hostvars']
+        store = PlanStore(args['plan_dir'])
+        reference = self._reference(args['reference'])
+        plan_spec = netgear_system.plan_argument_spec()
+
+        host_keys = {}
+        rendered = {}
+        no_log_values = set()
+        for host in hosts:
+            settings = hostvars[host].get(args['var'])
+            if not settings:
+                host_keys[host] = None
+                continue
+            if not isinstance(settings, dict):
+                raise AnsibleActionFail(f"netgear_plan: {host}: {args['var']} must be a dict")
+
+            key = digest(settings)
+            if key not in rendered:
+                checked = ArgumentSpecValidator(plan_spec).validate(settings)
+                if checked.error_messages:
+                    raise AnsibleActionFail(
+                        f"netgear_plan: {host}: {args['var']}: {', '.join(checked.error_messages)}")
+                no_log_values.update(checked._no_log_values)
+
+                plan = netgear_system.render_plan(checked.validated_parameters, store)
+                errors = check_commands(plan['commands'])
+                if errors:
+                    raise AnsibleActionFail(f"netgear_plan: {host}: {'; '.join(errors)}")
+                rendered[key] = plan
+            host_keys[host] = key
+
+        # Every host's settings rendered; only now store the plans
+        plan_ids = {}
+        plans = {}
+        unknown = {}
+        written = 0
+        for key, plan in rendered.items():
+            try:
+                plan_id, new = store.put(plan)
+            except OSError as e:
+                raise AnsibleActionFail(f"netgear_plan: failed to store plan: {e}")
+            written += new
+            plan_ids[key] = plan_id
+            if plan_id not in plans:
+                plans[plan_id] = dict(commands=plan['commands'],
+                                      users=[user['name'] for user in plan['users']], hosts=0)
+                if reference is not None:
+                    unknown[plan_id] = unknown_commands(plan['commands'], reference)
+                    for command in unknown[plan_id]:
+                        display.warning(f"netgear_plan: '{command}' is not in the command reference")
+
+        host_plans = {}
+        for host, key in host_keys.items():
+            host_plans[host] = plan_ids[key] if key else None
+            if key:
+                plans[plan_ids[key]]['hosts'] += 1
+
+        display.vvv(f"netgear_plan: {len(host_plans)} hosts, {len(plan_ids)} distinct settings, "
+                    f"{len(plans)} distinct plans, {written} new")
+        result.update(remove_values(dict(
+            changed=False,
+            hosts=host_plans,
+            plans=plans,
+            distinct_plans=len(plans),
+            rendered=len(plan_ids),
+            written=written,
+            unknown_commands=unknown,
+        ), no_log_values))
+        return result
+
+    def _reference(self, path):
+        """Return the command reference to check against, or None to skip the check"""
+        if path == '':
+            return None
+        try:
+            return load_command_ref(path or os.path.join(DOCS_DIR, COMPILED_FILE),
+                                    os.path.join(DOCS_DIR, COMMAND_REF_FILE))
+        except (OSError, ValueError) as e:
+            display.warning(f"netgear_plan: command reference unavailable, commands not checked: {e}")
+            return None
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+DOCUMENTATION = """
+    name: netgear_timing
+    type: aggregate
+    short_description: Summarize Netgear session latency at the end of a play
+    description:
+        - Collects the C(timing) results returned by the collection's modules when their
+          C(timing) option (or C(ANSIBLE_NETGEAR_TIMING)) is enabled
+        - Prints per-host and per-command-class latency percentiles when the playbook ends
+        - Command classes are show, config, mode (enable/configure/exit/interface ...) and save
+    author: Unofficial Netgear M4300 Collection Maintainers
+    version_added: "1.0.0"
+    requirements:
+        - enable in configuration, e.g. C(callbacks_enabled = ready_1.unofficial_netgear_m4300.netgear_timing)
+"""
+
+from collections import defaultdict
+
+from ansible.plugins.callback import CallbackBase
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import (
+    percentile
+)
+
+
+class CallbackModule(CallbackBase):
+    """Aggregate Netgear session timings"""
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'ready_1.unofficial_netgear_m4300.netgear_timing'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super(CallbackModule, self).__init__(*args, **kwargs)
+        self._hosts = defaultdict(lambda: dict(sessions=0, queue_wait=[], connect=[],
+                                               commands=[], bytes_read=0))
+        self._classes = defaultdict(lambda: dict(elapsed=[], prompt_wait=[], bytes_read=0))
+
+    def _record(self, host, result):
+        timings = [result.get('timing')]
+        timings.extend(item.get('timing') for item in result.get('results', []) if isinstance(item, dict))
+
+        for timing in timings:
+            if not isinstance(timing, dict):
+                continue
+            stats = self._hosts[host]
+            stats['sessions'] += 1
+            stats['queue_wait'].append(timing.get('queue_wait', 0.0))
+            stats['connect'].append(timing.get('connect', 0.0))
+            stats['bytes_read'] += timing.get('bytes_read', 0)
+            for command in timing.get('commands', []):
+                stats['commands'].append(command['elapsed'])
+                cls = self._classes[command.get('cls', 'config')]
+                cls['elapsed'].append(command['elapsed'])
+                cls['prompt_wait'].append(command['prompt_wait'])
+                cls['bytes_read'] += command.get('bytes_read', 0)
+
+    def v2_runner_on_ok(self, result):
+        self._record(result._host.get_name(), result._result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result._host.get_name(), result._result)
+
+    @staticmethod
+    def _summary(values):
+        return (f"p50 {percentile(values, 50):.3f}s  p90 {percentile(values, 90):.3f}s  "
+                f"p99 {percentile(values, 99):.3f}s  max {max(values) if values else 0.0:.3f}s")
+
+    def v2_playbook_on_stats(self, stats):
+        if not self._hosts:
+            return
+
+        self._display.banner("NETGEAR TIMING")
+        for host in sorted(self._hosts):
+            data = self._hosts[host]
+            self._display.display(
+                f"{host}: {data['sessions']} sessions, {len(data['commands'])} commands, "
+                f"{data['bytes_read']} bytes read")
+            self._display.display(f"  queue wait  {self._summary(data['queue_wait'])}")
+            self._display.display(f"  connect     {self._summary(data['connect'])}")
+            self._display.display(f"  command     {self._summary(data['commands'])}")
+
+        self._display.display("")
+        for name in sorted(self._classes):
+            data = self._classes[name]
+            self._display.display(
+                f"{name}: {len(data['elapsed'])} commands, {data['bytes_read']} bytes read")
+            self._display.display(f"  elapsed     {self._summary(data['elapsed'])}")
+            self._display.display(f"  prompt wait {self._summary(data['prompt_wait'])}")
@@ -9,6 +9,8 @@ DOCUMENTATION = """
     description:
         - Connect to Netgear M4300 series switches using Telnet protocol
         - Uses netmiko library for device communication
+        - Commands run from Privileged EXEC; a session that drops part way through a task is
+          resumed in the CLI mode it was in
     author: Unofficial Netgear M4300 Collection Maintainers
     version_added: "1.0.0"
     options:
@@ -46,6 +48,116 @@ DOCUMENTATION = """
         description:
           - Maximum time to wait for command execution
         default: 30
+      max_sessions:
+        description:
+          - Maximum number of concurrent telnet sessions this controller opens to one switch
+          - Shared by all forks and by modules using run_commands; excess sessions wait in FIFO order
+        type: int
+        default: 2
+        env:
+          - name: ANSIBLE_NETGEAR_MAX_SESSIONS
+        vars:
+          - name: ansible_netgear_max_sessions
+      session_lock_dir:
+        description:
+          - Directory holding the per-switch session lock files
+        type: path
+        default: ~/.ansible/netgear_sessions
+        env:
+          - name: ANSIBLE_NETGEAR_SESSION_LOCK_DIR
+        vars:
+          - name: ansible_netgear_session_lock_dir
+      session_wait_timeout:
+        description:
+          - Maximum time in seconds to wait for a free session slot, 0 waits forever
+        type: int
+        default: 300
+        env:
+          - name: ANSIBLE_NETGEAR_SESSION_WAIT_TIMEOUT
+        vars:
+          - name: ansible_netgear_session_wait_timeout
+      connect_retries:
+        description:
+          - Number of times to retry a failed connection attempt with jittered exponential backoff
+          - Authentication failures are not retried
+        type: int
+        default: 3
+        env:
+          - name: ANSIBLE_NETGEAR_CONNECT_RETRIES
+        vars:
+          - name: ansible_netgear_connect_retries
+      connect_retry_delay:
+        description:
+          - Base delay in seconds for the connection retry backoff
+        type: float
+        default: 1.0
+        env:
+          - name: ANSIBLE_NETGEAR_CONNECT_RETRY_DELAY
+        vars:
+          - name: ansible_netgear_connect_retry_delay
+      resume_retries:
+        description:
+          - Number of times a session that drops part way through a task logs in again, restores
+            the CLI mode and continues from the first unacknowledged command
+          - 0 fails the task on the first dropped connection
+          - Only EOF and socket errors count as a dropped connection; a command that times out
+            waiting for its prompt fails the task
+        type: int
+        default: 2
+        env:
+          - name: ANSIBLE_NETGEAR_RESUME_RETRIES
+        vars:
+          - name: ansible_netgear_resume_retries
+      resume_verify:
+        description:
+          - Before resending the config command that was in flight when the connection dropped,
+            look it up in the running-config section of its CLI mode and skip it if the switch
+            already applied it
+        type: bool
+        default: false
+        env:
+          - name: ANSIBLE_NETGEAR_RESUME_VERIFY
+        vars:
+          - name: ansible_netgear_resume_verify
+      timing:
+        description:
+          - Record queue wait, login and per-command latency for the session
+        type: bool
+        default: false
+        env:
+          - name: ANSIBLE_NETGEAR_TIMING
+        vars:
+          - name: ansible_netgear_timing
+      record_transcript:
+        description:
+          - Append a timestamped transcript of the session (bytes sent and received, command
+            and prompt markers) to this file
+          - The login password and the no_log values of the task are masked in the data sent and received
+        type: path
+        env:
+          - name: ANSIBLE_NETGEAR_RECORD_TRANSCRIPT
+        vars:
+          - name: ansible_netgear_record_transcript
+      replay_transcript:
+        description:
+          - Replay a recorded transcript instead of connecting to the switch
+          - The recorded device output is served from a local port so the full client
+            stack runs against captured traffic
+        type: path
+        env:
+          - name: ANSIBLE_NETGEAR_REPLAY_TRANSCRIPT
+        vars:
+          - name: ansible_netgear_replay_transcript
+      replay_speed:
+        description:
+          - Replay speed relative to the recording, e.g. 10 for ten times faster
+          - 0 replays without any delays
+        type: float
+        default: 1.0
+        env:
+          - name: ANSIBLE_NETGEAR_REPLAY_SPEED
+        vars:
+          - name: ansible_netgear_replay_speed
 """
 
 EXAMPLES = """
@@ -71,20 +183,26 @@ from ansible.errors import AnsibleConnectionFailure
 from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.plugins.connection import ConnectionBase
 from ansible.utils.display import Display
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.cli_session import (
+    CliSession
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.session_limiter import (
+    SessionLimiter,
+    SessionLimitTimeout,
+    retry_with_backoff
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import (
+    new_timer
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.transcript import (
+    ReplayServer,
+    TranscriptError,
+    TranscriptWriter,
+    connect
+)
 
 display = Display()
 
-# Import netmiko at module level to avoid import issues
-try:
-    from netmiko import ConnectHandler
-    from netmiko.exceptions import NetMikoTimeoutException, NetMikoAuthenticationException
-    HAS_NETMIKO = True
-except ImportError:
-    ConnectHandler = None
-    NetMikoTimeoutException = None
-    NetMikoAuthenticationException = None
-    HAS_NETMIKO = False
-
 
 class Connection(ConnectionBase):
     """Netgear Telnet connection plugin"""
@@ -96,13 +214,22 @@ class Connection(ConnectionBase):
         super(Connection, self).__init__(play_context, new_stdin, *args, **kwargs)
         self._connected = False
         self._connection = None
+        self._limiter = None
+        self._timer = None
+        self._transcript = None
+        self._replay = None
+        self._no_log_values = set()
 
     def _connect(self):
         """Establish connection to the Netgear switch"""
         if self._connected:
             return
 
-        if not HAS_NETMIKO:
+        # netmiko pulls in paramiko, textfsm and friends; import it on the first
+        # real connection rather than whenever the plugin is loaded
+        try:
+            from netmiko.exceptions import NetMikoTimeoutException, NetMikoAuthenticationException
+        except ImportError:
             raise AnsibleConnectionFailure("netmiko is required for netgear_telnet connection plugin")
 
         host = self.get_option('host')
@@ -110,32 +237,87 @@ class Connection(ConnectionBase):
         username = self.get_option('username')
         password = self.get_option('password')
         timeout = self.get_option('timeout') or 30
+        self._timer = new_timer(self.get_option('timing'))
+
+        self._limiter = SessionLimiter(
+            host,
+            max_sessions=self.get_option('max_sessions'),
+            lock_dir=self.get_option('session_lock_dir'),
+            timeout=self.get_option('session_wait_timeout'),
+        )
+        try:
+            wait_time = self._limiter.acquire()
+        except SessionLimitTimeout as e:
+            raise AnsibleConnectionFailure(str(e))
+        self._timer.queued(self._limiter.metrics())
+        display.vvv(f"Acquired session slot for {host} after {wait_time:.3f}s in queue "
+                    f"(position {self._limiter.queue_position} of {self._limiter.max_sessions} sessions)")
+
+        replay = self.get_option('replay_transcript')
+        if replay:
+            try:
+                self._replay = ReplayServer(replay, speed=self.get_option('replay_speed'))
+            except (OSError, TranscriptError) as e:
+                self._limiter.release()
+                raise AnsibleConnectionFailure(f"Failed to load transcript {replay}: {e}")
+            host, port = self._replay.host, self._replay.start()
+            display.vvv(f"Replaying {replay} for {self.get_option('host')}")
+
+        record = self.get_option('record_transcript')
+        if record:
+            self._transcript = TranscriptWriter(record, redact=[password] + list(self._no_log_values))
 
         display.vvv(f"Connecting to {host}:{port} via Telnet")
 
+        # Netmiko device parameters for Netgear M4300
+        device_params = {
+            'device_type': 'cisco_ios_telnet',  # Netgear uses similar CLI to Cisco IOS
+            'host': host,
+            'port': port,
+            'username': username,
+            'password': password,
+            'timeout': timeout,
+            'session_timeout': timeout,
+            'global_delay_factor': 1,
+            'secret': password,  # Enable password if needed
+        }
+
+        def on_retry(attempt, delay, error):
+            display.vvv(f"Connection attempt {attempt} to {host} failed ({error}), retrying in {delay:.2f}s")
+
+        def open_connection():
+            if self._transcript:
+                self._transcript.session(host=host, port=port, transport=self.transport)
+            return retry_with_backoff(
+                lambda: connect(device_params, self._transcript),
+                retries=self.get_option('connect_retries'),
+                base_delay=self.get_option('connect_retry_delay'),
+                retry_on=(NetMikoTimeoutException, EOFError, ConnectionError),
+                on_retry=on_retry,
+            )
+
         try:
-            # Netmiko device parameters for Netgear M4300
-            device_params = {
-                'device_type': 'cisco_ios_telnet',  # Netgear uses similar CLI to Cisco IOS
-                'host': host,
-                'port': port,
-                'username': username,
-                'password': password,
-                'timeout': timeout,
-                'session_timeout': timeout,
-                'global_delay_factor': 1,
-                'secret': password,  # Enable password if needed
-            }
-
-            self._connection = ConnectHandler(**device_params)
+            self._connection = CliSession(
+                open_connection,
+                read_timeout=self.get_option('persistent_command_timeout') or timeout,
+                resume_retries=self.get_option('resume_retries'),
+                verify=self.get_option('resume_verify'),
+                timer=self._timer,
+                transcript=self._transcript,
+                log=display.vvv,
+            )
+            self._connection.connect()
             self._connected = True
             display.vvv(f"Successfully connected to {host}")
 
         except NetMikoTimeoutException as e:
+            self.close()
             raise AnsibleConnectionFailure(f"Connection timeout to {host}:{port}: {e}")
         except NetMikoAuthenticationException as e:
+            self.close()
             raise AnsibleConnectionFailure(f"Authentication failed for {host}: {e}")
         except Exception as e:
+            self.close()
             raise AnsibleConnectionFailure(f"Failed to connect to {host}: {e}")
 
     def exec_command(self, cmd, in_data=None, sudoable=True):
@@ -150,8 +332,8 @@ class Connection(ConnectionBase):
         display.vvv(f"Executing command: {cmd}")
 
         try:
-            # Send command and get output
-            output = self._connection.send_command(cmd)
+            # Send command and get output; a dropped connection is resumed by the session
+            output = self._connection.send(cmd)
 
             # Convert to bytes as expected by Ansible
             return 0, to_bytes(output), b''
@@ -167,10 +349,37 @@ class Connection(ConnectionBase):
         """Fetch file from switch (not supported for Telnet)"""
         raise AnsibleConnectionFailure("File transfer not supported over Telnet connection")
 
+    def redact(self, values):
+        """Mask values, such as the task's no_log values, in the recorded transcript"""
+        self._no_log_values.update(v for v in values if v)
+        if self._transcript:
+            self._transcript.redact(values)
+
+    def get_timing(self):
+        """Return the session timings, or None when timing is disabled"""
+        return self._timer.as_dict() if self._timer else None
+
     def close(self):
         """Close the connection"""
+        if self._limiter and self._connected:
+            queue = self._limiter.metrics()
+            display.vvv(f"Session queue: wait_time={queue['wait_time']:.3f}s "
+                        f"queue_position={queue['queue_position']} max_sessions={queue['max_sessions']}")
+        if self._timer and self._timer.enabled:
+            timing = self._timer.as_dict()
+            display.vvv(f"Session timing: queue_wait={timing['queue_wait']:.3f}s "
+                        f"connect={timing['connect']:.3f}s commands={len(timing['commands'])} "
+                        f"bytes_read={timing['bytes_read']}")
         if self._connection and self._connected:
             display.vvv("Closing Telnet connection")
-            self._connection.disconnect()
+            self._connection.close()
             self._connected = False
             self._connection = None
+        if self._transcript:
+            self._transcript.close()
+            self._transcript = None
+        if self._replay:
+            self._replay.stop()
+            self._replay = None
+        if self._limiter:
+            self._limiter.release()
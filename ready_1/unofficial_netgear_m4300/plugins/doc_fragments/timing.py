@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+
+class ModuleDocFragment(object):
+    """Session latency instrumentation shared by the CLI modules"""
+
+    DOCUMENTATION = r"""
+options:
+  timing:
+    description:
+      - Return a session latency breakdown in seconds in C(timing)
+      - C(timing) contains queue_wait, queue (the session limiter's wait_time,
+        queue_position and max_sessions), connect, total, bytes_read and a commands
+        list with elapsed, prompt_wait and bytes_read per command
+      - C(timing) is null when this option is disabled
+      - Can also be set with the E(ANSIBLE_NETGEAR_TIMING) environment variable
+    type: bool
+    default: false
+"""
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+DOCUMENTATION = """
+    name: netgear_command
+    short_description: Look up M4300 CLI commands in the compiled command reference
+    description:
+        - Returns the command reference entries (syntax, summary, synopsis, category, related
+          commands, command modes and manual page) of the given command names, one per
+          documented syntax variant
+        - With C(complete), returns the command names starting with each term instead
+        - Reads the memory-mapped C(command_ref.bin), which is compiled from C(command_ref.jsonl)
+          on first use and whenever the JSONL file is newer, so forks share one copy of the data
+    author: Unofficial Netgear M4300 Collection Maintainers
+    version_added: "1.0.0"
+    options:
+        _terms:
+            description: Command names, e.g. C(sntp server). Arguments after the keywords are ignored.
+            required: true
+            type: list
+            elements: str
+        complete:
+            description: Treat the terms as prefixes and return the matching command names
+            type: bool
+            default: false
+        limit:
+            description: Maximum number of names per prefix when C(complete) is set
+            type: int
+        mode:
+            description:
+                - Only return entries documented for this command mode, e.g. C(Global Config)
+                - Entries without mode information never match
+            type: str
+        reference:
+            description:
+                - Path of the compiled reference
+                - Defaults to C(command_ref.bin) in the collection's docs directory
+            type: path
+"""
+
+EXAMPLES = """
+- name: Show the syntax of a command
+  ansible.builtin.debug:
+    msg: "{{ lookup('ready_1.unofficial_netgear_m4300.netgear_command', 'sntp server').syntax }}"
+
+- name: Fail early on commands the reference does not know
+  ansible.builtin.assert:
+    that: query('ready_1.unofficial_netgear_m4300.netgear_command', item) | length > 0
+  loop: "{{ planned_commands }}"
+
+- name: Show where the interface form of a command is documented
+  ansible.builtin.debug:
+    msg: "{{ query('ready_1.unofficial_netgear_m4300.netgear_command', 'description', mode='Interface Config') | map(attribute='page') }}"
+
+- name: List the spanning-tree bpdu commands
+  ansible.builtin.debug:
+    msg: "{{ query('ready_1.unofficial_netgear_m4300.netgear_command', 'spanning-tree bpdu', complete=true) }}"
+"""
+
+RETURN = """
+    _raw:
+        description: Reference entries, or command names with C(complete)
+        type: list
+        elements: raw
+"""
+
+import os
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.command_ref import (
+    COMMAND_REF_FILE,
+    COMPILED_FILE,
+    load_command_ref
+)
+
+DOCS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'docs')
+
+
+class LookupModule(LookupBase):
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        path = self.get_option('reference') or os.path.join(DOCS_DIR, COMPILED_FILE)
+        source = os.path.join(DOCS_DIR, COMMAND_REF_FILE)
+
+        try:
+            reference = load_command_ref(path, source)
+        except (OSError, ValueError) as e:
+            raise AnsibleError(f"netgear_command: {e}")
+
+        results = []
+        for term in terms:
+            if self.get_option('complete'):
+                results.extend(reference.complete(term, self.get_option('limit')))
+            else:
+                results.extend(reference.find(term, self.get_option('mode')))
+        return results
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+DOCUMENTATION = """
+    name: netgear_docs
+    short_description: Search the M4300 CLI manual and command reference
+    description:
+        - Runs a BM25 ranked full-text search over the pages of the CLI manual, the manual chunk
+          summaries and the syntax and summary of every command_ref.jsonl entry shipped in the
+          collection's docs directory
+        - The search index is a single memory-mapped file. A prebuilt C(search_index.bin) in the
+          docs directory is used while no source file is newer than it; otherwise the index is
+          built on first use into a per-user cache directory, and rebuilt there when a source
+          file is newer than it, so the installed collection is never written to
+        - Returns the results of each query in turn, best match first
+    author: Unofficial Netgear M4300 Collection Maintainers
+    version_added: "1.0.0"
+    options:
+        _terms:
+            description: Search queries. Words are ORed, a trailing C(*) matches a prefix.
+            required: true
+            type: list
+            elements: str
+        limit:
+            description: Maximum number of results per query
+            type: int
+            default: 10
+        kinds:
+            description: Only return these document kinds
+            type: list
+            elements: str
+            choices: ['page', 'chunk', 'command']
+        index:
+            description:
+                - Path of the search index file, built there if missing or out of date
+                - Defaults to the prebuilt C(search_index.bin) in the docs directory when it is
+                  current, and to a file under C(~/.ansible/netgear_docs) otherwise
+            type: path
+        docs_dir:
+            description:
+                - Directory holding M4300_CLI_EN.txt, M4300_CLI_EN_chunks.jsonl and command_ref.jsonl
+                - Defaults to the collection's docs directory
+            type: path
+"""
+
+EXAMPLES = """
+- name: Find the commands that configure SNTP servers
+  ansible.builtin.debug:
+    msg: "{{ item.title }} (page {{ item.start_page }})"
+  loop: "{{ lookup('ready_1.unofficial_netgear_m4300.netgear_docs', 'sntp server', kinds=['command'], limit=5, wantlist=True) }}"
+
+- name: Manual pages about spanning tree port settings
+  ansible.builtin.debug:
+    msg: "{{ query('ready_1.unofficial_netgear_m4300.netgear_docs', 'spanning-tree port*', kinds=['page']) }}"
+"""
+
+RETURN = """
+    _raw:
+        description: Search results of each query, best match first
+        type: list
+        elements: dict
+        contains:
+            kind:
+                description: Document kind, one of page, chunk and command
+                type: str
+            title:
+                description: Command syntax, C(Manual page N) or C(Chunk N)
+                type: str
+            snippet:
+                description: Command or chunk summary, or the first line of the page
+                type: str
+            start_page:
+                description: First manual page of the document, 0 if unknown
+                type: int
+            end_page:
+                description: Last manual page of the document, 0 if unknown
+                type: int
+            score:
+                description: BM25 score
+                type: float
+"""
+
+import hashlib
+import os
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+from ansible.utils.display import Display
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.search_index import (
+    CHUNKS_FILE,
+    COMMAND_REF_FILE,
+    INDEX_FILE,
+    MANUAL_FILE,
+    SearchIndex,
+    build_index,
+    iter_documents,
+)
+
+display = Display()
+
+DOCS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'docs')
+CACHE_DIR = '~/.ansible/netgear_docs'
+
+# Open indexes, kept for the life of the worker process
+_indexes = {}
+
+
+def index_built(path, docs_dir):
+    """Return the mtime of the index at path, or None if it is missing or older than the docs"""
+    sources = [os.path.join(docs_dir, name) for name in (MANUAL_FILE, CHUNKS_FILE, COMMAND_REF_FILE)]
+    try:
+        built = os.path.getmtime(path)
+    except OSError:
+        return None
+    if any(os.path.getmtime(source) > built for source in sources):
+        return None
+    return built
+
+
+def default_index_path(docs_dir):
+    """Return the prebuilt index of docs_dir if it is current, else its per-user cache path"""
+    shipped = os.path.join(docs_dir, INDEX_FILE)
+    if index_built(shipped, docs_dir) is not None:
+        return shipped
+    # One index per docs directory, e.g. per installed copy of the collection
+    key = hashlib.sha256(os.path.realpath(docs_dir).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(CACHE_DIR), key, INDEX_FILE)
+
+
+def open_index(path, docs_dir):
+    """Return a SearchIndex for path, (re)building it if the docs are newer"""
+    built = index_built(path, docs_dir)
+    if built is None:
+        display.vvv(f"netgear_docs: building search index {path}")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        build_index(iter_documents(docs_dir), path)
+        built = os.path.getmtime(path)
+        if path in _indexes:
+            _indexes.pop(path)[1].close()
+
+    cached = _indexes.get(path)
+    if cached is None or cached[0] != built:
+        if cached is not None:
+            cached[1].close()
+        cached = _indexes[path] = (built, SearchIndex(path))
+    return cached[1]
+
+
+class LookupModule(LookupBase):
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        docs_dir = self.get_option('docs_dir') or DOCS_DIR
+
+        try:
+            path = self.get_option('index') or default_index_path(docs_dir)
+            index = open_index(path, docs_dir)
+            results = []
+            for term in terms:
+                results.extend(index.search(term, self.get_option('limit'), self.get_option('kinds')))
+            return results
+        except (OSError, ValueError) as e:
+            raise AnsibleError(f"netgear_docs: {e}")
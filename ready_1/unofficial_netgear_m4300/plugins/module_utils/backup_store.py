@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Content-addressed, compressed store for Netgear M4300 configuration backups
+
+Layout::
+
+    <root>/objects/<hh>/<sha256>.zst|.gz   compressed config blocks
+    <root>/snapshots/<host>/<snapshot>.json  ordered list of block hashes
+
+A running-config is split into blocks (see split_config_blocks) and every block
+is stored once, keyed by the SHA-256 of its text. Identical blocks across
+switches and runs share one object, so a snapshot of an unchanged switch costs
+only its small manifest. The "!" comment lines, which carry volatile data such
+as the system up time, are kept in the manifest instead of the blocks so they
+neither defeat deduplication nor make an unchanged config look new.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.netgear import (
+    CONFIG_BLOCK_PATTERN
+)
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+SNAPSHOT_ID_PATTERN = re.compile(r'^\d{8}T\d{6}Z$')
+
+
+def split_config_blocks(config_output):
+    """Split running-config text into (name, text) blocks
+
+    Blocks start at each block-opening line and end after its "exit", so
+    per-interface and per-protocol blocks become separate objects. Joining
+    the block texts reproduces the input exactly.
+    """
+    blocks = []
+    stack = []
+    current = []
+
+    def flush():
+        if current:
+            blocks.append((' > '.join(stack) or 'top', ''.join(current)))
+            del current[:]
+
+    for line in config_output.splitlines(True):
+        stripped = line.strip()
+        if CONFIG_BLOCK_PATTERN.match(stripped):
+            flush()
+            stack.append(stripped)
+            current.append(line)
+        elif stripped == 'exit' and stack:
+            current.append(line)
+            flush()
+            stack.pop()
+        else:
+            current.append(line)
+    flush()
+
+    return blocks
+
+
+def split_comment_lines(config_output):
+    """Separate the "!" comment lines of a running-config from the rest
+
+    Returns (text, comments) where comments is a list of [line_number, line]
+    pairs. merge_comment_lines() puts them back.
+    """
+    text = []
+    comments = []
+    for number, line in enumerate(config_output.splitlines(True)):
+        if line.strip().startswith('!'):
+            comments.append([number, line])
+        else:
+            text.append(line)
+    return ''.join(text), comments
+
+
+def merge_comment_lines(text, comments):
+    """Reinsert comment lines removed by split_comment_lines()"""
+    lines = text.splitlines(True)
+    for number, line in comments:
+        lines.insert(number, line)
+    return ''.join(lines)
+
+
+def compress(data, compression):
+    """Compress bytes with zstd or gzip"""
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def decompress(data, compression):
+    """Decompress bytes written by compress()"""
+    if compression == 'zstd':
+        if not HAS_ZSTD:
+            raise ValueError("zstandard is required to read zstd compressed objects")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def atomic_write(path, data):
+    """Write bytes to path through a temporary file and rename"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ConfigStore:
+    """Content-addressed configuration backup store"""
+
+    EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+
+    def __init__(self, root, compression='auto'):
+        self.root = root
+        if compression == 'auto':
+            compression = 'zstd' if HAS_ZSTD else 'gzip'
+        if compression == 'zstd' and not HAS_ZSTD:
+            raise ValueError("zstandard is required for zstd compression")
+        self.compression = compression
+
+    def _object_path(self, digest, compression):
+        return os.path.join(self.root, 'objects', digest[:2], digest + self.EXTENSIONS[compression])
+
+    def _snapshot_dir(self, host):
+        return os.path.join(self.root, 'snapshots', host)
+
+    def put_object(self, text):
+        """Store a block and return (digest, bytes_written)"""
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        for compression in self.EXTENSIONS:
+            if os.path.exists(self._object_path(digest, compression)):
+                return digest, 0
+        payload = compress(data, self.compression)
+        atomic_write(self._object_path(digest, self.compression), payload)
+        return digest, len(payload)
+
+    def get_object(self, digest):
+        """Return the text of a stored block"""
+        for compression in self.EXTENSIONS:
+            path = self._object_path(digest, compression)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return decompress(f.read(), compression).decode('utf-8')
+        raise KeyError(f"Object {digest} not found in {self.root}")
+
+    def list_snapshots(self, host):
+        """Return snapshot ids for a host, oldest first"""
+        directory = self._snapshot_dir(host)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-5] for name in os.listdir(directory)
+                      if name.endswith('.json') and SNAPSHOT_ID_PATTERN.match(name[:-5]))
+
+    def load_snapshot(self, host, snapshot_id):
+        """Return the manifest of a snapshot"""
+        path = os.path.join(self._snapshot_dir(host), f"{snapshot_id}.json")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def resolve_snapshot(self, host, snapshot='latest'):
+        """Return the newest snapshot id at or before a point in time
+
+        snapshot may be "latest", a full snapshot id or any prefix of one such
+        as "20250601" for the state at the end of that day.
+        """
+        snapshots = self.list_snapshots(host)
+        if not snapshots:
+            raise KeyError(f"No snapshots for {host} in {self.root}")
+        if snapshot == 'latest':
+            return snapshots[-1]
+        bound = snapshot + '~'  # '~' sorts after every character in an id
+        candidates = [s for s in snapshots if s <= bound]
+        if not candidates:
+            raise KeyError(f"No snapshot for {host} at or before {snapshot}")
+        return candidates[-1]
+
+    def backup(self, host, config_output, timestamp=None):
+        """Store a running-config for a host
+
+        Returns a dict describing the snapshot. No manifest is written when the
+        config is identical to the latest snapshot apart from its comment lines.
+        The manifest sha256 covers the config without comment lines.
+        """
+        text, comments = split_comment_lines(config_output)
+        blocks = split_config_blocks(text)
+        manifest = dict(
+            host=host,
+            sha256=hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            size=len(config_output.encode('utf-8')),
+            comments=comments,
+            blocks=[],
+        )
+
+        bytes_written = 0
+        new_objects = 0
+        for name, text in blocks:
+            digest, written = self.put_object(text)
+            manifest['blocks'].append([name, digest])
+            bytes_written += written
+            new_objects += 1 if written else 0
+
+        snapshots = self.list_snapshots(host)
+        if snapshots:
+            latest = self.load_snapshot(host, snapshots[-1])
+            if latest['sha256'] == manifest['sha256']:
+                return dict(snapshot=snapshots[-1], created=False, blocks=len(blocks),
+                            new_objects=new_objects, bytes_written=bytes_written)
+
+        snapshot_id = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime(timestamp))
+        manifest['snapshot'] = snapshot_id
+        data = json.dumps(manifest, separators=(',', ':')).encode('utf-8')
+        atomic_write(os.path.join(self._snapshot_dir(host), f"{snapshot_id}.json"), data)
+        bytes_written += len(data)
+
+        return dict(snapshot=snapshot_id, created=True, blocks=len(blocks),
+                    new_objects=new_objects, bytes_written=bytes_written)
+
+    def restore(self, host, snapshot='latest'):
+        """Rebuild the config text of a snapshot and return (snapshot_id, text)"""
+        snapshot_id = self.resolve_snapshot(host, snapshot)
+        manifest = self.load_snapshot(host, snapshot_id)
+        text = ''.join(self.get_object(digest) for name, digest in manifest['blocks'])
+        if hashlib.sha256(text.encode('utf-8')).hexdigest() != manifest['sha256']:
+            raise ValueError(f"Snapshot {snapshot_id} of {host} failed checksum verification")
+        return snapshot_id, merge_comment_lines(text, manifest.get('comments', []))
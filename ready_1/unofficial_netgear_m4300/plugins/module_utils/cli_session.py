@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Resumable command sessions for Netgear M4300 switches
+
+CliSession wraps a netmiko connection. Every command waits for whichever
+mode's prompt comes back, so a command counts as acknowledged once the switch
+has returned a prompt for it, and the prompt tells the session which CLI mode
+it is in. The session also keeps the commands that entered the current mode
+from Privileged EXEC, e.g. ["configure", "interface 1/0/1"].
+
+If the connection drops part way through a batch (EOF or a socket error), the
+session logs in again, enters Privileged EXEC, replays the mode-entering
+commands and resends the first unacknowledged command, so the rest of the
+batch continues where it stopped. A read timeout is not a drop: the switch may
+just be slow (save config, a confirmation prompt) and resending on a new login
+could run the command twice, so it fails the batch. The command in flight may
+already have been applied; with verify set, a config command is first looked
+up in the running-config section of the current mode and skipped if it is
+there.
+"""
+
+import socket
+
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.prompt_recognizer import (
+    prompt_search_pattern,
+    recognize_prompt
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import (
+    NULL_TIMER,
+    command_class
+)
+
+
+class CliSessionError(Exception):
+    """Raised when a session cannot be resumed in the mode it was in"""
+
+
+class CliSession:
+    """A netmiko session that tracks its CLI mode and resumes after a dropped connection"""
+
+    def __init__(self, open_connection, read_timeout=30, resume_retries=2, verify=False,
+                 timer=None, transcript=None, log=None):
+        """open_connection is called with no arguments and returns a logged in netmiko connection"""
+        self.open_connection = open_connection
+        self.read_timeout = read_timeout
+        self.resume_retries = resume_retries
+        self.verify = verify
+        self.timer = timer or NULL_TIMER
+        self.transcript = transcript
+        self.log = log or (lambda msg: None)
+        self.dropped_errors = (EOFError, OSError)
+        self.connection = None
+        self.mode = None
+        self.path = []
+        self.acked = 0
+        self.resumes = 0
+
+    def connect(self):
+        """Log in, enter Privileged EXEC and restore the tracked mode"""
+        with self.timer.connect():
+            self.connection = self.open_connection()
+            self.mode = recognize_prompt(self.connection.find_prompt())
+            if self.mode == 'user_exec':
+                self.connection.enable()
+                self.mode = 'priv_exec'
+        for mode, command in self.path:
+            output, seen = self._send(command)
+            if seen != mode:
+                raise CliSessionError(f"Expected {mode} after '{command}' while resuming, got {seen}: {output}")
+            self.mode = seen
+
+    def send(self, command):
+        """Send a command and return its output, resuming the session if the connection drops"""
+        while True:
+            try:
+                if self.connection is None:
+                    self.connect()
+                    if self.verify and self._applied(command):
+                        self.log(f"'{command}' is already in the running-config, not resending it")
+                        self.acked += 1
+                        return ''
+                output, mode = self._send(command)
+            except self.dropped_errors as e:
+                # A socket timeout means a slow switch, not a dropped connection
+                if isinstance(e, socket.timeout) or self.resumes >= self.resume_retries:
+                    raise
+                self.resumes += 1
+                self.log(f"Connection lost after {self.acked} acknowledged commands ({type(e).__name__}: {e}), "
+                         f"resuming at '{command}' (attempt {self.resumes} of {self.resume_retries})")
+                self._discard()
+                continue
+            self._track(command, mode)
+            self.acked += 1
+            return output
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.disconnect()
+            self.connection = None
+
+    def _send(self, command):
+        """Send one command and return (output without the prompt, mode of the prompt)"""
+        if self.transcript:
+            self.transcript.command(command)
+        pattern = prompt_search_pattern()
+        with self.timer.command(command) as record:
+            with self.timer.prompt(record, self.connection, pattern):
+                output = self.connection.send_command(
+                    command, expect_string=pattern, read_timeout=self.read_timeout, strip_prompt=False,
+                )
+        lines = output.rstrip().splitlines()
+        mode = recognize_prompt(lines[-1]) if lines else 'unknown'
+        if mode != 'unknown':
+            prompt = lines.pop().strip()
+            output = '\n'.join(lines).rstrip()
+        else:
+            prompt = ''
+        if self.transcript:
+            self.transcript.end(prompt)
+        return output, mode
+
+    def _track(self, command, mode):
+        """Update the current mode and the commands that entered it"""
+        if mode == 'unknown' or mode == self.mode:
+            return
+        modes = [entered for entered, _ in self.path]
+        if mode == 'priv_exec':
+            self.path = []
+        elif mode in modes:
+            del self.path[modes.index(mode) + 1:]
+        else:
+            self.path.append((mode, command))
+        self.mode = mode
+
+    def _applied(self, command):
+        """Return True if a config command is already in the running-config section of the current mode
+
+        The section is the block the tracked mode commands entered, e.g.
+        "configure > interface 1/0/1", so a line that only appears in another
+        interface does not count. Commands outside a config mode are always resent.
+        """
+        from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.netgear import (
+            parse_config_sections
+        )
+
+        if command_class(command) != 'config' or not self.path:
+            return False
+        section = ' > '.join(' '.join(entered.split()) for _, entered in self.path)
+        output, _ = self._send('show running-config')
+        command = ' '.join(command.split())
+        return command in (' '.join(line.split()) for line in parse_config_sections(output).get(section, []))
+
+    def _discard(self):
+        """Close a broken connection's socket without logging out"""
+        connection, self.connection = self.connection, None
+        try:
+            connection.remote_conn.close()
+        except Exception:
+            pass
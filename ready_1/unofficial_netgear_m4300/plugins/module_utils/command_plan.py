@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Content-addressed command plans shared by many switches
+
+A plan is the part of a configuration that does not depend on the switch's
+current state: the config-mode commands rendered from a group of settings and
+the local users with their password hashes. Plans are stored as JSON named by
+the SHA-256 of their canonical form, so every switch with the same settings
+references one file, and rendering, validation and password hashing happen
+once per distinct plan rather than once per host.
+
+Password hashes in a plan use a salt derived with HMAC from a random key kept in
+the plan directory, so re-rendering the same settings gives the same plan (and
+the switches stay unchanged) while the salts cannot be precomputed elsewhere.
+Each planned user also carries its password sealed with the same key, so a
+switch whose stored hash has another salt can still be compared by hashing the
+password with that salt. Plan files and the key are created readable by the
+owner only.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import tempfile
+
+from ansible.module_utils.basic import env_fallback
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.sha_crypt import (
+    ALPHABET,
+    SALT_LENGTH,
+    sha_crypt
+)
+
+PLAN_VERSION = 2
+DEFAULT_PLAN_DIR = '~/.ansible/netgear_plans'
+PLAN_ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+KEY_FILE = '.salt_key'
+SEAL_NONCE_LENGTH = 16
+# Characters that would end or split a command line on the switch
+CONTROL_PATTERN = re.compile(r'[\x00-\x1f\x7f]')
+
+
+def plan_dir_spec():
+    """Return the argument spec of the plan_dir option, shared by netgear_plan and netgear_system"""
+    return dict(type='path', default=DEFAULT_PLAN_DIR,
+                fallback=(env_fallback, ['ANSIBLE_NETGEAR_PLAN_DIR']))
+
+
+def canonical_json(data):
+    """Return the canonical JSON encoding used for hashing"""
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def digest(data):
+    """Return the SHA-256 hex digest of data's canonical JSON"""
+    return hashlib.sha256(canonical_json(data).encode('utf-8')).hexdigest()
+
+
+def check_commands(commands):
+    """Return error messages for commands that cannot be sent as single CLI lines"""
+    errors = []
+    for command in commands:
+        if CONTROL_PATTERN.search(command):
+            errors.append(f"Control character in command {command!r}")
+        elif command.count('"') % 2:
+            errors.append(f"Unbalanced quote in command {command!r}")
+    return errors
+
+
+def unknown_commands(commands, reference):
+    """Return the commands no command name in a CommandRef is a prefix of"""
+    unknown = []
+    for command in commands:
+        words = command.lower().split()
+        if not any(' '.join(words[:count]) in reference for count in range(len(words), 0, -1)):
+            unknown.append(command)
+    return unknown
+
+
+def _atomic_write(path, data):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PlanStore:
+    """Directory of plans named by their SHA-256"""
+
+    def __init__(self, root):
+        self.root = os.path.expanduser(root)
+        self._key = None
+
+    def _path(self, plan_id):
+        if not PLAN_ID_PATTERN.match(plan_id or ''):
+            raise ValueError(f"Invalid plan id {plan_id!r}")
+        return os.path.join(self.root, f"{plan_id}.json")
+
+    def key(self):
+        """Return the salt key, creating it on first use"""
+        if self._key is None:
+            os.makedirs(self.root, mode=0o700, exist_ok=True)
+            path = os.path.join(self.root, KEY_FILE)
+            if not os.path.exists(path):
+                try:
+                    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                except FileExistsError:
+                    pass
+                else:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(secrets.token_bytes(32))
+            with open(path, 'rb') as f:
+                self._key = f.read()
+        return self._key
+
+    def password_hash(self, name, password, scheme='sha512'):
+        """Return a crypt hash of password whose salt is fixed for this store, user and password"""
+        mac = hmac.new(self.key(), f"{name}\0{password}".encode('utf-8'), hashlib.sha256).digest()
+        salt = ''.join(ALPHABET[b & 0x3f] for b in mac[:SALT_LENGTH])
+        return sha_crypt(password, salt, scheme=scheme)
+
+    def _seal_nonce(self, name, data):
+        mac = hmac.new(self.key(), b'seal\0' + name.encode('utf-8') + b'\0' + data, hashlib.sha256)
+        return mac.digest()[:SEAL_NONCE_LENGTH]
+
+    def _xor_stream(self, nonce, data):
+        stream = bytearray()
+        counter = 0
+        while len(stream) < len(data):
+            block = b'stream\0' + nonce + counter.to_bytes(4, 'big')
+            stream.extend(hmac.new(self.key(), block, hashlib.sha256).digest())
+            counter += 1
+        return bytes(a ^ b for a, b in zip(data, stream))
+
+    def seal(self, name, password):
+        """Encrypt a user's password with the store key
+
+        The nonce is a MAC of the name and password, so sealing the same
+        password again gives the same text and unseal can detect a wrong key.
+        """
+        data = password.encode('utf-8')
+        nonce = self._seal_nonce(name, data)
+        return base64.b64encode(nonce + self._xor_stream(nonce, data)).decode('ascii')
+
+    def unseal(self, name, sealed):
+        """Return the password sealed by seal()"""
+        raw = base64.b64decode(sealed)
+        nonce = raw[:SEAL_NONCE_LENGTH]
+        data = self._xor_stream(nonce, raw[SEAL_NONCE_LENGTH:])
+        if not hmac.compare_digest(nonce, self._seal_nonce(name, data)):
+            raise ValueError(f"Password of {name} was not sealed with the key in {self.root}")
+        return data.decode('utf-8')
+
+    def put(self, plan):
+        """Store a plan and return (plan_id, written); existing plans are not rewritten"""
+        plan = dict(plan, version=PLAN_VERSION)
+        plan_id = digest(plan)
+        path = self._path(plan_id)
+        if os.path.exists(path):
+            return plan_id, False
+        os.makedirs(self.root, mode=0o700, exist_ok=True)
+        _atomic_write(path, canonical_json(plan).encode('utf-8'))
+        return plan_id, True
+
+    def get(self, plan_id):
+        """Load a plan, checking it still matches its id"""
+        path = self._path(plan_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                plan = json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"Plan {plan_id} not found in {self.root}")
+        if digest(plan) != plan_id or plan.get('version') != PLAN_VERSION:
+            raise ValueError(f"Plan {plan_id} in {self.root} is corrupt or from another version")
+        return plan
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Compiled, memory-mapped form of docs/command_ref.jsonl
+
+compile_command_ref writes the reference as one little-endian file::
+
+    header      magic, version, entry count, section offsets
+    entries     fixed-size records sorted by command name, each holding
+                (offset, length) pairs into the string table for the name,
+                syntax, summary, synopsis, newline-joined related commands and
+                newline-joined command modes, plus a category number and the
+                manual page (0 when unknown)
+    categories  newline-joined category names
+    strings     deduplicated UTF-8 text
+
+The command name is the keyword part of the syntax, lowercased, so the sorted
+entry table doubles as a prefix index: exact and prefix lookups are binary
+searches over the records. CommandRef maps the file read-only and decodes an
+entry only when it is asked for, so opening it costs one header read and the
+pages are shared by every process (e.g. Ansible forks) that maps the same file.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+
+MAGIC = b'NGCR'
+VERSION = 2
+HEADER = struct.Struct('<4sII4Q')
+ENTRY = struct.Struct('<IHIHIHIHIHIHHI')
+
+COMMAND_REF_FILE = 'command_ref.jsonl'
+COMPILED_FILE = 'command_ref.bin'
+
+ARGUMENT_START = re.compile(r'[<\[{|]')
+
+
+def command_name(syntax):
+    """Return the lowercase keyword part of a syntax line, up to the first argument"""
+    words = []
+    for word in syntax.lstrip('#').split():
+        if ARGUMENT_START.match(word):
+            break
+        words.append(word)
+    return ' '.join(words).lower()
+
+
+def record_modes(record):
+    """Return the command modes of a record as a list"""
+    modes = record.get('mode') or []
+    return [modes] if isinstance(modes, str) else list(modes)
+
+
+def load_records(path):
+    """Yield the records of a command_ref.jsonl file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def compile_command_ref(records, path):
+    """Compile command_ref records into path atomically and return the entry count"""
+    strings = bytearray()
+    interned = {}
+    categories = []
+
+    def add_string(text):
+        if text not in interned:
+            data = text.encode('utf-8')[:0xFFFF]
+            interned[text] = (len(strings), len(data))
+            strings.extend(data)
+        return interned[text]
+
+    rows = []
+    for record in records:
+        name = command_name(record['syntax'])
+        category = record.get('category') or ''
+        if category not in categories:
+            categories.append(category)
+        rows.append((name.encode('utf-8'), record['syntax'], record, categories.index(category)))
+    rows.sort(key=lambda row: (row[0], row[1]))
+
+    entries = bytearray()
+    for name, syntax, record, category in rows:
+        entries.extend(ENTRY.pack(
+            *add_string(name.decode('utf-8')),
+            *add_string(syntax),
+            *add_string(record.get('summary', '')),
+            *add_string(record.get('synopsis', '')),
+            *add_string('\n'.join(record.get('related_commands', []))),
+            *add_string('\n'.join(record_modes(record))),
+            category,
+            record.get('page') or 0,
+        ))
+
+    category_data = '\n'.join(categories).encode('utf-8')
+    entries_offset = HEADER.size
+    categories_offset = entries_offset + len(entries)
+    strings_offset = categories_offset + len(category_data)
+    end = strings_offset + len(strings)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.command_ref-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(rows), entries_offset, categories_offset, strings_offset, end))
+            f.write(entries)
+            f.write(category_data)
+            f.write(strings)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(rows)
+
+
+class CommandRef:
+    """Read-only view of a compiled command reference"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.count, self.entries_offset, self.categories_offset,
+         self.strings_offset, _) = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} compiled command reference")
+        self._categories = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return bool(self.find(name))
+
+    def __iter__(self):
+        """Yield the command names in sorted order, once each"""
+        previous = None
+        for index in range(self.count):
+            name = self.name(index)
+            if name != previous:
+                yield name
+                previous = name
+
+    def close(self):
+        self.mm.close()
+
+    def _fields(self, index):
+        return ENTRY.unpack_from(self.mm, self.entries_offset + index * ENTRY.size)
+
+    def _bytes(self, offset, length):
+        start = self.strings_offset + offset
+        return self.mm[start:start + length]
+
+    def _text(self, offset, length):
+        return self._bytes(offset, length).decode('utf-8')
+
+    def categories(self):
+        if self._categories is None:
+            data = self.mm[self.categories_offset:self.strings_offset]
+            self._categories = data.decode('utf-8').split('\n')
+        return self._categories
+
+    def name(self, index):
+        fields = self._fields(index)
+        return self._text(fields[0], fields[1])
+
+    def entry(self, index):
+        """Decode the entry at index into a command_ref record plus its name"""
+        (name_offset, name_length, syntax_offset, syntax_length, summary_offset, summary_length,
+         synopsis_offset, synopsis_length, related_offset, related_length, mode_offset, mode_length,
+         category, page) = self._fields(index)
+        related = self._text(related_offset, related_length)
+        modes = self._text(mode_offset, mode_length)
+        return dict(
+            command=self._text(name_offset, name_length),
+            syntax=self._text(syntax_offset, syntax_length),
+            summary=self._text(summary_offset, summary_length),
+            synopsis=self._text(synopsis_offset, synopsis_length),
+            category=self.categories()[category],
+            related_commands=related.split('\n') if related else [],
+            mode=modes.split('\n') if modes else [],
+            page=page or None,
+        )
+
+    def _bisect(self, key):
+        """Return the first entry index whose name bytes are >= key"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            fields = self._fields(middle)
+            if self._bytes(fields[0], fields[1]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _prefix_range(self, prefix):
+        key = prefix.encode('utf-8')
+        start = index = self._bisect(key)
+        while index < self.count:
+            fields = self._fields(index)
+            if not self._bytes(fields[0], fields[1]).startswith(key):
+                break
+            index += 1
+        return start, index
+
+    def find(self, name, mode=None):
+        """Return every entry (one per syntax variant) for a command name
+
+        With mode, only entries documented for that command mode (e.g.
+        "Global Config", compared case-insensitively) are returned.
+        """
+        key = command_name(name)
+        start, end = self._prefix_range(key)
+        entries = [self.entry(index) for index in range(start, end) if self.name(index) == key]
+        if mode:
+            mode = ' '.join(mode.lower().split())
+            entries = [entry for entry in entries if mode in (m.lower() for m in entry['mode'])]
+        return entries
+
+    def get(self, name, default=None, mode=None):
+        """Return the first entry for a command name"""
+        entries = self.find(name, mode)
+        return entries[0] if entries else default
+
+    def complete(self, prefix, limit=None):
+        """Return the sorted command names starting with prefix"""
+        start, end = self._prefix_range(' '.join(prefix.lower().split()))
+        names = []
+        for index in range(start, end):
+            name = self.name(index)
+            if not names or names[-1] != name:
+                names.append(name)
+                if limit and len(names) >= limit:
+                    break
+        return names
+
+
+_opened = {}
+
+
+def open_command_ref(path):
+    """Return a CommandRef for path, shared per process and reopened if the file changes"""
+    stat = os.stat(path)
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _opened.get(path)
+    if cached is None or cached[0] != signature:
+        if cached is not None:
+            cached[1].close()
+        cached = _opened[path] = (signature, CommandRef(path))
+    return cached[1]
+
+
+def load_command_ref(path, source=None):
+    """Return the CommandRef at path, compiling it from source first if it is missing, older
+    or in an earlier format"""
+    if not os.path.exists(path) or (
+            source and os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(path)):
+        compile_command_ref(load_records(source), path)
+    try:
+        return open_command_ref(path)
+    except ValueError:
+        if not (source and os.path.exists(source)):
+            raise
+    compile_command_ref(load_records(source), path)
+    return open_command_ref(path)
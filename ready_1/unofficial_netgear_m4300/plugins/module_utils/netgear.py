@@ -7,8 +7,42 @@
 Shared utilities for Netgear M4300 Ansible modules
 """
 
+import hashlib
 import re
+from contextlib import contextmanager
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.common.text.converters import to_text
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.cli_session import (
+    CliSession
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.output_spool import (
+    COMPRESSIONS,
+    OutputSpool
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.session_limiter import (
+    SessionLimiter,
+    SessionLimitTimeout,
+    retry_with_backoff
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import (
+    NULL_TIMER
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.transcript import (
+    ReplayServer,
+    TranscriptError,
+    TranscriptWriter,
+    connect
+)
+
+# Lines in show running-config output that open a nested configuration block.
+# Each block is closed by a matching "exit" line.
+CONFIG_BLOCK_PATTERN = re.compile(
+    r'^(vlan database|configure|stack|interface\s+\S.*|line\s+(console|telnet|ssh)'
+    r'|router\s+(ospf|rip|bgp\s+\d+)|ipv6\s+router\s+ospf|aaa\s+ias-user\s+username\s+\S+'
+    r'|ip\s+dhcp\s+pool\s+\S+|ipv6\s+dhcp\s+pool\s+\S+|captive-portal|configuration\s+\d+'
+    r'|mail-server\s+\S+|policy-map\s+.+|class-map\s+.+|class\s+\S+'
+    r'|(ip|ipv6|mac|arp)\s+access-list\s+.+)$'
+)
 
 
 def netgear_argument_spec():
@@ -25,6 +59,34 @@ def netgear_argument_spec():
                       fallback=(env_fallback, ['ANSIBLE_NET_PASSWORD']),
                       required=True),
         timeout=dict(type='int', default=30),
+        max_sessions=dict(type='int', default=2,
+                          fallback=(env_fallback, ['ANSIBLE_NETGEAR_MAX_SESSIONS'])),
+        session_lock_dir=dict(type='path', default='~/.ansible/netgear_sessions',
+                              fallback=(env_fallback, ['ANSIBLE_NETGEAR_SESSION_LOCK_DIR'])),
+        session_wait_timeout=dict(type='int', default=300,
+                                  fallback=(env_fallback, ['ANSIBLE_NETGEAR_SESSION_WAIT_TIMEOUT'])),
+        connect_retries=dict(type='int', default=3,
+                             fallback=(env_fallback, ['ANSIBLE_NETGEAR_CONNECT_RETRIES'])),
+        connect_retry_delay=dict(type='float', default=1.0,
+                                 fallback=(env_fallback, ['ANSIBLE_NETGEAR_CONNECT_RETRY_DELAY'])),
+        resume_retries=dict(type='int', default=2,
+                            fallback=(env_fallback, ['ANSIBLE_NETGEAR_RESUME_RETRIES'])),
+        resume_verify=dict(type='bool', default=False,
+                           fallback=(env_fallback, ['ANSIBLE_NETGEAR_RESUME_VERIFY'])),
+        spool_threshold=dict(type='int', default=0,
+                             fallback=(env_fallback, ['ANSIBLE_NETGEAR_SPOOL_THRESHOLD'])),
+        spool_dir=dict(type='path', default='~/.ansible/netgear_spool',
+                       fallback=(env_fallback, ['ANSIBLE_NETGEAR_SPOOL_DIR'])),
+        spool_compression=dict(type='str', choices=list(COMPRESSIONS), default='none',
+                               fallback=(env_fallback, ['ANSIBLE_NETGEAR_SPOOL_COMPRESSION'])),
+        timing=dict(type='bool', default=False,
+                    fallback=(env_fallback, ['ANSIBLE_NETGEAR_TIMING'])),
+        record_transcript=dict(type='path',
+                               fallback=(env_fallback, ['ANSIBLE_NETGEAR_RECORD_TRANSCRIPT'])),
+        replay_transcript=dict(type='path',
+                               fallback=(env_fallback, ['ANSIBLE_NETGEAR_REPLAY_TRANSCRIPT'])),
+        replay_speed=dict(type='float', default=1.0,
+                          fallback=(env_fallback, ['ANSIBLE_NETGEAR_REPLAY_SPEED'])),
         provider=dict(type='dict', options=dict(
             host=dict(type='str'),
             port=dict(type='int', default=23),
@@ -35,13 +97,67 @@ def netgear_argument_spec():
     )
 
 
-def run_commands(module, commands, check_rc=True):
-    """Run commands on Netgear switch using netmiko"""
-    if not commands:
-        return []
+def summarize_output(command, output):
+    """Return a small parsed summary of a command output for spool references"""
+    summary = dict(lines=output.count('\n') + 1 if output else 0)
+    if ' '.join(command.split()) in ('show running-config', 'show startup-config'):
+        sections = parse_config_sections(output)
+        summary.update(sections=len(sections), users=len(parse_users(output)))
+    return summary
+
+
+def output_spool(module):
+    """Return an OutputSpool for the module's spool options, or None if spooling is off"""
+    if not module.params.get('spool_threshold'):
+        return None
+    try:
+        return OutputSpool(
+            module.params.get('spool_dir') or '~/.ansible/netgear_spool',
+            module.params.get('host') or 'localhost',
+            module.params['spool_threshold'],
+            module.params.get('spool_compression') or 'none',
+        )
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+
+def command_result(command, output, spool=None):
+    """Return a run_commands result, with the output moved to a spool file if it is large
+
+    Spooled results carry 'spooled' (path, size, sha256, compression, summary)
+    instead of 'output'.
+    """
+    if spool and spool.should_spool(output):
+        return {
+            'command': command,
+            'spooled': spool.write(command, output, summarize_output(command, output)),
+        }
+    return {
+        'command': command,
+        'output': output
+    }
+
+
+@contextmanager
+def command_session(module, timer=None):
+    """Open one session to the switch and yield send(command) -> output
+
+    Commands run from Privileged EXEC. If the connection drops part way through,
+    the session logs in again, restores the CLI mode and continues from the
+    first unacknowledged command, up to resume_retries times. Use it directly
+    when later commands depend on earlier outputs, so they share one login;
+    run_commands sends a fixed list. Failures call module.fail_json.
+
+    Pass a SessionTimer from module_utils.timing as timer to record queue wait,
+    login and per-command latency.
+    """
+    timer = timer or NULL_TIMER
+
+    if getattr(module, 'connection', None):
+        yield connection_sender(module, timer)
+        return
 
     try:
-        from netmiko import ConnectHandler
         from netmiko.exceptions import NetMikoTimeoutException, NetMikoAuthenticationException
     except ImportError as e:
         module.fail_json(msg=f"netmiko is required: {e}")
@@ -62,6 +178,15 @@ def run_commands(module, commands, check_rc=True):
         password = provider.get('password', password)
         timeout = provider.get('timeout', timeout)
 
+    replay = None
+    if module.params.get('replay_transcript'):
+        try:
+            replay = ReplayServer(module.params['replay_transcript'],
+                                  speed=module.params.get('replay_speed', 1.0))
+        except (OSError, TranscriptError) as e:
+            module.fail_json(msg=f"Failed to load transcript {module.params['replay_transcript']}: {e}")
+        module.debug(f"Replaying {module.params['replay_transcript']} for {host}")
+
     # Establish connection
     device_params = {
         'device_type': 'cisco_ios_telnet',  # Netgear uses similar CLI
@@ -75,34 +200,128 @@ def run_commands(module, commands, check_rc=True):
         'secret': password,  # Enable password if needed
     }
 
+    limiter = SessionLimiter(
+        host,
+        max_sessions=module.params.get('max_sessions', 2),
+        lock_dir=module.params.get('session_lock_dir'),
+        timeout=module.params.get('session_wait_timeout', 300),
+    )
+
+    def on_retry(attempt, delay, error):
+        module.debug(f"Connection attempt {attempt} to {host} failed ({error}), retrying in {delay:.2f}s")
+
+    transcript = None
     try:
-        connection = ConnectHandler(**device_params)
+        if replay:
+            device_params['host'], device_params['port'] = replay.host, replay.start()
+        if module.params.get('record_transcript'):
+            transcript = TranscriptWriter(module.params['record_transcript'],
+                                          redact=[password] + list(getattr(module, 'no_log_values', ())))
 
-        results = []
-        for cmd in commands:
-            if cmd.strip():  # Skip empty commands
-                module.debug(f"Executing command: {cmd}")
-                output = connection.send_command(cmd)
-                results.append({
-                    'command': cmd,
-                    'output': output
-                })
+        wait_time = limiter.acquire()
+        timer.queued(limiter.metrics())
+        module.debug(f"Acquired session slot for {host} after {wait_time:.3f}s in queue "
+                     f"(position {limiter.queue_position} of {limiter.max_sessions} sessions)")
+
+        def open_connection():
+            if transcript:
+                transcript.session(host=device_params['host'], port=device_params['port'],
+                                   transport='run_commands')
+            return retry_with_backoff(
+                lambda: connect(device_params, transcript),
+                retries=module.params.get('connect_retries', 3),
+                base_delay=module.params.get('connect_retry_delay', 1.0),
+                retry_on=(NetMikoTimeoutException, EOFError, ConnectionError),
+                on_retry=on_retry,
+            )
+
+        session = CliSession(
+            open_connection,
+            read_timeout=timeout,
+            resume_retries=module.params.get('resume_retries', 2),
+            verify=module.params.get('resume_verify', False),
+            timer=timer,
+            transcript=transcript,
+            log=module.debug,
+        )
+        session.connect()
+
+        def send(cmd):
+            module.debug(f"Executing command: {cmd}")
+            return session.send(cmd)
+
+        yield send
 
-        connection.disconnect()
-        return results
+        if session.resumes:
+            module.debug(f"Session to {host} resumed {session.resumes} times")
+        session.close()
 
+    except SessionLimitTimeout as e:
+        module.fail_json(msg=str(e))
     except NetMikoTimeoutException as e:
         module.fail_json(msg=f"Connection timeout to {host}:{port}: {e}")
     except NetMikoAuthenticationException as e:
         module.fail_json(msg=f"Authentication failed for {host}: {e}")
     except Exception as e:
         module.fail_json(msg=f"Failed to execute commands on {host}: {e}")
+    finally:
+        limiter.release()
+        if transcript:
+            transcript.close()
+        if replay:
+            replay.stop()
+
+
+def connection_sender(module, timer):
+    """Return send(command) for the task's connection plugin
+
+    Used when the module logic runs in the collection's action plugin; the
+    connection owns the session, its limits and its transcript.
+    """
+    try:
+        module.connection._connect()
+    except Exception as e:
+        module.fail_json(msg=f"Failed to connect to {module.params.get('host')}: {e}")
+
+    def send(cmd):
+        module.debug(f"Executing command: {cmd}")
+        try:
+            with timer.command(cmd):
+                rc, out, err = module.connection.exec_command(cmd)
+        except Exception as e:
+            module.fail_json(msg=f"Failed to execute commands on {module.params.get('host')}: {e}")
+        return to_text(out, errors='surrogate_or_strict')
+
+    return send
+
 
+def run_commands(module, commands, check_rc=True, timer=None, spool=False):
+    """Run commands on Netgear switch in one session (see command_session)
 
-def get_config(module, config_type='running'):
+    With spool=True, outputs longer than the spool_threshold option are written
+    to per-host spool files and returned as references (see command_result);
+    callers that parse outputs leave it off.
+    """
+    if not commands:
+        return []
+
+    spool = output_spool(module) if spool else None
+    results = []
+    with command_session(module, timer) as send:
+        for cmd in commands:
+            if cmd.strip():  # Skip empty commands
+                output = send(cmd)
+                try:
+                    results.append(command_result(cmd, output, spool))
+                except OSError as e:
+                    module.fail_json(msg=f"Failed to spool the output of '{cmd}': {e}")
+    return results
+
+
+def get_config(module, config_type='running', timer=None):
     """Get configuration from Netgear switch"""
-    commands = [f"show {config_type} config"]
-    results = run_commands(module, commands)
+    commands = [f"show {config_type}-config"]
+    results = run_commands(module, commands, timer=timer)
     if results:
         return results[0]['output']
     return ""
@@ -119,6 +338,85 @@ def load_config(module, config):
     return run_commands(module, commands)
 
 
+def parse_config_sections(config_output):
+    """Split show running-config output into named sections
+
+    Section names are the block-opening lines joined with " > ", e.g.
+    "configure > interface 1/0/1". Lines outside any block belong to the
+    "top" section. Comment lines are dropped because they carry volatile
+    data such as the system up time.
+    """
+    sections = {}
+    stack = []
+
+    for line in config_output.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('!'):
+            continue
+
+        if line == 'exit' and stack:
+            stack.pop()
+            continue
+
+        name = ' > '.join(stack) or 'top'
+        if CONFIG_BLOCK_PATTERN.match(line):
+            stack.append(line)
+            sections.setdefault(' > '.join(stack), [])
+            continue
+
+        sections.setdefault(name, []).append(line)
+
+    return sections
+
+
+def config_fingerprints(config_output):
+    """Return a SHA-256 fingerprint for each running-config section"""
+    fingerprints = {}
+    for name, lines in parse_config_sections(config_output).items():
+        fingerprints[name] = hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+    return fingerprints
+
+
+def compare_fingerprints(baseline, current):
+    """Compare two section fingerprint dicts and return the drifted sections"""
+    return {
+        'added': sorted(set(current) - set(baseline)),
+        'removed': sorted(set(baseline) - set(current)),
+        'modified': sorted(name for name in set(baseline) & set(current)
+                           if baseline[name] != current[name]),
+    }
+
+
+# Local user lines in show running-config, e.g.
+# username "bob" password $6$salt$hash encryption-type sha512 level 1 encrypted
+USER_PATTERN = re.compile(
+    r'^username\s+"?([^"\s]+)"?'
+    r'(?:\s+password\s+(\S+)|\s+(nopassword))?'
+    r'(?:\s+encryption-type\s+(\S+))?'
+    r'(?:\s+level\s+(\d+))?'
+)
+
+
+def parse_users(config_output):
+    """Parse local users from show running-config output
+
+    Returns {name: {'password': stored hash or None, 'encryption': scheme or None,
+    'level': int}}; the level defaults to 1 as on the switch.
+    """
+    users = {}
+    for line in config_output.split('\n'):
+        match = USER_PATTERN.match(line.strip())
+        if not match or match.group(1) in ('snmpv3',):
+            continue
+        name, password, _, encryption, level = match.groups()
+        users[name] = {
+            'password': password,
+            'encryption': encryption,
+            'level': int(level) if level else 1,
+        }
+    return users
+
+
 def parse_vlan_config(config_output):
     """Parse VLAN configuration from show vlan output"""
     vlans = {}
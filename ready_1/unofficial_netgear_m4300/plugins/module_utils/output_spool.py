@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Controller-side spool files for large command outputs
+
+Layout::
+
+    <root>/<host>/<timestamp>-<random>-<n>-<command>.txt[.gz|.zst]
+
+Outputs over the size threshold are written in 64 KiB pieces through an
+optional gzip or zstd stream, hashing as they go, and the command result
+carries a small reference (path, size, sha256, compression and an optional
+summary) instead of the text. Module results, callback buffers and registered
+variables then stay small however big show running-config or show
+tech-support get. Files are written atomically and readable by the owner only.
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import re
+import secrets
+import tempfile
+import time
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+COMPRESSIONS = ('none', 'gzip', 'zstd', 'auto')
+EXTENSIONS = {'none': '.txt', 'gzip': '.txt.gz', 'zstd': '.txt.zst'}
+CHUNK_SIZE = 64 * 1024
+UNSAFE_NAME_PATTERN = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+def resolve_compression(compression):
+    """Map 'auto' to zstd when the zstandard library is installed, gzip otherwise"""
+    if compression == 'auto':
+        return 'zstd' if HAS_ZSTD else 'gzip'
+    if compression == 'zstd' and not HAS_ZSTD:
+        raise ValueError("zstd compression requires the zstandard library")
+    if compression not in EXTENSIONS:
+        raise ValueError(f"Unknown compression {compression!r}")
+    return compression
+
+
+def safe_name(text, limit=48):
+    """Return text reduced to a short file name component"""
+    return UNSAFE_NAME_PATTERN.sub('_', text.strip()).strip('_')[:limit] or 'output'
+
+
+def open_spooled(path):
+    """Open a spool file for reading as text, decompressing by its extension"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.zst'):
+        if not HAS_ZSTD:
+            raise ValueError("Reading .zst spool files requires the zstandard library")
+        raw = open(path, 'rb')
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+class OutputSpool:
+    """Writes the outputs of one host's session over a threshold to spool files"""
+
+    def __init__(self, root, host, threshold, compression='none'):
+        self.directory = os.path.join(os.path.expanduser(root), safe_name(host, limit=255))
+        self.threshold = threshold
+        self.compression = resolve_compression(compression)
+        self._token = secrets.token_hex(3)
+        self._count = 0
+
+    def should_spool(self, output):
+        """Return True if output is longer than the threshold (in characters)"""
+        return self.threshold > 0 and output is not None and len(output) > self.threshold
+
+    def write(self, command, output, summary=None):
+        """Write output to a new spool file and return its reference dict"""
+        self._count += 1
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        stamp = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+        name = f"{stamp}-{self._token}-{self._count:03d}-{safe_name(command)}{EXTENSIONS[self.compression]}"
+        path = os.path.join(self.directory, name)
+
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                if self.compression == 'gzip':
+                    stream = gzip.GzipFile(filename='', fileobj=raw, mode='wb', mtime=0)
+                elif self.compression == 'zstd':
+                    stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+                else:
+                    stream = raw
+                for start in range(0, len(output), CHUNK_SIZE):
+                    data = output[start:start + CHUNK_SIZE].encode('utf-8')
+                    sha256.update(data)
+                    size += len(data)
+                    stream.write(data)
+                if stream is not raw:
+                    stream.close()
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        return dict(
+            path=path,
+            size=size,
+            stored_size=os.path.getsize(path),
+            sha256=sha256.hexdigest(),
+            compression=self.compression,
+            summary=summary,
+        )
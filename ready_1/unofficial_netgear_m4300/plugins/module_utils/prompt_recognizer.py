@@ -1,63 +1,108 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Netgear M4300 CLI prompt recognition
+
+Patterns are kept as source strings and compiled on first use into a single
+alternation of named groups, shared by every caller in the process. The
+per-mode compiled patterns (PROMPT_PATTERNS, USER_EXEC_PROMPT, ...) are still
+importable and are built lazily as well.
+"""
+
 import re
+from functools import lru_cache
 
 # Regex patterns for each prompt level, developed from provided TIO examples
 # Patterns are generic: Capture any hostname/model in parentheses, followed by mode-specific suffix
 # Anchored with ^ and $ for exact match; assumes prompt is isolated (strip lines if needed)
-USER_EXEC_PROMPT = re.compile(r'^\([^\)]+\) >$')      # e.g., (M4300-52G-PoE+) >
-PRIV_EXEC_PROMPT = re.compile(r'^\([^\)]+\) #$')      # e.g., (M4300-52G-PoE+) #
-GLOBAL_CONFIG_PROMPT = re.compile(r'^\([^\)]+\) \(Config\)#$')  # e.g., (M4300-52G-PoE+) (Config)#
-VLAN_DATABASE_PROMPT = re.compile(r'^\([^\)]+\) \(Vlan\)#$')  # e.g., (M4300-52G-PoE+) (Vlan)#
-INTERFACE_CONFIG_PROMPT = re.compile(r'^\([^\)]+\) \(Interface [^\)]+\)#$')  # e.g., (M4300-52G-PoE+) (Interface 1/0/1)# - captures interface ID
-LINE_CONSOLE_PROMPT = re.compile(r'^\([^\)]+\) \(Config-line\)#$')  # e.g., (M4300-52G-PoE+) (Config-line)#
-LINE_TELNET_PROMPT = re.compile(r'^\([^\)]+\) \(Config-telnet\)#$')  # e.g., (M4300-52G-PoE+) (Config-telnet)#
-LINE_SSH_PROMPT = re.compile(r'^\([^\)]+\) \(Config-ssh\)#$')  # e.g., (M4300-52G-PoE+) (Config-ssh)#
-AAA_IAS_USER_PROMPT = re.compile(r'^\([^\)]+\) \(Config-IAS-User\)#$')  # e.g., (M4300-52G-PoE+) (Config-IAS-User)#
-DHCP_POOL_PROMPT = re.compile(r'^\([^\)]+\) \(Config-dhcp-pool\)#$')  # e.g., (M4300-52G-PoE+) (Config-dhcp-pool)#
-DHCPV6_POOL_PROMPT = re.compile(r'^\([^\)]+\) \(Config-dhcp6s-pool\)#$')  # e.g., (M4300-52G-PoE+) (Config-dhcp6s-pool)# - note "dhcp6s"
-CAPTIVE_PORTAL_PROMPT = re.compile(r'^\([^\)]+\) \(Config-CP\)#$')  # e.g., (M4300-52G-PoE+) (Config-CP)#
-CAPTIVE_PORTAL_INSTANCE_PROMPT = re.compile(r'^\([^\)]+\) \(Config-CP \d+\)#$')  # e.g., (M4300-52G-PoE+) (Config-CP 1)# - captures ID
-OSPF_CONFIG_PROMPT = re.compile(r'^\([^\)]+\) \(config-router\)#$')  # e.g., (M4300-52G-PoE+) (config-router)# - note lowercase "config"
-OSPFV3_CONFIG_PROMPT = re.compile(r'^\([^\)]+\) \(Config-rtr\)#$')  # e.g., (M4300-52G-PoE+) (Config-rtr)# - abbrev "rtr"
-RIP_CONFIG_PROMPT = re.compile(r'^\([^\)]+\) \(Config-router\)#$')  # e.g., (M4300-52G-PoE+) (Config-router)# - uppercase "Config" variant
-VLAN_ROUTING_CONFIG_PROMPT = re.compile(r'^\([^\)]+\) \(Vlan\)#$')  # Same as VLAN database; no distinct prompt in examples
-
-PROMPT_PATTERNS = {
-    'user_exec': USER_EXEC_PROMPT,
-    'priv_exec': PRIV_EXEC_PROMPT,
-    'global_config': GLOBAL_CONFIG_PROMPT,
-    'vlan_database': VLAN_DATABASE_PROMPT,
-    'interface_config': INTERFACE_CONFIG_PROMPT,
-    'line_console': LINE_CONSOLE_PROMPT,
-    'line_telnet': LINE_TELNET_PROMPT,
-    'line_ssh': LINE_SSH_PROMPT,
-    'aaa_ias_user': AAA_IAS_USER_PROMPT,
-    'dhcp_pool': DHCP_POOL_PROMPT,
-    'dhcpv6_pool': DHCPV6_POOL_PROMPT,
-    'captive_portal': CAPTIVE_PORTAL_PROMPT,
-    'captive_portal_instance': CAPTIVE_PORTAL_INSTANCE_PROMPT,
-    'ospf_config': OSPF_CONFIG_PROMPT,
-    'ospfv3_config': OSPFV3_CONFIG_PROMPT,
-    'rip_config': RIP_CONFIG_PROMPT,
-    'vlan_routing_config': VLAN_ROUTING_CONFIG_PROMPT
+# Order matters: the first matching mode wins, as with the previous per-pattern loop
+PROMPT_REGEXES = {
+    'user_exec': r'^\([^\)]+\) >$',  # e.g., (M4300-52G-PoE+) >
+    'priv_exec': r'^\([^\)]+\) #$',  # e.g., (M4300-52G-PoE+) #
+    'global_config': r'^\([^\)]+\) \(Config\)#$',  # e.g., (M4300-52G-PoE+) (Config)#
+    'vlan_database': r'^\([^\)]+\) \(Vlan\)#$',  # e.g., (M4300-52G-PoE+) (Vlan)#
+    'interface_config': r'^\([^\)]+\) \(Interface [^\)]+\)#$',  # e.g., (M4300-52G-PoE+) (Interface 1/0/1)#
+    'line_console': r'^\([^\)]+\) \(Config-line\)#$',  # e.g., (M4300-52G-PoE+) (Config-line)#
+    'line_telnet': r'^\([^\)]+\) \(Config-telnet\)#$',  # e.g., (M4300-52G-PoE+) (Config-telnet)#
+    'line_ssh': r'^\([^\)]+\) \(Config-ssh\)#$',  # e.g., (M4300-52G-PoE+) (Config-ssh)#
+    'aaa_ias_user': r'^\([^\)]+\) \(Config-IAS-User\)#$',  # e.g., (M4300-52G-PoE+) (Config-IAS-User)#
+    'dhcp_pool': r'^\([^\)]+\) \(Config-dhcp-pool\)#$',  # e.g., (M4300-52G-PoE+) (Config-dhcp-pool)#
+    'dhcpv6_pool': r'^\([^\)]+\) \(Config-dhcp6s-pool\)#$',  # e.g., (M4300-52G-PoE+) (Config-dhcp6s-pool)# - note "dhcp6s"
+    'captive_portal': r'^\([^\)]+\) \(Config-CP\)#$',  # e.g., (M4300-52G-PoE+) (Config-CP)#
+    'captive_portal_instance': r'^\([^\)]+\) \(Config-CP \d+\)#$',  # e.g., (M4300-52G-PoE+) (Config-CP 1)#
+    'ospf_config': r'^\([^\)]+\) \(config-router\)#$',  # e.g., (M4300-52G-PoE+) (config-router)# - lowercase "config"
+    'ospfv3_config': r'^\([^\)]+\) \(Config-rtr\)#$',  # e.g., (M4300-52G-PoE+) (Config-rtr)# - abbrev "rtr"
+    'rip_config': r'^\([^\)]+\) \(Config-router\)#$',  # e.g., (M4300-52G-PoE+) (Config-router)# - uppercase "Config"
+    'vlan_routing_config': r'^\([^\)]+\) \(Vlan\)#$',  # Same as VLAN database; no distinct prompt in examples
+}
+
+# Module level names of the per-mode patterns, resolved lazily by __getattr__
+PROMPT_CONSTANTS = {
+    'USER_EXEC_PROMPT': 'user_exec',
+    'PRIV_EXEC_PROMPT': 'priv_exec',
+    'GLOBAL_CONFIG_PROMPT': 'global_config',
+    'VLAN_DATABASE_PROMPT': 'vlan_database',
+    'INTERFACE_CONFIG_PROMPT': 'interface_config',
+    'LINE_CONSOLE_PROMPT': 'line_console',
+    'LINE_TELNET_PROMPT': 'line_telnet',
+    'LINE_SSH_PROMPT': 'line_ssh',
+    'AAA_IAS_USER_PROMPT': 'aaa_ias_user',
+    'DHCP_POOL_PROMPT': 'dhcp_pool',
+    'DHCPV6_POOL_PROMPT': 'dhcpv6_pool',
+    'CAPTIVE_PORTAL_PROMPT': 'captive_portal',
+    'CAPTIVE_PORTAL_INSTANCE_PROMPT': 'captive_portal_instance',
+    'OSPF_CONFIG_PROMPT': 'ospf_config',
+    'OSPFV3_CONFIG_PROMPT': 'ospfv3_config',
+    'RIP_CONFIG_PROMPT': 'rip_config',
+    'VLAN_ROUTING_CONFIG_PROMPT': 'vlan_routing_config',
 }
 
+
+@lru_cache(maxsize=None)
+def prompt_patterns():
+    """Return the compiled pattern of each mode, compiled once per process"""
+    return {mode: re.compile(regex) for mode, regex in PROMPT_REGEXES.items()}
+
+
+@lru_cache(maxsize=None)
+def combined_prompt_pattern():
+    """Return one compiled alternation of all modes, each a named group"""
+    return re.compile('|'.join(f'(?P<{mode}>{regex})' for mode, regex in PROMPT_REGEXES.items()))
+
+
+def __getattr__(name):
+    if name == 'PROMPT_PATTERNS':
+        return prompt_patterns()
+    if name in PROMPT_CONSTANTS:
+        return prompt_patterns()[PROMPT_CONSTANTS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def recognize_prompt(output):
     """
     Recognize the CLI prompt mode from output.
-    
+
     Args:
         output (str): Raw output line containing the prompt.
-    
+
     Returns:
         str: The mode key from PROMPT_PATTERNS, or 'unknown'.
     """
     prompt = output.strip().splitlines()[-1].strip() if output else ''
-    
-    for mode, pattern in PROMPT_PATTERNS.items():
-        if pattern.match(prompt):
-            return mode
-    return 'unknown'
-
-# Example test (replace with actual outputs)
-sample = "(M4300-52G-PoE+) (Config)#"
-print(recognize_prompt(sample))  # Should return 'global_config'
+
+    match = combined_prompt_pattern().match(prompt)
+    return match.lastgroup if match else 'unknown'
+
+
+@lru_cache(maxsize=None)
+def prompt_search_pattern():
+    """Return a regex source finding any mode's prompt at the end of a line of output
+
+    Suitable as netmiko's expect_string, so commands that change the mode return
+    as soon as the new prompt arrives instead of waiting for the old one.
+    """
+    regexes = dict.fromkeys(regex.strip('^$') for regex in PROMPT_REGEXES.values())
+    return r'(?m)^(?:' + '|'.join(regexes) + r')[ \t\r]*$'
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+BM25 full-text search over the M4300 CLI manual and command reference
+
+The index covers three kinds of documents: the pages of docs/M4300_CLI_EN.txt,
+the chunk summaries of docs/M4300_CLI_EN_chunks.jsonl and the syntax/summary of
+each docs/command_ref.jsonl entry. Every document carries the manual pages it
+comes from.
+
+It is built once into a single little-endian file and memory-mapped by
+SearchIndex, so a query only touches the term table entries and posting lists
+it needs::
+
+    header    magic, version, document and term counts, average length, section offsets
+    lengths   uint32 token count per document
+    kinds     uint8 document kind per document
+    records   per document: title, snippet (string offsets) and start/end page
+    terms     per term, sorted by UTF-8 bytes: string offset, df, postings offset
+    postings  per term: df uint16 document ids, then df uint8 term frequencies
+    strings   UTF-8 term, title and snippet text
+"""
+
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from collections import Counter
+
+MAGIC = b'NGSI'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIf6Q')
+RECORD = struct.Struct('<IHIHHH')
+TERM = struct.Struct('<IHII')
+
+KINDS = ('page', 'chunk', 'command')
+MAX_DOCUMENTS = 0xFFFF
+MAX_TERM_LENGTH = 48
+MAX_PREFIX_TERMS = 64
+
+MANUAL_FILE = 'M4300_CLI_EN.txt'
+CHUNKS_FILE = 'M4300_CLI_EN_chunks.jsonl'
+COMMAND_REF_FILE = 'command_ref.jsonl'
+INDEX_FILE = 'search_index.bin'
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:[-_.:/][a-z0-9]+)*')
+TOKEN_SEPARATORS = re.compile(r'[-_.:/]')
+STOPWORDS = frozenset(
+    'a an and are as at be by can for from if in into is it its of on or that the this to was when which '
+    'with you your'.split()
+)
+
+# Page furniture repeated on every page of the manual text
+FOOTER_PATTERN = re.compile(r'^\S.*\s{3,}\d+\s{3,}CLI Command Reference Manual\s*$')
+HEADER_PATTERN = re.compile(r'^\s+M4300 Intelligent Edge Series Fully Managed Stackable Switches\s*$')
+FORMAT_PATTERN = re.compile(r'^\s+Format\s{2,}(\S.*?)\s*$')
+ARGUMENT_START = re.compile(r'[<\[{|]')
+SMART_QUOTES = re.compile(r'[“”]')
+
+
+def tokenize(text):
+    """Yield the lowercase search terms of text
+
+    Compound words such as spanning-tree or dot1x.auth are indexed whole and as
+    their parts, so either form matches.
+    """
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        if len(token) > MAX_TERM_LENGTH or token in STOPWORDS:
+            continue
+        yield token
+        if TOKEN_SEPARATORS.search(token):
+            for part in TOKEN_SEPARATORS.split(token):
+                if part and part not in STOPWORDS:
+                    yield part
+
+
+def collapse(text):
+    return ' '.join(SMART_QUOTES.sub('"', text).split())
+
+
+def command_name(syntax):
+    """Return the keyword part of a syntax line, up to the first argument"""
+    words = []
+    for word in syntax.split():
+        if ARGUMENT_START.match(word):
+            break
+        words.append(word)
+    return ' '.join(words).lower()
+
+
+def iter_documents(docs_dir):
+    """Yield the search documents built from the collection's docs directory"""
+    manual = os.path.join(docs_dir, MANUAL_FILE)
+    format_pages = {}
+    name_pages = {}
+    with open(manual, 'r', encoding='utf-8') as f:
+        pages = f.read().split('\f')
+    for number, page in enumerate(pages, 1):
+        lines = []
+        for line in page.splitlines():
+            if FOOTER_PATTERN.match(line) or HEADER_PATTERN.match(line):
+                continue
+            match = FORMAT_PATTERN.match(line)
+            if match:
+                syntax = collapse(match.group(1))
+                format_pages.setdefault(syntax.lower(), number)
+                name_pages.setdefault(command_name(syntax), number)
+            if line.strip():
+                lines.append(line.strip())
+        if lines:
+            yield dict(kind='page', title=f"Manual page {number}", snippet=collapse(lines[0])[:160],
+                       text='\n'.join(lines), start_page=number, end_page=number)
+
+    with open(os.path.join(docs_dir, CHUNKS_FILE), 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            chunk = json.loads(line)
+            yield dict(kind='chunk', title=f"Chunk {chunk['chunk_id']}", snippet=chunk.get('summary', ''),
+                       text=chunk.get('summary', ''), start_page=chunk['start_page'], end_page=chunk['end_page'])
+
+    with open(os.path.join(docs_dir, COMMAND_REF_FILE), 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            syntax = collapse(entry['syntax'])
+            bare = syntax.lstrip('#').strip()
+            page = format_pages.get(bare.lower()) or name_pages.get(command_name(bare), 0)
+            yield dict(kind='command', title=syntax, snippet=entry.get('summary', ''),
+                       text=f"{syntax}\n{entry.get('summary', '')}", start_page=page, end_page=page)
+
+
+def build_index(documents, path):
+    """Write the index of documents to path atomically and return (documents, terms)"""
+    strings = bytearray()
+    lengths = array('I')
+    kinds = bytearray()
+    records = bytearray()
+    postings = {}
+
+    def add_string(text, limit=0xFFFF):
+        data = text.encode('utf-8')[:limit]
+        offset = len(strings)
+        strings.extend(data)
+        return offset, len(data)
+
+    for doc_id, document in enumerate(documents):
+        if doc_id >= MAX_DOCUMENTS:
+            raise ValueError(f"search index is limited to {MAX_DOCUMENTS} documents")
+        counts = Counter(tokenize(document['title'] + '\n' + document['text']))
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((doc_id, min(tf, 255)))
+        lengths.append(sum(counts.values()))
+        kinds.append(KINDS.index(document['kind']))
+        records.extend(RECORD.pack(*add_string(document['title']), *add_string(document['snippet']),
+                                   document['start_page'], document['end_page']))
+
+    terms = bytearray()
+    posting_data = bytearray()
+    for term in sorted(postings, key=lambda t: t.encode('utf-8')):
+        entries = postings[term]
+        offset, length = add_string(term)
+        terms.extend(TERM.pack(offset, length, len(entries), len(posting_data)))
+        doc_ids = array('H', (doc_id for doc_id, _ in entries))
+        if sys.byteorder == 'big':
+            doc_ids.byteswap()
+        posting_data.extend(doc_ids.tobytes())
+        posting_data.extend(bytes(tf for _, tf in entries))
+
+    count = len(kinds)
+    avgdl = (sum(lengths) / count) if count else 0.0
+    if sys.byteorder == 'big':
+        lengths.byteswap()
+    sections = [lengths.tobytes(), bytes(kinds), bytes(records), bytes(terms), bytes(posting_data), bytes(strings)]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.search_index-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, count, len(postings), avgdl, *offsets))
+            for section in sections:
+                f.write(section)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count, len(postings)
+
+
+class SearchIndex:
+    """Memory-mapped reader for an index written by build_index"""
+
+    def __init__(self, path, k1=1.2, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.count, self.term_count, self.avgdl,
+         self.lengths_offset, self.kinds_offset, self.records_offset,
+         self.terms_offset, self.postings_offset, self.strings_offset) = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} search index")
+        self._norms = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.mm.close()
+
+    def _string(self, offset, length):
+        start = self.strings_offset + offset
+        return self.mm[start:start + length]
+
+    def _term(self, index):
+        return TERM.unpack_from(self.mm, self.terms_offset + index * TERM.size)
+
+    def _bisect(self, key):
+        """Return the first term index whose bytes are >= key"""
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            offset, length, _, _ = self._term(middle)
+            if self._string(offset, length) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, term):
+        """Return the term table indexes matching term; a trailing * matches a prefix"""
+        if term.endswith('*'):
+            prefix = term[:-1].encode('utf-8')
+            index = self._bisect(prefix)
+            matches = []
+            while index < self.term_count and len(matches) < MAX_PREFIX_TERMS:
+                offset, length, _, _ = self._term(index)
+                if not self._string(offset, length).startswith(prefix):
+                    break
+                matches.append(index)
+                index += 1
+            return matches
+        key = term.encode('utf-8')
+        index = self._bisect(key)
+        if index < self.term_count:
+            offset, length, _, _ = self._term(index)
+            if self._string(offset, length) == key:
+                return [index]
+        return []
+
+    def postings(self, index):
+        """Return (document ids, term frequencies) of a term table index"""
+        _, _, df, offset = self._term(index)
+        start = self.postings_offset + offset
+        doc_ids = array('H')
+        doc_ids.frombytes(self.mm[start:start + 2 * df])
+        if sys.byteorder == 'big':
+            doc_ids.byteswap()
+        return doc_ids, self.mm[start + 2 * df:start + 3 * df]
+
+    def norms(self):
+        """Per-document BM25 length normalisation, computed on first use"""
+        if self._norms is None:
+            lengths = array('I')
+            lengths.frombytes(self.mm[self.lengths_offset:self.lengths_offset + 4 * self.count])
+            if sys.byteorder == 'big':
+                lengths.byteswap()
+            avgdl = self.avgdl or 1.0
+            self._norms = [self.k1 * (1 - self.b + self.b * length / avgdl) for length in lengths]
+        return self._norms
+
+    def document(self, doc_id):
+        """Decode one document's result fields"""
+        title_offset, title_length, snippet_offset, snippet_length, start_page, end_page = RECORD.unpack_from(
+            self.mm, self.records_offset + doc_id * RECORD.size)
+        return dict(
+            kind=KINDS[self.mm[self.kinds_offset + doc_id]],
+            title=self._string(title_offset, title_length).decode('utf-8', 'replace'),
+            snippet=self._string(snippet_offset, snippet_length).decode('utf-8', 'replace'),
+            start_page=start_page,
+            end_page=end_page,
+        )
+
+    def search(self, query, limit=10, kinds=None):
+        """Return the best BM25 matches for query as result dicts, best first
+
+        Words in query are ORed; end a word with * to match it as a prefix.
+        kinds restricts the results to some of page, chunk and command.
+        """
+        allowed = None
+        if kinds:
+            unknown = set(kinds) - set(KINDS)
+            if unknown:
+                raise ValueError(f"unknown document kinds: {', '.join(sorted(unknown))}")
+            allowed = {KINDS.index(kind) for kind in kinds}
+        kind_codes = self.mm[self.kinds_offset:self.kinds_offset + self.count]
+
+        terms = set()
+        for word in query.split():
+            if word.endswith('*'):
+                terms.update(self.lookup(word.lower()))
+            else:
+                for token in tokenize(word):
+                    terms.update(self.lookup(token))
+
+        norms = self.norms()
+        k1 = self.k1
+        scores = {}
+        for index in terms:
+            doc_ids, tfs = self.postings(index)
+            df = len(doc_ids)
+            idf = math.log(1 + (self.count - df + 0.5) / (df + 0.5))
+            for doc_id, tf in zip(doc_ids, tfs):
+                if allowed is not None and kind_codes[doc_id] not in allowed:
+                    continue
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norms[doc_id])
+
+        results = []
+        for doc_id, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            result = self.document(doc_id)
+            result['score'] = round(score, 4)
+            results.append(result)
+        return results
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Controller-wide per-switch session limiting for Netgear M4300 switches
+
+M4300 switches accept only a few concurrent telnet sessions. SessionLimiter is
+a cross-process counting semaphore built on file locks: every process that
+wants a session takes a numbered ticket file in a per-switch directory and
+holds an exclusive lock on it until it disconnects. The holders of the
+max_sessions lowest live tickets own the sessions, everyone else waits in
+ticket (FIFO) order. A ticket whose lock can be taken belongs to a process
+that died and is removed, so crashed workers never leak a slot.
+"""
+
+import fcntl
+import os
+import random
+import re
+import time
+
+DEFAULT_LOCK_DIR = '~/.ansible/netgear_sessions'
+
+TICKET_PATTERN = re.compile(r'^(\d+)\.ticket$')
+
+
+class SessionLimitTimeout(Exception):
+    """Raised when no session slot became free in time"""
+
+
+class SessionLimiter:
+    """FIFO cross-process semaphore limiting sessions per switch"""
+
+    def __init__(self, host, max_sessions=2, lock_dir=None, timeout=300, poll_interval=0.1):
+        self.host = host
+        self.max_sessions = max(1, int(max_sessions))
+        self.directory = os.path.join(os.path.expanduser(lock_dir or DEFAULT_LOCK_DIR),
+                                      re.sub(r'[^\w.-]', '_', str(host)))
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.wait_time = 0.0
+        self.queue_position = 0
+        self._ticket_path = None
+        self._ticket_fd = None
+
+    def _counter_lock(self):
+        fd = os.open(os.path.join(self.directory, 'counter'), os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    def _take_ticket(self):
+        """Allocate the next ticket number and lock its ticket file"""
+        os.makedirs(self.directory, exist_ok=True)
+        counter_fd = self._counter_lock()
+        try:
+            value = os.read(counter_fd, 32).strip()
+            seq = int(value) + 1 if value else 1
+            os.lseek(counter_fd, 0, os.SEEK_SET)
+            os.ftruncate(counter_fd, 0)
+            os.write(counter_fd, str(seq).encode('ascii'))
+
+            path = os.path.join(self.directory, f"{seq:012d}.ticket")
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        finally:
+            os.close(counter_fd)
+        return seq, path, fd
+
+    def _live_tickets_ahead(self, seq):
+        """Count live tickets older than seq, removing tickets of dead processes"""
+        counter_fd = self._counter_lock()
+        try:
+            ahead = 0
+            for name in os.listdir(self.directory):
+                match = TICKET_PATTERN.match(name)
+                if not match or int(match.group(1)) >= seq:
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    fd = os.open(path, os.O_RDWR)
+                except FileNotFoundError:
+                    continue
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    ahead += 1
+                else:
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                finally:
+                    os.close(fd)
+            return ahead
+        finally:
+            os.close(counter_fd)
+
+    def acquire(self):
+        """Wait for a session slot and return the seconds spent queued"""
+        if self._ticket_fd is not None:
+            return 0.0
+
+        start = time.monotonic()
+        seq, path, fd = self._take_ticket()
+        self._ticket_path, self._ticket_fd = path, fd
+
+        try:
+            ahead = self._live_tickets_ahead(seq)
+            self.queue_position = max(0, ahead - self.max_sessions + 1)
+            while ahead >= self.max_sessions:
+                if self.timeout and time.monotonic() - start >= self.timeout:
+                    raise SessionLimitTimeout(
+                        f"No telnet session slot for {self.host} after {self.timeout}s "
+                        f"({self.max_sessions} sessions in use)")
+                time.sleep(self.poll_interval * random.uniform(0.5, 1.5))
+                ahead = self._live_tickets_ahead(seq)
+        except BaseException:
+            self.release()
+            raise
+
+        self.wait_time = time.monotonic() - start
+        return self.wait_time
+
+    def release(self):
+        """Give the session slot back"""
+        if self._ticket_fd is None:
+            return
+        try:
+            os.unlink(self._ticket_path)
+        except FileNotFoundError:
+            pass
+        os.close(self._ticket_fd)
+        self._ticket_path, self._ticket_fd = None, None
+
+    def metrics(self):
+        """Return queue metrics of the last acquire"""
+        return dict(
+            wait_time=round(self.wait_time, 6),
+            queue_position=self.queue_position,
+            max_sessions=self.max_sessions,
+        )
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.release()
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=30.0):
+    """Return a full-jitter exponential backoff delay for a retry attempt"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def retry_with_backoff(func, retries=3, base_delay=1.0, max_delay=30.0,
+                       retry_on=(Exception,), on_retry=None):
+    """Call func, retrying on retry_on exceptions with jittered exponential backoff"""
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except retry_on as e:
+            if attempt >= retries:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            if on_retry:
+                on_retry(attempt + 1, delay, e)
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+SHA-256/SHA-512 crypt ($5$/$6$) password hashes, as stored by the M4300
+
+The switch keeps local user passwords in the running-config as
+``username "bob" password $6$<salt>$<hash> encryption-type sha512 level 1 encrypted``.
+Hashing a candidate password with the stored salt and rounds tells the
+controller whether the password on the switch already matches, without
+sending anything. This is a plain Python implementation of the SHA-crypt
+specification (https://www.akkadia.org/drepper/SHA-crypt.txt), so it does
+not depend on the crypt module (removed in Python 3.13) or on passlib.
+"""
+
+import hashlib
+import hmac
+import secrets
+
+SCHEMES = {
+    'sha512': ('6', 'sha512', 64),
+    'sha256': ('5', 'sha256', 32),
+}
+SCHEME_IDS = {ident: name for name, (ident, _, _) in SCHEMES.items()}
+DEFAULT_ROUNDS = 5000
+MIN_ROUNDS = 1000
+MAX_ROUNDS = 999999999
+SALT_LENGTH = 16
+
+ALPHABET = './0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# Byte order of the final digest encoding: triples of digest offsets, then the tail
+ENCODING_ORDER = {
+    'sha512': ([(0, 21, 42), (22, 43, 1), (44, 2, 23), (3, 24, 45), (25, 46, 4), (47, 5, 26),
+                (6, 27, 48), (28, 49, 7), (50, 8, 29), (9, 30, 51), (31, 52, 10), (53, 11, 32),
+                (12, 33, 54), (34, 55, 13), (56, 14, 35), (15, 36, 57), (37, 58, 16), (59, 17, 38),
+                (18, 39, 60), (40, 61, 19), (62, 20, 41)], ((None, None, 63), 2)),
+    'sha256': ([(0, 10, 20), (21, 1, 11), (12, 22, 2), (3, 13, 23), (24, 4, 14), (15, 25, 5),
+                (6, 16, 26), (27, 7, 17), (18, 28, 8), (9, 19, 29)], ((None, 31, 30), 3)),
+}
+
+
+def _encode(digest, scheme):
+    triples, (tail, tail_length) = ENCODING_ORDER[scheme]
+    out = []
+
+    def add(offsets, length):
+        value = 0
+        for offset in offsets:
+            value = (value << 8) | (digest[offset] if offset is not None else 0)
+        for _ in range(length):
+            out.append(ALPHABET[value & 0x3f])
+            value >>= 6
+
+    for triple in triples:
+        add(triple, 4)
+    add(tail, tail_length)
+    return ''.join(out)
+
+
+def _repeat(digest, length, size):
+    return (digest * (length // size + 1))[:length]
+
+
+def sha_crypt(password, salt=None, rounds=None, scheme='sha512'):
+    """Return the $5$/$6$ crypt string of password
+
+    A random 16 character salt is used when salt is None. rounds=None uses
+    the implicit default of 5000, which is left out of the result.
+    """
+    ident, hash_name, size = SCHEMES[scheme]
+    if salt is None:
+        salt = ''.join(secrets.choice(ALPHABET) for _ in range(SALT_LENGTH))
+    salt = salt[:SALT_LENGTH]
+    explicit_rounds = rounds is not None
+    rounds = min(MAX_ROUNDS, max(MIN_ROUNDS, rounds)) if explicit_rounds else DEFAULT_ROUNDS
+
+    def new(data=b''):
+        return hashlib.new(hash_name, data)
+
+    key = password.encode('utf-8')
+    salt_bytes = salt.encode('utf-8')
+
+    alternate = new(key + salt_bytes + key).digest()
+    context = new(key + salt_bytes)
+    context.update(_repeat(alternate, len(key), size))
+    length = len(key)
+    while length:
+        context.update(alternate if length & 1 else key)
+        length >>= 1
+    digest = context.digest()
+
+    p_bytes = _repeat(new(key * len(key)).digest(), len(key), size)
+    s_bytes = _repeat(new(salt_bytes * (16 + digest[0])).digest(), len(salt_bytes), size)
+
+    for round_number in range(rounds):
+        context = new(p_bytes if round_number & 1 else digest)
+        if round_number % 3:
+            context.update(s_bytes)
+        if round_number % 7:
+            context.update(p_bytes)
+        context.update(digest if round_number & 1 else p_bytes)
+        digest = context.digest()
+
+    rounds_field = f"rounds={rounds}$" if explicit_rounds else ''
+    return f"${ident}${rounds_field}{salt}${_encode(digest, scheme)}"
+
+
+def parse_crypt(crypt_string):
+    """Return (scheme, salt, rounds) of a $5$/$6$ crypt string, or None if it is not one"""
+    parts = crypt_string.split('$')
+    if len(parts) not in (4, 5) or parts[0] or parts[1] not in SCHEME_IDS:
+        return None
+    rounds = None
+    if len(parts) == 5:
+        if not parts[2].startswith('rounds='):
+            return None
+        try:
+            rounds = int(parts[2][len('rounds='):])
+        except ValueError:
+            return None
+    return SCHEME_IDS[parts[1]], parts[-2], rounds
+
+
+def verify_password(password, crypt_string):
+    """Return True if password hashes to crypt_string, None if the hash format is unknown"""
+    parsed = parse_crypt(crypt_string)
+    if parsed is None:
+        return None
+    scheme, salt, rounds = parsed
+    return hmac.compare_digest(sha_crypt(password, salt, rounds, scheme), crypt_string)
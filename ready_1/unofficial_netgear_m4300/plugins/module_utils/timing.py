@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Latency instrumentation for Netgear M4300 sessions
+
+SessionTimer records the session slot queue metrics, login time and, per
+command, the wall time, the time from writing the command to reading its
+prompt and the bytes read. NullTimer has the same interface and does nothing,
+so instrumented code paths cost a few attribute lookups when timing is
+disabled.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+
+# Characters of earlier output searched together with each new read for the prompt
+PROMPT_CONTEXT = 256
+
+SAVE_COMMANDS = ('save config', 'write memory', 'copy system:running-config nvram:startup-config')
+
+# Commands that only move between CLI modes
+MODE_COMMAND_PATTERN = re.compile(
+    r'^(enable|configure|exit|end|quit|vlan database|interface \S+|line \S+|router \S+)$'
+)
+
+
+def command_class(command):
+    """Classify a command for aggregation: show, save, mode or config"""
+    command = ' '.join(command.split())
+    if command.startswith('show '):
+        return 'show'
+    if command in SAVE_COMMANDS:
+        return 'save'
+    if MODE_COMMAND_PATTERN.match(command):
+        return 'mode'
+    return 'config'
+
+
+def percentile(values, pct):
+    """Return the pct percentile of values using linear interpolation"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class SessionTimer:
+    """Collects timings for one session"""
+
+    enabled = True
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.queue_wait = 0.0
+        self.queue = None
+        self.connect_time = 0.0
+        self.commands = []
+
+    def queued(self, metrics):
+        """Record the session limiter's queue metrics (SessionLimiter.metrics())"""
+        self.queue_wait += metrics['wait_time']
+        self.queue = metrics
+
+    @contextmanager
+    def connect(self):
+        """Time the login"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.connect_time += time.monotonic() - start
+
+    @contextmanager
+    def command(self, command):
+        """Time a command; the block sets record['prompt_wait'] and record['bytes_read'] (see prompt)"""
+        record = dict(command=command, cls=command_class(command), prompt_wait=0.0, bytes_read=0)
+        start = time.monotonic()
+        try:
+            yield record
+        finally:
+            record['elapsed'] = time.monotonic() - start
+            self.commands.append(record)
+
+    @contextmanager
+    def prompt(self, record, connection, pattern):
+        """Time the wait for the prompt inside a netmiko connection's read loop
+
+        For the block, the connection's write_channel and read_channel are
+        wrapped: the clock starts when the command is written and stops at the
+        first read after which pattern matches the data read so far, so
+        record['prompt_wait'] leaves out login, sending and netmiko's output
+        processing. record['bytes_read'] counts the data read from the channel.
+        """
+        write_channel, read_channel = connection.write_channel, connection.read_channel
+        state = dict(written=None, tail='', buffered='')
+
+        def timed_write(out_data):
+            if state['written'] is None:
+                state['written'] = time.monotonic()
+            return write_channel(out_data)
+
+        def timed_read():
+            # netmiko prepends data it read ahead and buffered; count it once
+            buffered = getattr(connection, '_read_buffer', '')
+            data = read_channel()
+            new = data[len(buffered):] if buffered and data.startswith(buffered) else data
+            record['bytes_read'] += len(new)
+            if state['written'] is not None and new:
+                # The prompt is one line, so the end of the earlier data is enough context
+                state['tail'] = state['tail'][-PROMPT_CONTEXT:] + new
+                if re.search(pattern, state['tail']):
+                    record['prompt_wait'] += time.monotonic() - state['written']
+                    state['written'] = None
+            return data
+
+        connection.write_channel, connection.read_channel = timed_write, timed_read
+        try:
+            yield
+        finally:
+            del connection.write_channel, connection.read_channel
+
+    def as_dict(self):
+        """Return the timings as a JSON friendly dict, times in seconds"""
+        return dict(
+            total=round(time.monotonic() - self.started, 6),
+            queue_wait=round(self.queue_wait, 6),
+            queue=self.queue,
+            connect=round(self.connect_time, 6),
+            bytes_read=sum(r['bytes_read'] for r in self.commands),
+            commands=[dict(
+                command=r['command'],
+                cls=r['cls'],
+                elapsed=round(r['elapsed'], 6),
+                prompt_wait=round(r['prompt_wait'], 6),
+                bytes_read=r['bytes_read'],
+            ) for r in self.commands],
+        )
+
+
+class NullTimer:
+    """SessionTimer stand-in used when timing is disabled"""
+
+    enabled = False
+
+    def queued(self, metrics):
+        pass
+
+    @contextmanager
+    def connect(self):
+        yield
+
+    @contextmanager
+    def command(self, command):
+        yield {}
+
+    @contextmanager
+    def prompt(self, record, connection, pattern):
+        yield
+
+    def as_dict(self):
+        return None
+
+
+NULL_TIMER = NullTimer()
+
+
+def new_timer(enabled):
+    """Return a SessionTimer when enabled, else the shared NullTimer"""
+    return SessionTimer() if enabled else NULL_TIMER
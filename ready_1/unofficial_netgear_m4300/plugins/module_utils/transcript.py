@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Session transcript recording and replay for Netgear M4300 sessions
+
+Transcript files are append-only: a magic header followed by records of
+(seconds since session start: float64, kind: uint8, length: uint32, payload).
+Kinds are SESSION (JSON metadata, starts a session), SENT and RECEIVED (raw
+channel data) and COMMAND / END markers around each command, so per-command
+latency and prompts can be read back without parsing the byte stream.
+
+ReplayServer serves recorded sessions on a local telnet port: it sends the
+RECEIVED data at the recorded pace (scaled by speed) and waits for the client
+input of each SENT record, so the real netmiko client, prompt handling and parsers
+run against captured traffic without hardware.
+"""
+
+import json
+import os
+import re
+import socket
+import struct
+import threading
+import time
+
+MAGIC = b'NGTR\x01\n'
+RECORD = struct.Struct('<dBI')
+
+SESSION, SENT, RECEIVED, COMMAND, END = range(5)
+LINE_END_PATTERN = re.compile(rb'\r\n|\r|\n')
+MASK_PATTERN = re.compile(rb'\*+')
+
+KIND_NAMES = {SESSION: 'session', SENT: 'sent', RECEIVED: 'received', COMMAND: 'command', END: 'end'}
+
+
+class TranscriptError(Exception):
+    """Raised for unreadable transcripts or replay divergence"""
+
+
+class TranscriptWriter:
+    """Append timestamped channel records to a transcript file
+
+    Every value passed in redact (the task's no_log values) is masked in SENT
+    and RECEIVED records and in command markers, so neither typed secrets nor
+    their echo reach the file. The tail of a record that could be the start
+    of a secret is held back until the next record, so a secret split across
+    two channel reads is masked too.
+    """
+
+    def __init__(self, path, redact=()):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._redact = []
+        self._held = {SENT: b'', RECEIVED: b''}
+        self.redact(redact)
+        self._start = time.monotonic()
+
+    def redact(self, values):
+        """Add values to mask in channel records"""
+        for value in values:
+            if isinstance(value, str) and value:
+                secret = value.encode('utf-8')
+                if secret not in self._redact:
+                    self._redact.append(secret)
+        # Mask longer secrets first so one containing another is fully masked
+        self._redact.sort(key=len, reverse=True)
+
+    def _mask(self, data):
+        for secret in self._redact:
+            data = data.replace(secret, b'*' * len(secret))
+        return data
+
+    def _mask_channel(self, kind, data):
+        """Mask secrets in channel data, holding back a possible partial secret"""
+        data = self._mask(self._held[kind] + data)
+        held = 0
+        for secret in self._redact:
+            for size in range(min(len(secret) - 1, len(data)), held, -1):
+                if data.endswith(secret[:size]):
+                    held = size
+                    break
+        self._held[kind] = data[len(data) - held:] if held else b''
+        return data[:len(data) - held]
+
+    def _flush_held(self, keep=None):
+        for kind, data in self._held.items():
+            if data and kind != keep:
+                self._held[kind] = b''
+                self._record(kind, data)
+
+    def _record(self, kind, data):
+        self._file.write(RECORD.pack(time.monotonic() - self._start, kind, len(data)) + data)
+        self._file.flush()
+
+    def _write(self, kind, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if kind in self._held:
+            # Data held in the other direction came first; replay depends on the order
+            self._flush_held(keep=kind)
+            data = self._mask_channel(kind, data)
+            if data:
+                self._record(kind, data)
+            return
+        self._flush_held()
+        self._record(kind, self._mask(data))
+
+    def session(self, **meta):
+        """Start a new session"""
+        self._start = time.monotonic()
+        meta.setdefault('started', time.time())
+        self._write(SESSION, json.dumps(meta, sort_keys=True))
+
+    def sent(self, data):
+        if data:
+            self._write(SENT, data)
+
+    def received(self, data):
+        if data:
+            self._write(RECEIVED, data)
+
+    def command(self, command):
+        """Mark the start of a command"""
+        self._write(COMMAND, command)
+
+    def end(self, prompt=''):
+        """Mark the end of a command, optionally with the prompt seen"""
+        self._write(END, prompt)
+
+    def close(self):
+        self._flush_held()
+        self._file.close()
+
+
+def read_transcript(path):
+    """Yield (timestamp, kind, payload bytes) records from a transcript"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise TranscriptError(f"{path} is not a netgear transcript")
+        while True:
+            header = f.read(RECORD.size)
+            if not header:
+                return
+            if len(header) < RECORD.size:
+                raise TranscriptError(f"Truncated record header in {path}")
+            timestamp, kind, length = RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                raise TranscriptError(f"Truncated record payload in {path}")
+            yield timestamp, kind, payload
+
+
+def load_sessions(path):
+    """Return a list of sessions, each a dict with meta and records"""
+    sessions = []
+    for timestamp, kind, payload in read_transcript(path):
+        if kind == SESSION:
+            sessions.append(dict(meta=json.loads(payload.decode('utf-8')), records=[]))
+        elif sessions:
+            sessions[-1]['records'].append((timestamp, kind, payload))
+    return sessions
+
+
+def command_latencies(session):
+    """Return (command, seconds, bytes received) for each marked command of a session"""
+    results = []
+    current = None
+    for timestamp, kind, payload in session['records']:
+        if kind == COMMAND:
+            current = [payload.decode('utf-8', 'replace'), timestamp, 0]
+        elif kind == RECEIVED and current:
+            current[2] += len(payload)
+        elif kind == END and current:
+            results.append((current[0], timestamp - current[1], current[2]))
+            current = None
+    return results
+
+
+def connect(device_params, transcript=None):
+    """Open a netmiko connection, recording channel traffic to transcript if given"""
+    from netmiko import ConnectHandler
+
+    if transcript is None:
+        return ConnectHandler(**device_params)
+
+    from netmiko.ssh_dispatcher import CLASS_MAPPER
+
+    base = CLASS_MAPPER[device_params['device_type']]
+
+    class RecordingConnection(base):
+        def write_channel(self, out_data):
+            transcript.sent(out_data)
+            return super(RecordingConnection, self).write_channel(out_data)
+
+        def read_channel(self):
+            # netmiko prepends data it read ahead (e.g. past a command echo) and
+            # buffered; record only what came from the channel this time
+            buffered = getattr(self, '_read_buffer', '')
+            data = super(RecordingConnection, self).read_channel()
+            transcript.received(data[len(buffered):] if buffered and data.startswith(buffered) else data)
+            return data
+
+    return RecordingConnection(**device_params)
+
+
+class ReplayServer:
+    """Serve recorded sessions on a local port, one session per connection"""
+
+    def __init__(self, path, speed=1.0, host='127.0.0.1'):
+        self.sessions = load_sessions(path)
+        if not self.sessions:
+            raise TranscriptError(f"No sessions recorded in {path}")
+        self.speed = speed
+        self.host = host
+        self.port = None
+        self.errors = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._sock = None
+        self._thread = None
+
+    def start(self):
+        """Start serving in a background thread and return the port"""
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((self.host, 0))
+        self._sock.listen(8)
+        self.port = self._sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def _accept_loop(self):
+        while self._sock:
+            try:
+                client, addr = self._sock.accept()
+            except OSError:
+                return
+            with self._lock:
+                session = self.sessions[self._next % len(self.sessions)]
+                self._next += 1
+            threading.Thread(target=self._serve, args=(client, session), daemon=True).start()
+
+    def _serve(self, client, session):
+        last = 0.0
+        pending = bytearray()
+        secrets = {}
+        held = b''
+        try:
+            for timestamp, kind, payload in session['records']:
+                if kind == RECEIVED:
+                    if self.speed:
+                        delay = (timestamp - last) / self.speed
+                        if delay > 0:
+                            time.sleep(delay)
+                    # A masked run may continue in the next record; send it whole
+                    data = held + payload
+                    trailing = len(data) - len(data.rstrip(b'*'))
+                    held = data[len(data) - trailing:] if trailing else b''
+                    client.sendall(self._unmask(data[:len(data) - trailing], secrets))
+                    last = timestamp
+                elif kind == SENT:
+                    if held:
+                        client.sendall(self._unmask(held, secrets))
+                        held = b''
+                    data = self._consume(client, pending, payload)
+                    if data is None:
+                        return
+                    self._learn(payload, data, secrets)
+                    last = timestamp
+            if held:
+                client.sendall(self._unmask(held, secrets))
+        except OSError as e:
+            self.errors.append(str(e))
+        finally:
+            client.close()
+
+    @staticmethod
+    def _learn(payload, data, secrets):
+        """Record the client input behind each masked run of a SENT record"""
+        if len(payload) != len(data):
+            return
+        for match in MASK_PATTERN.finditer(payload):
+            secrets[len(match.group())] = data[match.start():match.end()]
+
+    @staticmethod
+    def _unmask(data, secrets):
+        """Replace masked runs with the client input of the same length
+
+        Redacted transcripts mask the echo of secrets too; netmiko waits for
+        the echo of each command, so the echo has to match what was sent.
+        """
+        if not secrets or b'*' not in data:
+            return data
+        return MASK_PATTERN.sub(lambda m: secrets.get(len(m.group()), m.group()), data)
+
+    @staticmethod
+    def _consume(client, pending, payload):
+        """Wait for and return the client input matching a SENT record
+
+        Input is matched by line count rather than exact bytes so masked or
+        different credentials still line up; records without a line ending are
+        matched by length. Returns None when the client disconnects.
+        """
+        lines = len(LINE_END_PATTERN.findall(payload))
+        while True:
+            if lines:
+                ends = list(LINE_END_PATTERN.finditer(pending))
+                if len(ends) >= lines:
+                    size = ends[lines - 1].end()
+                    data = bytes(pending[:size])
+                    del pending[:size]
+                    return data
+            elif len(pending) >= len(payload):
+                data = bytes(pending[:len(payload)])
+                del pending[:len(payload)]
+                return data
+            data = client.recv(4096)
+            if not data:
+                return None
+            pending.extend(data)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+DOCUMENTATION = """
+---
+module: netgear_backup
+short_description: Back up Netgear M4300 running-configs to a content-addressed store
+description:
+  - Back up the running-config of Netgear M4300 series switches into a compressed,
+    content-addressed store on the controller
+  - The config is split into blocks (interfaces, routing protocols, lines, ...) and each
+    distinct block is stored once, so identical blocks across switches and runs are deduplicated
+  - A new snapshot is only recorded when the running-config differs from the latest one;
+    C(!) comment lines such as the system up time are ignored in the comparison and kept
+    in the snapshot manifest
+  - Also lists snapshots and restores the config text of any point in time
+  - Run with a high C(forks) value and the C(free) strategy to back up many switches concurrently
+author: Unofficial Netgear M4300 Collection Maintainers
+version_added: "1.0.0"
+options:
+  store:
+    description:
+      - Root directory of the backup store
+    type: path
+    default: ~/.ansible/netgear_backup
+  state:
+    description:
+      - C(backup) fetches the running-config and stores it
+      - C(list) returns the snapshots of the switch without connecting to it
+      - C(restore) rebuilds the config text of a snapshot without connecting to it
+    type: str
+    choices: [backup, list, restore]
+    default: backup
+  snapshot:
+    description:
+      - Snapshot to restore, either C(latest), a snapshot id such as C(20250601T020000Z)
+        or a prefix of one such as C(20250601) for the last snapshot of that day
+    type: str
+    default: latest
+  dest:
+    description:
+      - File to write the restored config to
+      - When omitted the restored config is returned in C(config)
+    type: path
+  compression:
+    description:
+      - Compression for new objects; C(auto) uses zstd when the zstandard library is
+        installed and gzip otherwise
+    type: str
+    choices: [auto, zstd, gzip]
+    default: auto
+requirements:
+  - netmiko
+  - zstandard (optional, for zstd compression)
+extends_documentation_fragment:
+  - ready_1.unofficial_netgear_m4300.timing
+"""
+
+EXAMPLES = """
+# Nightly fleet backup
+- name: Back up switches
+  hosts: switches
+  strategy: free
+  tasks:
+    - name: Back up running-config
+      ready_1.unofficial_netgear_m4300.netgear_backup:
+        store: /srv/netgear_backup
+
+# List snapshots
+- name: List backups
+  ready_1.unofficial_netgear_m4300.netgear_backup:
+    store: /srv/netgear_backup
+    state: list
+
+# Restore the config as of June 1st
+- name: Restore config text
+  ready_1.unofficial_netgear_m4300.netgear_backup:
+    store: /srv/netgear_backup
+    state: restore
+    snapshot: "20250601"
+    dest: /tmp/switch01.cfg
+"""
+
+RETURN = """
+snapshot:
+  description: Snapshot id that was created, matched or restored
+  returned: when state is backup or restore
+  type: str
+  sample: "20250601T020000Z"
+snapshots:
+  description: Snapshot ids of the switch, oldest first
+  returned: when state is list
+  type: list
+  sample: ["20250531T020000Z", "20250601T020000Z"]
+blocks:
+  description: Number of config blocks in the backup
+  returned: when state is backup
+  type: int
+new_objects:
+  description: Number of blocks that were not already in the store
+  returned: when state is backup
+  type: int
+bytes_written:
+  description: Compressed bytes added to the store
+  returned: when state is backup
+  type: int
+config:
+  description: Restored config text
+  returned: when state is restore and dest is not set
+  type: str
+commands:
+  description: List of commands executed on the switch
+  returned: always
+  type: list
+  sample: ["show running-config"]
+timing:
+  description:
+    - Session latency breakdown in seconds, null unless the C(timing) option is enabled
+    - The contents are described with the C(timing) option
+  returned: always
+  type: dict
+"""
+
+import os
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.netgear import (
+    get_config,
+    netgear_argument_spec
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.backup_store import (
+    ConfigStore
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import (
+    new_timer
+)
+
+
+def target_host(module):
+    """Return the switch address used as the snapshot directory name"""
+    provider = module.params.get('provider')
+    if provider and provider.get('host'):
+        return provider['host']
+    return module.params['host']
+
+
+def argument_spec():
+    """Return the module argument spec"""
+    spec = netgear_argument_spec()
+    spec.update(
+        store=dict(type='path', default='~/.ansible/netgear_backup'),
+        state=dict(type='str', choices=['backup', 'list', 'restore'], default='backup'),
+        snapshot=dict(type='str', default='latest'),
+        dest=dict(type='path'),
+        compression=dict(type='str', choices=['auto', 'zstd', 'gzip'], default='auto')
+    )
+    return spec
+
+
+def run_module(module):
+    """Run the module against an AnsibleModule or the action plugin's ControllerModule"""
+    host = target_host(module)
+    state = module.params['state']
+
+    try:
+        store = ConfigStore(module.params['store'], module.params['compression'])
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    if state == 'list':
+        module.exit_json(changed=False, snapshots=store.list_snapshots(host), commands=[])
+
+    if state == 'restore':
+        try:
+            snapshot_id, config = store.restore(host, module.params['snapshot'])
+        except (KeyError, ValueError, OSError) as e:
+            module.fail_json(msg=f"Failed to restore {host}: {e}")
+
+        dest = module.params['dest']
+        if not dest:
+            module.exit_json(changed=False, snapshot=snapshot_id, config=config, commands=[])
+
+        changed = True
+        if os.path.exists(dest):
+            with open(dest, 'r', encoding='utf-8') as f:
+                changed = f.read() != config
+        if changed and not module.check_mode:
+            with open(dest, 'w', encoding='utf-8') as f:
+                f.write(config)
+        module.exit_json(changed=changed, snapshot=snapshot_id, dest=dest, commands=[])
+
+    commands = ['show running-config']
+    timer = new_timer(module.params['timing'])
+    config = get_config(module, timer=timer)
+    if not config:
+        module.fail_json(msg=f"Empty running-config received from {host}", commands=commands)
+
+    if module.check_mode:
+        module.exit_json(changed=False, commands=commands, timing=timer.as_dict())
+
+    try:
+        result = store.backup(host, config)
+    except OSError as e:
+        module.fail_json(msg=f"Failed to write backup of {host}: {e}", commands=commands)
+
+    module.exit_json(
+        changed=result['created'],
+        snapshot=result['snapshot'],
+        blocks=result['blocks'],
+        new_objects=result['new_objects'],
+        bytes_written=result['bytes_written'],
+        commands=commands,
+        timing=timer.as_dict()
+    )
+
+
+def main():
+    """Main module function"""
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True
+    )
+    run_module(module)
+
+
+if __name__ == '__main__':
+    main()
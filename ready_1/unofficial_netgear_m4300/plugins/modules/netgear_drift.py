@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+DOCUMENTATION = """
+---
+module: netgear_drift
+short_description: Detect configuration drift on Netgear M4300 switches
+description:
+  - Detect running-config drift on Netgear M4300 series switches without transferring
+    the full configuration on every run
+  - Keeps a controller-side store of per-section fingerprints of the parsed running-config
+  - Runs a cheap change signal command first and only fetches and fingerprints the full
+    running-config, in the same session, when the signal differs from the stored one
+  - The first run for a switch records the baseline
+author: Unofficial Netgear M4300 Collection Maintainers
+version_added: "1.0.0"
+options:
+  state_dir:
+    description:
+      - Directory holding one fingerprint store file per switch
+    type: path
+    default: ~/.ansible/netgear_drift
+  signal_command:
+    description:
+      - Show command whose output changes whenever the configuration may have changed
+      - The default reads the CLI command entries of the buffered log, which the switch
+        writes for every CLI command while C(logging cli-command) is enabled (the default)
+      - CLI command entries of commands that cannot change the configuration (show,
+        enable, terminal, exit, end, quit and logout), such as the ones this module sends
+        itself, are left out of the signal, as are all other lines of the output; when the
+        output has no CLI command entries, its whitespace-normalized text is the signal
+      - Changes made through the web UI or SNMP are not logged as CLI commands; they are
+        found when C(max_signal_age) forces a full comparison
+    type: str
+    default: show logging buffered | include "CLI:"
+  max_signal_age:
+    description:
+      - Maximum number of seconds to trust an unchanged signal before forcing a full
+        running-config comparison
+      - Covers changes the signal does not see, such as web UI or SNMP changes or a full
+        non-wrapping log buffer
+      - Set to 0 to always trust the signal
+    type: int
+    default: 86400
+  force:
+    description:
+      - Always fetch and compare the full running-config
+    type: bool
+    default: false
+  accept:
+    description:
+      - Accept the current running-config as the new baseline
+    type: bool
+    default: false
+requirements:
+  - netmiko
+extends_documentation_fragment:
+  - ready_1.unofficial_netgear_m4300.timing
+"""
+
+EXAMPLES = """
+# Fleet-wide drift sweep
+- name: Check for configuration drift
+  ready_1.unofficial_netgear_m4300.netgear_drift:
+  register: drift
+
+- name: Report drifted sections
+  ansible.builtin.debug:
+    var: drift.sections
+  when: drift.drifted
+
+# Re-baseline after an approved change
+- name: Accept current configuration
+  ready_1.unofficial_netgear_m4300.netgear_drift:
+    accept: true
+"""
+
+RETURN = """
+drifted:
+  description: Whether the running-config differs from the baseline
+  returned: always
+  type: bool
+sections:
+  description: Added, removed and modified running-config sections
+  returned: always
+  type: dict
+  sample: {"added": [], "removed": [], "modified": ["configure > interface 1/0/1"]}
+fetched:
+  description: Whether the full running-config was transferred on this run
+  returned: always
+  type: bool
+signal:
+  description:
+    - SHA-256 of the configuration CLI command entries in the signal output, or the
+      normalized output when it has no CLI command entries
+  returned: always
+  type: str
+baseline_created:
+  description: Whether this run recorded a new baseline
+  returned: always
+  type: bool
+commands:
+  description: List of commands executed on the switch
+  returned: always
+  type: list
+  sample: ['show logging buffered | include "CLI:"']
+timing:
+  description:
+    - Session latency breakdown in seconds, null unless the C(timing) option is enabled
+    - The contents are described with the C(timing) option
+  returned: always
+  type: dict
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.netgear import (
+    command_session,
+    netgear_argument_spec,
+    config_fingerprints,
+    compare_fingerprints
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import (
+    new_timer
+)
+
+
+def state_path(module):
+    """Return the fingerprint store path for the target switch"""
+    host = module.params['host']
+    provider = module.params.get('provider')
+    if provider and provider.get('host'):
+        host = provider['host']
+    return os.path.join(module.params['state_dir'], f"{host}.json")
+
+
+def load_state(path):
+    """Load the fingerprint store, or None if the switch has no baseline"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(path, state):
+    """Atomically write the fingerprint store"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.drift-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# CLI command entries of the buffered log, e.g.
+# <189> JAN 01 00:13:54 10.1.1.1-1 UNKNOWN[2]: cmd_logger_api.c(83) 13 %% CLI:10.1.1.2:admin:show version
+CLI_LOG_PATTERN = re.compile(r'CLI:[^:\s]*:[^:\s]*:(.*)$')
+
+# Logged commands that cannot change the configuration, including this module's own
+READ_ONLY_PATTERN = re.compile(r'^(show|enable|terminal|exit|end|quit|logout)\b')
+
+
+def normalize_signal(output):
+    """Return the change signal of a signal command output
+
+    The signal is a hash of the logged CLI commands that may change the
+    configuration, so the module's own logins and show commands do not move it.
+    Outputs without CLI command entries are compared as whitespace-normalized text.
+    """
+    entries = []
+    for line in output.split('\n'):
+        match = CLI_LOG_PATTERN.search(line.strip())
+        if match:
+            entries.append((line.strip(), match.group(1).strip()))
+    if not entries:
+        return ' '.join(output.split())
+    changes = [line for line, command in entries if not READ_ONLY_PATTERN.match(command)]
+    return hashlib.sha256('\n'.join(changes).encode('utf-8')).hexdigest()
+
+
+def argument_spec():
+    """Return the module argument spec"""
+    spec = netgear_argument_spec()
+    spec.update(
+        state_dir=dict(type='path', default='~/.ansible/netgear_drift'),
+        signal_command=dict(type='str', default='show logging buffered | include "CLI:"'),
+        max_signal_age=dict(type='int', default=86400),
+        force=dict(type='bool', default=False),
+        accept=dict(type='bool', default=False)
+    )
+    return spec
+
+
+def run_module(module):
+    """Run the module against an AnsibleModule or the action plugin's ControllerModule"""
+    path = state_path(module)
+    try:
+        state = load_state(path)
+    except (OSError, ValueError) as e:
+        module.fail_json(msg=f"Failed to read drift store {path}: {e}")
+
+    timer = new_timer(module.params['timing'])
+    signal_command = module.params['signal_command']
+    commands = [signal_command]
+    now = int(time.time())
+    max_age = module.params['max_signal_age']
+    config = None
+
+    # One session: the running-config is only fetched when the signal moved
+    with command_session(module, timer) as send:
+        signal = normalize_signal(send(signal_command))
+        fetch = (
+            state is None
+            or module.params['force']
+            or module.params['accept']
+            or signal != state.get('signal')
+            or (max_age and now - state.get('verified_at', 0) >= max_age)
+        )
+        if fetch:
+            commands.append('show running-config')
+            config = send('show running-config')
+
+    if not fetch:
+        module.exit_json(
+            changed=False,
+            drifted=bool(state['drifted']),
+            sections=state['sections'],
+            fetched=False,
+            signal=signal,
+            baseline_created=False,
+            commands=commands,
+            timing=timer.as_dict()
+        )
+
+    current = config_fingerprints(config)
+
+    baseline_created = state is None
+    changed = False
+    if baseline_created or module.params['accept']:
+        changed = not baseline_created
+        state = dict(baseline=current)
+
+    sections = compare_fingerprints(state['baseline'], current)
+    drifted = any(sections.values())
+    state.update(
+        signal=signal,
+        verified_at=now,
+        drifted=drifted,
+        sections=sections
+    )
+
+    if not module.check_mode:
+        try:
+            save_state(path, state)
+        except OSError as e:
+            module.fail_json(msg=f"Failed to write drift store {path}: {e}")
+
+    module.exit_json(
+        changed=changed,
+        drifted=drifted,
+        sections=sections,
+        fetched=True,
+        signal=signal,
+        baseline_created=baseline_created,
+        commands=commands,
+        timing=timer.as_dict()
+    )
+
+
+def main():
+    """Main module function"""
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True
+    )
+    run_module(module)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+DOCUMENTATION = """
+---
+module: netgear_plan
+short_description: Render shared M4300 system settings into deduplicated command plans
+description:
+  - Renders the netgear_system settings of every host into command plans on the controller,
+    before any switch is contacted
+  - All settings are validated and rendered before the first plan is written, so an error in
+    one host's settings leaves C(plan_dir) unchanged
+  - Hosts with identical settings share one plan, which is validated, rendered and has its
+    password hashes computed once, then stored under its SHA-256 in C(plan_dir)
+  - Returns the plan id of each host, to be passed to the C(plan) option of
+    M(ready_1.unofficial_netgear_m4300.netgear_system), and the number of distinct plans
+  - Run it once per play (C(run_once)); it is an action plugin and never connects to a switch
+author: Unofficial Netgear M4300 Collection Maintainers
+version_added: "1.0.0"
+options:
+  hosts:
+    description:
+      - Hosts to plan for
+      - Defaults to the hosts of the current play
+    type: list
+    elements: str
+  var:
+    description:
+      - Name of the host variable holding each host's settings, a dict of netgear_system
+        options such as C(sntp_server), C(snmp_location) and C(users)
+      - Hosts without the variable get no plan
+    type: str
+    default: netgear_system
+  plan_dir:
+    description:
+      - Directory the plans are stored in
+      - Can also be set with the C(ANSIBLE_NETGEAR_PLAN_DIR) environment variable, which
+        M(ready_1.unofficial_netgear_m4300.netgear_system) reads as well
+    type: path
+    default: ~/.ansible/netgear_plans
+  reference:
+    description:
+      - Compiled command reference the rendered commands are checked against
+      - Commands the reference does not know are reported in C(unknown_commands) and as
+        warnings, since the reference does not cover every command
+      - Defaults to C(command_ref.bin) in the collection's docs directory; set to an empty
+        string to skip the check
+    type: path
+notes:
+  - Settings that differ on every switch, such as C(hostname), belong in the netgear_system
+    task rather than in the planned variable, or every host gets its own plan
+"""
+
+EXAMPLES = """
+# group_vars/switches.yml
+# netgear_system:
+#   sntp_server: 192.168.1.100
+#   snmp_location: Data Center
+#   users:
+#     - name: operator
+#       password: "{{ vault_operator_password }}"
+#       privilege: 5
+
+- name: Plan shared system settings
+  ready_1.unofficial_netgear_m4300.netgear_plan:
+  run_once: true
+  register: fleet
+
+- name: Apply them
+  ready_1.unofficial_netgear_m4300.netgear_system:
+    plan: "{{ fleet.hosts[inventory_hostname] }}"
+    hostname: "{{ inventory_hostname }}"
+"""
+
+RETURN = """
+hosts:
+  description: Plan id of each host, null for hosts without settings
+  returned: always
+  type: dict
+  sample: {"sw1": "9f2c...", "sw2": "9f2c..."}
+plans:
+  description: The distinct plans, with their commands, user names and number of hosts
+  returned: always
+  type: dict
+distinct_plans:
+  description: Number of distinct plans
+  returned: always
+  type: int
+  sample: 1
+rendered:
+  description: Number of distinct settings that were validated and rendered
+  returned: always
+  type: int
+written:
+  description: Number of plans that were not in C(plan_dir) yet
+  returned: always
+  type: int
+unknown_commands:
+  description: Commands of each plan that the command reference does not know
+  returned: always
+  type: dict
+"""
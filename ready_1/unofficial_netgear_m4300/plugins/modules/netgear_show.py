@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025, Unofficial Netgear M4300 Collection Maintainers
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+DOCUMENTATION = """
+---
+module: netgear_show
+short_description: Run show commands on Netgear M4300 switches
+description:
+  - Runs show commands and returns their output
+  - With C(spool_threshold) set, outputs longer than the threshold are written to a per-host
+    spool file on the controller and returned as a reference (path, size, sha256 and a short
+    summary) instead of the text, so large outputs such as show running-config or show
+    tech-support do not inflate results and registered variables
+author: Unofficial Netgear M4300 Collection Maintainers
+version_added: "1.0.0"
+options:
+  commands:
+    description:
+      - Show commands to run, in order
+    type: list
+    elements: str
+    required: true
+  spool_threshold:
+    description:
+      - Outputs longer than this many characters are spooled to a file, 0 never spools
+    type: int
+    default: 0
+  spool_dir:
+    description:
+      - Directory of the spool files, one subdirectory per switch
+    type: path
+    default: ~/.ansible/netgear_spool
+  spool_compression:
+    description:
+      - Compression of the spool files; C(auto) uses zstd when the zstandard library is
+        installed and gzip otherwise
+    type: str
+    choices: [none, gzip, zstd, auto]
+    default: none
+requirements:
+  - netmiko
+extends_documentation_fragment:
+  - ready_1.unofficial_netgear_m4300.timing
+"""
+
+EXAMPLES = """
+- name: Read the version
+  ready_1.unofficial_netgear_m4300.netgear_show:
+    commands:
+      - show version
+  register: version
+
+- name: Collect large outputs without keeping them in memory
+  ready_1.unofficial_netgear_m4300.netgear_show:
+    commands:
+      - show running-config
+      - show tech-support
+    spool_threshold: 65536
+    spool_compression: auto
+  register: outputs
+
+- name: Show where they went
+  ansible.builtin.debug:
+    msg: "{{ outputs.outputs | selectattr('spooled', 'defined') | map(attribute='spooled.path') }}"
+"""
+
+RETURN = """
+outputs:
+  description:
+    - One entry per command with C(command) and either C(output) or, for spooled outputs,
+      C(spooled)
+    - C(spooled) has the spool file C(path), the output C(size) in bytes, the C(stored_size)
+      on disk, its C(sha256), the C(compression) and a C(summary) with the line count (and the
+      section and user counts for show running-config)
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - command: show running-config
+      spooled:
+        path: /home/user/.ansible/netgear_spool/192.168.1.1/20250101T120000Z-a1b2c3-001-show_running-config.txt.gz
+        size: 184320
+        stored_size: 21877
+        sha256: 3c9f...
+        compression: gzip
+        summary: {lines: 4211, sections: 64, users: 2}
+changed:
+  description: Always false
+  returned: always
+  type: bool
+timing:
+  description:
+    - Session latency breakdown in seconds, null unless the C(timing) option is enabled
+    - The contents are described with the C(timing) option
+  returned: always
+  type: dict
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.netgear import (
+    run_commands,
+    netgear_argument_spec
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import (
+    new_timer
+)
+
+
+def argument_spec():
+    """Return the module argument spec"""
+    spec = netgear_argument_spec()
+    spec.update(
+        commands=dict(type='list', elements='str', required=True)
+    )
+    return spec
+
+
+def run_module(module):
+    """Run the module against an AnsibleModule or the action plugin's ControllerModule"""
+    commands = [' '.join(command.split()) for command in module.params['commands']]
+    invalid = [command for command in commands if not command.startswith('show ')]
+    if invalid:
+        module.fail_json(msg=f"Only show commands are accepted: {', '.join(invalid)}")
+
+    timer = new_timer(module.params['timing'])
+    outputs = run_commands(module, commands, timer=timer, spool=True)
+
+    module.exit_json(
+        changed=False,
+        outputs=outputs,
+        timing=timer.as_dict()
+    )
+
+
+def main():
+    """Main module function"""
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True
+    )
+    run_module(module)
+
+
+if __name__ == '__main__':
+    main()
@@ -45,6 +45,15 @@ options:
     description:
       - Configure local users
       - List of user dictionaries with 'name', 'password', 'privilege' keys
+      - The running-config is read first and users whose stored password hash matches
+        C(password) and whose level matches C(privilege) are left untouched, so re-runs
+        and password audits send no commands
+      - Other users are written with a password hash computed on the controller
+        (SHA-512 crypt, or SHA-256 crypt if the user already uses it) and the
+        C(encrypted) keyword, so the plain text password is not sent to the switch
+      - The switch cannot check the strength of a password it only receives as a hash,
+        so passwords set this way skip the C(passwords strength-check) rules; enforce
+        them before the passwords reach this module
     type: list
     elements: dict
     suboptions:
@@ -56,6 +65,7 @@ options:
         description: User password
         type: str
         required: true
+        no_log: true
       privilege:
         description: User privilege level (1-15)
         type: int
@@ -76,6 +86,21 @@ options:
     description:
       - Set SNMP contact information
     type: str
+  plan:
+    description:
+      - Id of a command plan rendered by M(ready_1.unofficial_netgear_m4300.netgear_plan)
+      - The plan's commands are sent before the ones rendered from this task's options, and
+        its users are compared with the running-config by hashing their password with the
+        salt of the stored hash, as for C(users)
+      - Use it for settings shared by many switches and pass per-switch settings such as
+        C(hostname) directly
+    type: str
+  plan_dir:
+    description:
+      - Directory holding the plans
+      - Can also be set with the C(ANSIBLE_NETGEAR_PLAN_DIR) environment variable
+    type: path
+    default: ~/.ansible/netgear_plans
   state:
     description:
       - Whether the configuration should be present or absent
@@ -84,6 +109,8 @@ options:
     default: present
 requirements:
   - netmiko
+extends_documentation_fragment:
+  - ready_1.unofficial_netgear_m4300.timing
 """
 
 EXAMPLES = """
@@ -118,25 +145,64 @@ EXAMPLES = """
     snmp_community: "public"
     snmp_location: "Data Center Rack 1"
     snmp_contact: "admin@company.com"
+
+# Apply the plan rendered for this switch by netgear_plan
+- name: Apply shared system settings
+  ready_1.unofficial_netgear_m4300.netgear_system:
+    plan: "{{ fleet.hosts[inventory_hostname] }}"
+    hostname: "{{ inventory_hostname }}"
 """
 
 RETURN = """
 commands:
-  description: List of commands executed on the switch
+  description: List of commands executed on the switch, or that would be in check mode
   returned: always
   type: list
   sample: ["interface mgmt", "ip address 192.168.1.10/24", "exit"]
+unchanged_users:
+  description: Users whose password and privilege already matched the running-config
+  returned: always
+  type: list
+  sample: ["admin"]
 changed:
   description: Whether any changes were made
   returned: always
   type: bool
+timing:
+  description:
+    - Session latency breakdown in seconds, null unless the C(timing) option is enabled
+    - The contents are described with the C(timing) option
+  returned: always
+  type: dict
 """
 
+from types import SimpleNamespace
+
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.command_plan import (
+    PlanStore,
+    plan_dir_spec
+)
 from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.netgear import (
     run_commands,
     get_config,
-    netgear_argument_spec
+    netgear_argument_spec,
+    parse_users
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.sha_crypt import (
+    SCHEMES,
+    sha_crypt,
+    verify_password
+)
+from ansible_collections.ready_1.unofficial_netgear_m4300.plugins.module_utils.timing import (
+    new_timer
+)
+
+# Options that describe configuration rather than a connection, which netgear_plan
+# renders into shared plans
+PLAN_OPTIONS = (
+    'management_ip', 'management_gateway', 'hostname', 'enable_ssh', 'ssh_port',
+    'generate_ssh_keys', 'users', 'sntp_server', 'snmp_community', 'snmp_location', 'snmp_contact',
 )
 
 
@@ -181,19 +247,64 @@ def configure_ssh(module, commands):
             ])
 
 
-def configure_users(module, commands):
-    """Configure local users"""
-    users = module.params['users']
-    if users:
-        for user in users:
-            name = user['name']
-            password = user['password']
-            privilege = user.get('privilege', 1)
-
-            commands.extend([
-                f"username {name} password {password}",
-                f"username {name} privilege {privilege}"
-            ])
+def configure_users(module, commands, current_users):
+    """Configure local users that differ from current_users (see parse_users)
+
+    Returns the names of the users left unchanged.
+    """
+    unchanged = []
+    for user in module.params['users'] or []:
+        name = user['name']
+        password = user['password']
+        privilege = user.get('privilege', 1)
+        current = current_users.get(name) or {}
+        stored = current.get('password')
+        scheme = current.get('encryption') if current.get('encryption') in SCHEMES else 'sha512'
+
+        if stored and verify_password(password, stored):
+            if current['level'] == privilege:
+                unchanged.append(name)
+                continue
+            # Only the level differs: re-send the stored hash so the password is kept as is
+            password_hash = stored
+        else:
+            password_hash = sha_crypt(password, scheme=scheme)
+
+        commands.append(
+            f'username "{name}" password {password_hash} encryption-type {scheme} level {privilege} encrypted'
+        )
+    return unchanged
+
+
+def configure_planned_users(plan_users, commands, current_users):
+    """Configure the users of a plan that differ from current_users (see parse_users)
+
+    plan_users carry the unsealed password, which is checked against the stored
+    hash with its own salt, so users set with another salt are not rewritten.
+    Returns the names of the users left unchanged.
+    """
+    unchanged = []
+    for user in plan_users:
+        name = user['name']
+        privilege = user['privilege']
+        current = current_users.get(name) or {}
+        stored = current.get('password')
+        scheme = current.get('encryption') if current.get('encryption') in SCHEMES else 'sha512'
+
+        if stored and verify_password(user['password'], stored):
+            if current['level'] == privilege:
+                unchanged.append(name)
+                continue
+            password_hash = stored
+        elif scheme == user['encryption']:
+            password_hash = user['password_hash']
+        else:
+            password_hash = sha_crypt(user['password'], scheme=scheme)
+
+        commands.append(
+            f'username "{name}" password {password_hash} encryption-type {scheme} level {privilege} encrypted'
+        )
+    return unchanged
 
 
 def configure_sntp(module, commands):
@@ -222,10 +333,10 @@ def configure_snmp(module, commands):
         commands.append(f"snmp-server contact \"{contact}\"")
 
 
-def main():
-    """Main module function"""
-    argument_spec = netgear_argument_spec()
-    argument_spec.update(
+def argument_spec():
+    """Return the module argument spec"""
+    spec = netgear_argument_spec()
+    spec.update(
         management_ip=dict(type='str'),
         management_gateway=dict(type='str'),
         hostname=dict(type='str'),
@@ -234,29 +345,88 @@ def main():
         generate_ssh_keys=dict(type='bool', default=False),
         users=dict(type='list', elements='dict', options=dict(
             name=dict(type='str', required=True),
-            password=dict(type='str', required=True),
+            password=dict(type='str', required=True, no_log=True),
             privilege=dict(type='int', default=1)
         )),
         sntp_server=dict(type='str'),
         snmp_community=dict(type='str'),
         snmp_location=dict(type='str'),
         snmp_contact=dict(type='str'),
+        plan=dict(type='str'),
+        plan_dir=plan_dir_spec(),
         state=dict(type='str', choices=['present', 'absent'], default='present')
     )
+    return spec
+
+
+def plan_argument_spec():
+    """Return the argument spec of the options a plan is rendered from"""
+    spec = argument_spec()
+    return {name: spec[name] for name in PLAN_OPTIONS}
 
-    module = AnsibleModule(
-        argument_spec=argument_spec,
-        supports_check_mode=True
-    )
+
+def render_plan(params, store):
+    """Render validated plan options into a plan
+
+    Returns dict(commands=[...], users=[...]); the commands exclude users and the
+    surrounding configure / end / save config, and each user carries a password
+    hash from store.password_hash and the password sealed by store.seal.
+    """
+    module = SimpleNamespace(params=dict(params, users=None))
+    commands = []
+    configure_management_interface(module, commands)
+    configure_hostname(module, commands)
+    configure_ssh(module, commands)
+    configure_sntp(module, commands)
+    configure_snmp(module, commands)
+
+    users = []
+    for user in params.get('users') or []:
+        privilege = user.get('privilege', 1)
+        users.append(dict(
+            name=user['name'],
+            privilege=privilege,
+            encryption='sha512',
+            password_hash=store.password_hash(user['name'], user['password']),
+            sealed_password=store.seal(user['name'], user['password']),
+        ))
+    return dict(commands=commands, users=users)
+
+
+def run_module(module):
+    """Run the module against an AnsibleModule or the action plugin's ControllerModule"""
+    timer = new_timer(module.params['timing'])
+
+    plan = dict(commands=[], users=[])
+    if module.params['plan']:
+        try:
+            store = PlanStore(module.params['plan_dir'])
+            plan = store.get(module.params['plan'])
+            for user in plan['users']:
+                user['password'] = store.unseal(user['name'], user['sealed_password'])
+        except (OSError, ValueError) as e:
+            module.fail_json(msg=f"Failed to load plan: {e}")
+        # Users passed to the task take precedence over the plan's
+        task_users = {user['name'] for user in module.params['users'] or []}
+        plan['users'] = [user for user in plan['users'] if user['name'] not in task_users]
+
+    # Users are compared against the running-config, so only changes are sent
+    current_users = {}
+    if module.params['users'] or plan['users']:
+        try:
+            current_users = parse_users(get_config(module, timer=timer))
+        except Exception as e:
+            module.fail_json(msg=f"Failed to read running-config: {e}")
 
     # Build list of commands to execute
-    commands = ["configure"]
+    commands = ["configure"] + plan['commands']
 
     # Configure each feature
     configure_management_interface(module, commands)
     configure_hostname(module, commands)
     configure_ssh(module, commands)
-    configure_users(module, commands)
+    unchanged_users = configure_planned_users(plan['users'], commands, current_users)
+    unchanged_users += configure_users(module, commands, current_users)
     configure_sntp(module, commands)
     configure_snmp(module, commands)
 
@@ -268,19 +438,28 @@ def main():
         commands = []
 
     # Execute commands
+    changed = bool(commands)
     if commands and not module.check_mode:
         try:
-            run_commands(module, commands)
-            changed = True
+            run_commands(module, commands, timer=timer)
         except Exception as e:
             module.fail_json(msg=f"Failed to configure system: {e}")
-    else:
-        changed = False
 
     module.exit_json(
         changed=changed,
-        commands=commands
+        commands=commands,
+        unchanged_users=unchanged_users,
+        timing=timer.as_dict()
+    )
+
+
+def main():
+    """Main module function"""
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True
     )
+    run_module(module)
 
 
 if __name__ == '__main__':